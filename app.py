@@ -1,18 +1,131 @@
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import (Flask, Request, render_template, request, jsonify, send_file, Response, url_for, g,
+                   stream_with_context)
 from werkzeug.utils import secure_filename
+import itertools
+import json
+import multiprocessing
 import os
-from resume_parser import extract_text_from_pdf, extract_info_with_groq, score_resume
-from sheets_manager import SheetsManager  # Add this import
+import tempfile
+import threading
+import time
+from resume_parser import (extract_text_from_pdf, process_resume_text, iter_resume_events, text_stats, llm_cache,
+                           EXTRACTION_MODE, EXTRACTION_MODES)
+from batch_processor import process_batch, iter_uploads
+from candidate_export import EXPORT_FORMATS, ParquetUnavailable, iter_export, write_parquet
+from candidate_store import CandidateStore
+from dedup_index import DedupIndex, DEDUP_ACTION, skips_parsing
+from job_queue import JobQueue, FINISHED_STATES
+from metrics import REGISTRY, HTTP_REQUEST_SECONDS, current_request_id, log_event, set_request_id, reset_request_id
+from requisitions import RequisitionRegistry
+from search_index import SearchIndex
+from sheets_manager import SheetsBatchWriter
+
+class UploadRequest(Request):
+    """Keeps uploaded files in memory, spilling to an anonymous temp file only past UPLOAD_SPOOL_MAX_BYTES"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=app.config['UPLOAD_SPOOL_MAX_BYTES'], mode='rb+')
 
 app = Flask(__name__)
-app.config['UPLOAD_FOLDER'] = 'uploads'
+app.request_class = UploadRequest
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['UPLOAD_SPOOL_MAX_BYTES'] = int(os.environ.get('UPLOAD_SPOOL_MAX_BYTES', 4 * 1024 * 1024))
+app.config['JOBS_DB'] = os.environ.get('JOBS_DB', 'jobs.db')
+app.config['JOB_WORKERS'] = int(os.environ.get('JOB_WORKERS', 2))  # Concurrent background jobs
+app.config['CANDIDATES_DB'] = os.environ.get('CANDIDATES_DB', 'candidates.db')
+app.config['SHEETS_ENABLED'] = os.environ.get('SHEETS_ENABLED', '0') == '1'  # Mirror candidates to Google Sheets
+app.config['DEDUP_ACTION'] = os.environ.get('DEDUP_ACTION', DEDUP_ACTION)  # skip, flag or off
+
+# Batch PDF workers are started with forkserver/spawn and import this module again when it is
+# run as a script; only the server process starts the background threads
+SERVER_PROCESS = multiprocessing.current_process().name == 'MainProcess'
+
+# Local store is the record of every candidate; Google Sheets is an optional mirror
+candidate_store = CandidateStore(app.config['CANDIDATES_DB'], dedup_index=DedupIndex(app.config['CANDIDATES_DB']))
+# Open requisitions every parsed resume is scored against
+requisition_registry = RequisitionRegistry(app.config['CANDIDATES_DB'])
+
+# Ranked skill search over the store, kept current as candidates are added
+search_index = SearchIndex()
+candidate_store.listeners.append(search_index.add)
+if SERVER_PROCESS:
+    threading.Thread(target=search_index.build, args=(candidate_store,), name="search-index-build",
+                     daemon=True).start()
+
+if app.config['SHEETS_ENABLED'] and SERVER_PROCESS:
+    # Rows are buffered and appended in batches by a background thread, which
+    # authenticates with Google on its first flush rather than at startup
+    candidate_store.attach_mirror(SheetsBatchWriter().start())
+
+def find_duplicate(text):
+    """(stored duplicate or None, whether parsing should be skipped) under the DEDUP_ACTION setting"""
+    dedup_action = app.config['DEDUP_ACTION']
+    duplicate = candidate_store.find_duplicate(text) if dedup_action != 'off' else None
+    if skips_parsing(duplicate, dedup_action):
+        # Already parsed before: return the stored candidate without calling the LLM
+        duplicate['candidate_id'] = duplicate['id']
+        return duplicate, True
+    return duplicate, False
+
+def store_parsed(parsed_data, text, mode, duplicate=None):
+    """Score against open requisitions and store a freshly parsed resume"""
+    if duplicate is not None and duplicate['duplicate_reason'] == 'text':
+        parsed_data['duplicate_of'] = duplicate['id']  # Dropped by the store if it merges into that record
+    requisition_scores = requisition_registry.score(parsed_data)
+    if requisition_scores:
+        parsed_data['requisition_scores'] = requisition_scores
+    # Store the candidate (fast mode results are partial previews and are not stored)
+    if mode != 'fast':
+        parsed_data['candidate_id'] = candidate_store.add(parsed_data, text=text)
+    return parsed_data
+
+def ingest_text(text, mode=EXTRACTION_MODE):
+    """Parse, score and store extracted resume text, checking for duplicates first"""
+    duplicate, skip = find_duplicate(text)
+    if skip:
+        return duplicate
 
-# Initialize SheetsManager
-sheets_manager = SheetsManager()
+    parsed_data = process_resume_text(text, mode=mode)
+    if not parsed_data:
+        return None
+    return store_parsed(parsed_data, text, mode, duplicate)
 
-# Create uploads folder if it doesn't exist
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+def run_resume_job(filename, pdf_bytes):
+    """Background job handler: full parse pipeline for one queued upload"""
+    text = extract_text_from_pdf(pdf_bytes)
+    if not text:
+        raise ValueError('Failed to extract text from PDF')
+
+    parsed_data = ingest_text(text)
+    if not parsed_data:
+        raise ValueError('Failed to parse resume data')
+    return parsed_data
+
+# Queue of uploaded resumes, persisted so a restart does not lose them
+job_queue = JobQueue(run_resume_job, db_path=app.config['JOBS_DB'], workers=app.config['JOB_WORKERS'])
+if SERVER_PROCESS:
+    job_queue.start()
+
+@app.before_request
+def start_request():
+    # Every log line of the request carries this ID; clients may pass their own
+    g.request_id_token = set_request_id(request.headers.get('X-Request-ID'))
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def finish_request(response):
+    seconds = time.perf_counter() - g.request_start
+    HTTP_REQUEST_SECONDS.observe(seconds, endpoint=request.endpoint or 'unknown', status=response.status_code)
+    log_event('http_request', method=request.method, path=request.path, status=response.status_code,
+              seconds=round(seconds, 4))
+    response.headers['X-Request-ID'] = current_request_id()
+    return response
+
+@app.teardown_request
+def end_request(exc=None):
+    token = g.pop('request_id_token', None)
+    if token is not None:
+        reset_request_id(token)
 
 @app.route('/')
 def index():
@@ -30,57 +143,274 @@ def parse_resume():
     if not file.filename.endswith('.pdf'):
         return jsonify({'error': 'Please upload a PDF file'}), 400
 
-    try:
-        # Save the uploaded file
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+    mode = request.values.get('mode', EXTRACTION_MODE)
+    if mode not in EXTRACTION_MODES:
+        return jsonify({'error': f"mode must be one of: {', '.join(EXTRACTION_MODES)}"}), 400
 
-        # Process the resume with error handling
-        text = extract_text_from_pdf(filepath)
+    try:
+        # Parsed straight from the upload stream, nothing is written under a shared file name
+        text = extract_text_from_pdf(file.stream)
         if not text:
             return jsonify({'error': 'Failed to extract text from PDF'}), 400
 
-        parsed_data = extract_info_with_groq(text)
+        parsed_data = ingest_text(text, mode=mode)
         if not parsed_data:
             return jsonify({'error': 'Failed to parse resume data'}), 400
 
-        # Clean up email (remove emojis and extract only valid email)
-        if 'email' in parsed_data:
-            email = parsed_data['email']
-            # First, find the @ symbol position
-            at_pos = email.find('@')
-            if at_pos != -1:
-                # Extract from the character before @ until we find a non-email character
-                start = at_pos
-                while start > 0 and (email[start-1].isalnum() or email[start-1] in '._-'):
-                    start -= 1
-                # Extract the rest of the email
-                end = at_pos
-                while end < len(email) and (email[end].isalnum() or email[end] in '@._-'):
-                    end += 1
-                parsed_data['email'] = email[start:end]
-            else:
-                parsed_data['email'] = ''
-
-        # Normalize and round the score
-        score = score_resume(parsed_data)
-        score = max(0, min(100, round(score)))
-        parsed_data["resume_score"] = f"{score}/100"
-
-        # Add to Google Sheets
-        if not sheets_manager.add_candidate(parsed_data):
-            print("Warning: Failed to add data to Google Sheets")
-
-        # Clean up the uploaded file
-        os.remove(filepath)
-
         return jsonify(parsed_data)
 
     except Exception as e:
-        if os.path.exists(filepath):
-            os.remove(filepath)
         return jsonify({'error': str(e)}), 500
 
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/parse_resume/stream', methods=['POST'])
+def parse_resume_stream():
+    """Same as /parse_resume, but streams Server-Sent Events as each stage finishes:
+    text, contact, field (one per LLM field), score, then result (or error)."""
+    if 'resume' not in request.files:
+        return jsonify({'error': 'No file uploaded'}), 400
+
+    file = request.files['resume']
+    if file.filename == '':
+        return jsonify({'error': 'No file selected'}), 400
+
+    if not file.filename.endswith('.pdf'):
+        return jsonify({'error': 'Please upload a PDF file'}), 400
+
+    mode = request.values.get('mode', EXTRACTION_MODE)
+    if mode not in EXTRACTION_MODES:
+        return jsonify({'error': f"mode must be one of: {', '.join(EXTRACTION_MODES)}"}), 400
+    pdf_bytes = file.read()
+
+    def stream():
+        try:
+            text = extract_text_from_pdf(pdf_bytes)
+            if not text:
+                yield sse_event('error', {'error': 'Failed to extract text from PDF'})
+                return
+
+            duplicate, skip = find_duplicate(text)
+            if skip:
+                yield sse_event('text', text_stats(text))
+                yield sse_event('result', duplicate)
+                return
+
+            for event, data in iter_resume_events(text, mode=mode):
+                if event == 'result':
+                    if not data:
+                        yield sse_event('error', {'error': 'Failed to parse resume data'})
+                        return
+                    data = store_parsed(data, text, mode, duplicate)
+                yield sse_event(event, data)
+        except Exception as e:
+            yield sse_event('error', {'error': str(e)})
+
+    # X-Accel-Buffering stops nginx from holding events back until the response ends
+    return Response(stream_with_context(stream()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/parse_batch', methods=['POST'])
+def parse_batch():
+    files = request.files.getlist('resumes')
+    if not files or all(f.filename == '' for f in files):
+        return jsonify({'error': 'No files uploaded'}), 400
+
+    try:
+        # Read lazily so process_batch only holds its bounded window of PDFs in memory
+        sources = iter_uploads(files)
+        first = next(sources, None)
+        if first is None:
+            return jsonify({'error': 'Please upload PDF files or a zip of PDFs'}), 400
+
+        return jsonify(process_batch(itertools.chain([first], sources), sink=candidate_store, dedup_action=app.config['DEDUP_ACTION'],
+                                     requisition_registry=requisition_registry))
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    if 'resume' not in request.files:
+        return jsonify({'error': 'No file uploaded'}), 400
+
+    file = request.files['resume']
+    if file.filename == '':
+        return jsonify({'error': 'No file selected'}), 400
+
+    if not file.filename.endswith('.pdf'):
+        return jsonify({'error': 'Please upload a PDF file'}), 400
+
+    job_id = job_queue.submit(secure_filename(file.filename), file.read())
+    return jsonify({
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': url_for('job_status', job_id=job_id),
+        'events_url': url_for('job_events', job_id=job_id)
+    }), 202
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    if job_queue.get(job_id) is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    def stream():
+        # Server-Sent Events: push the job each time its status changes
+        last_status = None
+        while True:
+            job = job_queue.get(job_id)
+            if job['status'] != last_status:
+                last_status = job['status']
+                yield f"data: {json.dumps(job)}\n\n"
+            if job['status'] in FINISHED_STATES:
+                return
+            time.sleep(0.5)
+
+    return Response(stream(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+@app.route('/candidates')
+def list_candidates():
+    skills = [skill for skill in request.args.get('skills', '').split(',') if skill.strip()]
+    try:
+        min_score = request.args.get('min_score', type=float)
+        max_score = request.args.get('max_score', type=float)
+        min_experience_months = request.args.get('min_experience_months', type=int)
+        max_experience_months = request.args.get('max_experience_months', type=int)
+        limit = min(request.args.get('limit', 100, type=int), 1000)
+        offset = request.args.get('offset', 0, type=int)
+        candidates = candidate_store.query(
+            skills=skills, min_score=min_score, max_score=max_score,
+            name=request.args.get('name'), email=request.args.get('email'), phone=request.args.get('phone'),
+            min_experience_months=min_experience_months, max_experience_months=max_experience_months,
+            limit=limit, offset=offset
+        )
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    return jsonify({'count': len(candidates), 'candidates': candidates})
+
+@app.route('/candidates/export')
+def export_candidate_pool():
+    # Streamed in batches, so memory use does not grow with the size of the pool
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+    filename = f'candidates.{fmt}'
+    if fmt == 'parquet':
+        # The Parquet footer is written last, so the file is built in a temp file before sending
+        output = tempfile.TemporaryFile()
+        try:
+            write_parquet(candidate_store.iter_candidates(), output)
+        except ParquetUnavailable as e:
+            output.close()
+            return jsonify({'error': str(e)}), 501
+        except Exception as e:
+            output.close()
+            return jsonify({'error': str(e)}), 500
+        output.seek(0)
+        return send_file(output, mimetype='application/vnd.apache.parquet', as_attachment=True,
+                         download_name=filename)
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    return Response(stream_with_context(iter_export(candidate_store.iter_candidates(), fmt)), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
+
+@app.route('/candidates/<int:candidate_id>')
+def get_candidate(candidate_id):
+    candidate = candidate_store.get(candidate_id)
+    if candidate is None:
+        return jsonify({'error': 'Candidate not found'}), 404
+    return jsonify(candidate)
+
+@app.route('/search', methods=['GET', 'POST'])
+def search_candidates():
+    # Short queries via ?q=, full job descriptions as JSON {"query": ..., "k": ...}
+    payload = request.get_json(silent=True)
+    payload = {} if payload is None else payload
+    if not isinstance(payload, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+    query = payload.get('query')
+    query = request.args.get('q', '') if query is None else query
+    if not isinstance(query, str):
+        return jsonify({'error': 'query must be a string'}), 400
+    if not query.strip():
+        return jsonify({'error': 'No search query given'}), 400
+    k = payload.get('k')
+    try:
+        k = int(request.args.get('k', 10) if k is None else k)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'k must be an integer'}), 400
+    if k < 0:
+        return jsonify({'error': 'k must not be negative'}), 400
+    k = min(k, 100)
+
+    start = time.perf_counter()
+    results = search_index.search(query, k=k)
+    return jsonify({
+        'results': results,
+        'indexed_candidates': len(search_index),
+        'took_ms': round((time.perf_counter() - start) * 1000, 2)
+    })
+
+@app.route('/requisitions', methods=['GET', 'POST'])
+def requisitions():
+    if request.method == 'GET':
+        return jsonify(requisition_registry.list(include_inactive=request.args.get('all') == '1'))
+
+    spec = request.get_json(silent=True)
+    if not isinstance(spec, dict) or not (spec.get('required_skills') or spec.get('preferred_skills') or spec.get('description')):
+        return jsonify({'error': 'A requisition needs required_skills, preferred_skills or a description'}), 400
+    try:
+        requisition_id = requisition_registry.register(spec)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'id': requisition_id}), 201
+
+@app.route('/requisitions/<int:requisition_id>', methods=['DELETE'])
+def deactivate_requisition(requisition_id):
+    if not requisition_registry.deactivate(requisition_id):
+        return jsonify({'error': 'Requisition not found'}), 404
+    return jsonify({'id': requisition_id, 'active': False})
+
+@app.route('/requisitions/scores', methods=['POST'])
+def requisition_scores():
+    # Score matrix of the given candidates (or the top stored candidates) against all active requisitions
+    payload = request.get_json(silent=True)
+    payload = {} if payload is None else payload
+    if not isinstance(payload, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+    candidate_ids = payload.get('candidate_ids')
+    if candidate_ids:
+        if not isinstance(candidate_ids, list) or not all(isinstance(i, int) and not isinstance(i, bool)
+                                                          for i in candidate_ids):
+            return jsonify({'error': 'candidate_ids must be a list of integers'}), 400
+        candidates = [candidate for candidate in map(candidate_store.get, candidate_ids) if candidate]
+    else:
+        try:
+            limit = int(payload.get('limit', 100))
+            min_score = payload.get('min_score')
+            min_score = int(min_score) if min_score is not None else None
+        except (TypeError, ValueError):
+            return jsonify({'error': 'limit and min_score must be integers'}), 400
+        if limit < 0:
+            return jsonify({'error': 'limit must not be negative'}), 400
+        candidates = candidate_store.query(min_score=min_score, limit=min(limit, 1000))
+    return jsonify(requisition_registry.score_matrix(candidates))
+
+@app.route('/cache/stats')
+def cache_stats():
+    return jsonify(llm_cache.stats())
+
+@app.route('/metrics')
+def metrics():
+    """Per-stage latency histograms and pipeline counters in Prometheus text format"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,246 @@
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from candidate_store import CandidateStore, CANDIDATES_DB
+from dedup_index import DedupIndex, DEDUP_ACTIONS, DEDUP_ACTION, skips_parsing
+from metrics import STAGE_SECONDS, request_context
+from requisitions import RequisitionRegistry
+from resume_parser import extract_text_from_pdf, process_resume_text
+
+# ----------- Batch Config ------------
+PDF_WORKERS = os.cpu_count() or 1  # Processes used for PDF text extraction
+LLM_WORKERS = 4  # Concurrent Groq calls; keep low enough for the API rate limit
+MAX_PENDING_PER_WORKER = 4  # Bounds how many PDFs are held in memory at once
+MAX_ZIP_MEMBER_BYTES = 16 * 1024 * 1024  # Larger PDFs inside a zip are skipped instead of decompressed
+# Extraction processes are never forked from the (multithreaded) web app: forkserver where available
+PDF_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# ----------- Batch Sources ------------
+def iter_directory(directory):
+    """Yield (name, path) for every PDF under a directory"""
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in sorted(filenames):
+            if filename.lower().endswith('.pdf'):
+                path = os.path.join(dirpath, filename)
+                yield os.path.relpath(path, directory), path
+
+def iter_zip(zip_file, max_member_bytes=MAX_ZIP_MEMBER_BYTES):
+    """Yield (name, bytes) for every PDF inside a zip archive (path or file object).
+
+    Members that would decompress to more than max_member_bytes are skipped.
+    """
+    with zipfile.ZipFile(zip_file) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or not info.filename.lower().endswith('.pdf'):
+                continue
+            # zipfile stops reading a member at its declared size, so this bounds the memory used
+            if max_member_bytes is not None and info.file_size > max_member_bytes:
+                print(f"Skipping {info.filename}: {info.file_size} bytes uncompressed")
+                continue
+            yield info.filename, archive.read(info)
+
+def iter_uploads(files):
+    """Yield (name, bytes) for uploaded PDFs and PDFs inside uploaded zip files"""
+    for file in files:
+        filename = file.filename or ''
+        if filename.lower().endswith('.zip'):
+            yield from iter_zip(io.BytesIO(file.read()))
+        elif filename.lower().endswith('.pdf'):
+            yield filename, file.read()
+
+# ----------- Batch Workers ------------
+def _pdf_context():
+    context = multiprocessing.get_context(PDF_START_METHOD)
+    if PDF_START_METHOD == 'forkserver':
+        # Workers fork from a server that has already imported the parser instead of importing it each time
+        context.set_forkserver_preload(['batch_processor'])
+    return context
+
+def _extract_worker(source):
+    # Runs in a worker process; source is either a file path or the raw PDF bytes
+    start = time.perf_counter()
+    text = extract_text_from_pdf(source)
+    return text, time.perf_counter() - start
+
+def _parse_worker(text, request_id):
+    start = time.perf_counter()
+    with request_context(request_id):
+        parsed_data = process_resume_text(text)
+    return parsed_data, time.perf_counter() - start
+
+def process_batch(sources, sink=None, pdf_workers=None, llm_workers=LLM_WORKERS, dedup_action='off',
+                  requisition_registry=None):
+    """Parse and score many resumes concurrently.
+
+    sources is an iterable of (name, path_or_bytes). PDF extraction runs in a
+    process pool, Groq calls run in a bounded thread pool and results are
+    handed to sink.add_candidate (a CandidateStore, SheetsBatchWriter or
+    SheetsManager) on the calling thread as they come in.
+
+    With dedup_action "skip" or "flag" the sink must be a CandidateStore:
+    resumes it already holds are skipped before the Groq call, and with
+    "flag" near-duplicates of another candidate are parsed and marked
+    with "duplicate_of" (see dedup_index.skips_parsing).
+
+    With a requisition_registry, each parsed resume is scored against the
+    open requisitions and gets "requisition_scores" before it is saved.
+    """
+    pdf_workers = pdf_workers or PDF_WORKERS
+    max_pending = pdf_workers * MAX_PENDING_PER_WORKER
+    sources = iter(sources)
+    results = []
+    start = time.perf_counter()
+
+    def record(name, status, error=None, data=None, extract_seconds=None, parse_seconds=None):
+        results.append({
+            'file': name,
+            'status': status,
+            'error': error,
+            'extract_seconds': round(extract_seconds, 3) if extract_seconds is not None else None,
+            'parse_seconds': round(parse_seconds, 3) if parse_seconds is not None else None,
+            'data': data
+        })
+
+    with ProcessPoolExecutor(max_workers=pdf_workers, mp_context=_pdf_context()) as pdf_pool, \
+            ThreadPoolExecutor(max_workers=llm_workers) as llm_pool:
+        extracting = {}
+        parsing = {}
+        exhausted = False
+
+        while True:
+            # Keep the extraction queue topped up without reading every file up front
+            while not exhausted and len(extracting) + len(parsing) < max_pending:
+                try:
+                    name, source = next(sources)
+                except StopIteration:
+                    exhausted = True
+                    break
+                extracting[pdf_pool.submit(_extract_worker, source)] = name
+
+            if not extracting and not parsing:
+                break
+
+            done, _ = wait(list(extracting) + list(parsing), return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in extracting:
+                    name = extracting.pop(future)
+                    try:
+                        text, extract_seconds = future.result()
+                    except Exception as e:
+                        record(name, 'error', error=str(e))
+                        continue
+                    # Metrics recorded inside the worker process are lost, so the timing is recorded here
+                    STAGE_SECONDS.observe(extract_seconds, stage='pdf_extraction')
+                    if not text:
+                        record(name, 'error', error='Failed to extract text from PDF',
+                               extract_seconds=extract_seconds)
+                        continue
+
+                    duplicate = sink.find_duplicate(text) if dedup_action in ('skip', 'flag') else None
+                    if skips_parsing(duplicate, dedup_action):
+                        duplicate['candidate_id'] = duplicate['id']
+                        record(name, 'duplicate', data=duplicate, extract_seconds=extract_seconds)
+                        continue
+                    parsing[llm_pool.submit(_parse_worker, text, name)] = (name, extract_seconds, text, duplicate)
+                else:
+                    name, extract_seconds, text, duplicate = parsing.pop(future)
+                    try:
+                        parsed_data, parse_seconds = future.result()
+                    except Exception as e:
+                        record(name, 'error', error=str(e), extract_seconds=extract_seconds)
+                        continue
+                    if not parsed_data:
+                        record(name, 'error', error='Failed to parse resume data',
+                               extract_seconds=extract_seconds, parse_seconds=parse_seconds)
+                        continue
+
+                    # The Sheets client is not thread-safe, so saving stays on this thread
+                    if duplicate is not None and duplicate['duplicate_reason'] == 'text':
+                        parsed_data['duplicate_of'] = duplicate['id']  # Dropped by the store if it merges
+                    if requisition_registry is not None:
+                        requisition_scores = requisition_registry.score(parsed_data)
+                        if requisition_scores:
+                            parsed_data['requisition_scores'] = requisition_scores
+                    saved = True
+                    if sink and dedup_action in ('skip', 'flag'):
+                        saved = sink.add_candidate(parsed_data, text=text)
+                    elif sink:
+                        saved = sink.add_candidate(parsed_data)
+                    if not saved:
+                        print(f"Warning: Failed to save {name}")
+                    record(name, 'ok', data=parsed_data,
+                           extract_seconds=extract_seconds, parse_seconds=parse_seconds)
+
+    elapsed = time.perf_counter() - start
+    succeeded = sum(1 for result in results if result['status'] == 'ok')
+    duplicates = sum(1 for result in results if result['status'] == 'duplicate')
+    return {
+        'total': len(results),
+        'succeeded': succeeded,
+        'duplicates': duplicates,
+        'failed': len(results) - succeeded - duplicates,
+        'elapsed_seconds': round(elapsed, 3),
+        'files_per_second': round(len(results) / elapsed, 3) if elapsed > 0 else 0.0,
+        'results': results
+    }
+
+# ----------- Command Line ------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse a directory (or zip) of PDF resumes in batch")
+    parser.add_argument('source', help="Directory of PDF resumes or a .zip archive")
+    parser.add_argument('-o', '--output', help="Write per-file results as JSON to this path")
+    parser.add_argument('--pdf-workers', type=int, default=PDF_WORKERS)
+    parser.add_argument('--llm-workers', type=int, default=LLM_WORKERS)
+    parser.add_argument('--sheets', action=argparse.BooleanOptionalAction,
+                        default=os.environ.get('SHEETS_ENABLED', '0') == '1',
+                        help="Mirror results to Google Sheets (default: the SHEETS_ENABLED environment variable, off)")
+    parser.add_argument('--db', default=CANDIDATES_DB, help="Local candidate store (SQLite) to save results in")
+    parser.add_argument('--dedup', choices=DEDUP_ACTIONS, default=DEDUP_ACTION,
+                        help="Skip or flag resumes already in the store (near-duplicate text or same email/phone)")
+    args = parser.parse_args(argv)
+
+    if args.source.lower().endswith('.zip'):
+        sources = iter_zip(args.source)
+    else:
+        sources = iter_directory(args.source)
+
+    candidate_store = CandidateStore(args.db, dedup_index=DedupIndex(args.db))
+    sheets_writer = None
+    if args.sheets:
+        from sheets_manager import SheetsBatchWriter, get_sheets_manager
+        # Authenticate up front so a bad setup fails before any file is parsed
+        sheets_writer = SheetsBatchWriter(get_sheets_manager()).start()
+        candidate_store.attach_mirror(sheets_writer)
+
+    try:
+        summary = process_batch(sources, sink=candidate_store, pdf_workers=args.pdf_workers,
+                                llm_workers=args.llm_workers, dedup_action=args.dedup,
+                                requisition_registry=RequisitionRegistry(args.db))
+    finally:
+        if sheets_writer:
+            sheets_writer.stop()
+
+    for result in summary['results']:
+        if result['status'] == 'ok':
+            status = '✅'
+        elif result['status'] == 'duplicate':
+            status = f"⏭ duplicate of candidate {result['data']['candidate_id']}"
+        else:
+            status = f"❌ {result['error']}"
+        print(f"{result['file']}: {status}")
+    print(f"Processed {summary['total']} files ({summary['succeeded']} ok, {summary['duplicates']} duplicates, "
+          f"{summary['failed']} failed) "
+          f"in {summary['elapsed_seconds']}s - {summary['files_per_second']} files/sec")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+if __name__ == '__main__':
+    main()
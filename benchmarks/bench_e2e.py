@@ -0,0 +1,288 @@
+"""End-to-end benchmark of the single, batch and web paths against stubbed Groq and Sheets services.
+
+Run from the repository root:
+    python -m benchmarks.bench_e2e --count 60 --output bench_results.json
+    python -m benchmarks.bench_e2e --count 60 --compare bench_results.json
+
+Every path runs in its own process (so peak RSS is per path) over the same
+synthetic corpus, with a local Groq stub and a fake Sheets service whose
+latency and error rate are configurable. Results are written as JSON keyed
+by path, with the commit they were measured on, for comparison across commits.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.synthetic_corpus import write_corpus
+
+PATHS = ("single", "batch", "web")
+PERCENTILES = (50, 90, 95, 99)
+# Options passed on to the per-path child processes
+CHILD_OPTIONS = ('seed', 'groq_latency', 'groq_jitter', 'groq_error_rate', 'sheets_latency', 'sheets_jitter',
+                 'sheets_error_rate', 'pdf_workers', 'llm_workers', 'web_clients')
+
+def percentiles(values):
+    """count, mean and nearest-rank percentiles (in milliseconds) of durations in seconds"""
+    if not values:
+        return {"count": 0}
+    values = sorted(values)
+    summary = {"count": len(values), "mean_ms": round(1000 * sum(values) / len(values), 2)}
+    for p in PERCENTILES:
+        rank = max(0, min(len(values) - 1, -(-p * len(values) // 100) - 1))
+        summary[f"p{p}_ms"] = round(1000 * values[rank], 2)
+    return summary
+
+def peak_rss_mb():
+    """Peak resident set size of this process and its children, in MB (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+# ----------- Paths (run inside the child process) ------------
+def _run_single(files, sheets_manager, latencies):
+    # The GUI path: one file at a time, each row appended to the sheet directly
+    from resume_parser import extract_text_from_pdf, process_resume_text
+    succeeded = 0
+    for path in files:
+        start = time.perf_counter()
+        try:
+            text = extract_text_from_pdf(path)
+            parsed_data = process_resume_text(text) if text else None
+        except Exception as e:
+            print(f"{os.path.basename(path)} failed: {e}", file=sys.stderr)
+            parsed_data = None
+        if parsed_data and sheets_manager.add_candidate(parsed_data):
+            succeeded += 1
+        latencies.append(time.perf_counter() - start)
+    return succeeded
+
+def _run_batch(corpus, workdir, sheets_manager, args, latencies):
+    from batch_processor import iter_directory, process_batch
+    from candidate_store import CandidateStore
+    from sheets_manager import SheetsBatchWriter
+
+    db_path = os.path.join(workdir, 'candidates.db')
+    candidate_store = CandidateStore(db_path)
+    sheets_writer = SheetsBatchWriter(sheets_manager).start()
+    candidate_store.attach_mirror(sheets_writer)
+    try:
+        summary = process_batch(iter_directory(corpus), sink=candidate_store, pdf_workers=args.pdf_workers,
+                                llm_workers=args.llm_workers)
+    finally:
+        sheets_writer.stop()
+    for result in summary['results']:
+        latencies.append((result['extract_seconds'] or 0) + (result['parse_seconds'] or 0))
+    return summary['succeeded']
+
+def _run_web(files, sheets_manager, args, latencies):
+    # app.py reads its configuration from the environment when imported
+    import app as web_app
+    from sheets_manager import SheetsBatchWriter
+
+    sheets_writer = SheetsBatchWriter(sheets_manager).start()
+    web_app.candidate_store.attach_mirror(sheets_writer)
+    local = threading.local()
+
+    def upload(path):
+        if not hasattr(local, 'client'):
+            local.client = web_app.app.test_client()
+        with open(path, 'rb') as f:
+            pdf_bytes = f.read()
+        start = time.perf_counter()
+        response = local.client.post('/parse_resume', data={'resume': (io.BytesIO(pdf_bytes), os.path.basename(path))})
+        latencies.append(time.perf_counter() - start)
+        return response.status_code == 200
+
+    try:
+        with ThreadPoolExecutor(max_workers=args.web_clients) as clients:
+            succeeded = sum(clients.map(upload, files))
+    finally:
+        sheets_writer.stop()
+        web_app.job_queue.stop(timeout=1)
+    return succeeded
+
+def run_path(path, corpus, workdir, args):
+    """Run one path over the corpus and return its measurements"""
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)  # The web path writes uploads/ and its databases here
+    os.environ.update({
+        'CANDIDATES_DB': os.path.join(workdir, 'candidates.db'),
+        'JOBS_DB': os.path.join(workdir, 'jobs.db'),
+        'SHEETS_ENABLED': '0',  # The fake Sheets mirror is attached below instead
+        'DEDUP_ACTION': 'off',  # Measure the full pipeline for every file
+    })
+
+    import resume_parser
+    from benchmarks.stub_services import FakeSheetsService, StubGroqServer, fake_sheets_manager
+    from groq_client import GroqClient
+    from llm_cache import LLMCache
+    from metrics import STAGE_SECONDS
+
+    stub = StubGroqServer(args.groq_latency, args.groq_jitter, args.groq_error_rate, seed=args.seed).start()
+    # No client-side rate limit: the stub has no quota, and the limit would dominate the timings
+    resume_parser.groq_client = GroqClient('bench-key', stub.url, requests_per_minute=0, tokens_per_minute=0)
+    resume_parser.llm_cache = LLMCache(os.path.join(workdir, 'llm_cache.db'))  # Empty, so every file calls the stub
+    sheets_service = FakeSheetsService(args.sheets_latency, args.sheets_jitter, args.sheets_error_rate, seed=args.seed)
+    sheets_manager = fake_sheets_manager(sheets_service)
+
+    samples = defaultdict(list)
+    STAGE_SECONDS.listeners.append(lambda value, labels: samples[labels['stage']].append(value))
+    latencies = []
+    files = sorted(os.path.join(corpus, name) for name in os.listdir(corpus) if name.endswith('.pdf'))
+
+    start = time.perf_counter()
+    if path == 'single':
+        succeeded = _run_single(files, sheets_manager, latencies)
+    elif path == 'batch':
+        succeeded = _run_batch(corpus, workdir, sheets_manager, args, latencies)
+    else:
+        succeeded = _run_web(files, sheets_manager, args, latencies)
+    elapsed = time.perf_counter() - start
+    stub.stop()
+
+    return {
+        'files': len(files),
+        'succeeded': succeeded,
+        'failed': len(files) - succeeded,
+        'elapsed_seconds': round(elapsed, 3),
+        'files_per_second': round(len(files) / elapsed, 3) if elapsed > 0 else 0.0,
+        'file_latency': percentiles(latencies),
+        'stages': {stage: percentiles(values) for stage, values in sorted(samples.items())},
+        'peak_rss_mb': peak_rss_mb(),
+        'groq_stub': {'requests': stub.requests, 'injected_errors': stub.errors},
+        'sheets_fake': {'calls': sheets_service.calls, 'rows': sheets_service.rows,
+                        'injected_errors': sheets_service.errors},
+    }
+
+# ----------- Reporting ------------
+def print_report(report):
+    for path, result in report['paths'].items():
+        print(f"\n[{path}] {result['succeeded']}/{result['files']} ok in {result['elapsed_seconds']}s "
+              f"= {result['files_per_second']} files/s, peak RSS {result['peak_rss_mb']} MB")
+        print(f"  {'stage':<18}{'count':>7}" + ''.join(f"{f'p{p} ms':>10}" for p in PERCENTILES))
+        rows = [('file', result['file_latency'])] + list(result['stages'].items())
+        for stage, stats in rows:
+            print(f"  {stage:<18}{stats['count']:>7}" + ''.join(f"{stats.get(f'p{p}_ms', 0):>10}" for p in PERCENTILES))
+
+def print_comparison(baseline, report):
+    print(f"\nCompared with {baseline.get('commit')} ({baseline.get('timestamp')}):")
+    for path, result in report['paths'].items():
+        old = baseline.get('paths', {}).get(path)
+        if not old:
+            continue
+
+        def change(new_value, old_value):
+            if not old_value or new_value is None:
+                return 'n/a'
+            return f"{100 * (new_value - old_value) / old_value:+.1f}%"
+
+        print(f"  [{path}] files/s {old['files_per_second']} -> {result['files_per_second']} "
+              f"({change(result['files_per_second'], old['files_per_second'])}), "
+              f"peak RSS {old['peak_rss_mb']} -> {result['peak_rss_mb']} MB")
+        for stage, stats in result['stages'].items():
+            old_p95 = old['stages'].get(stage, {}).get('p95_ms')
+            if old_p95 is not None and 'p95_ms' in stats:
+                print(f"    {stage:<18} p95 {old_p95} -> {stats['p95_ms']} ms ({change(stats['p95_ms'], old_p95)})")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--paths', default=','.join(PATHS), help="Comma-separated subset of: " + ', '.join(PATHS))
+    parser.add_argument('--count', type=int, default=60, help="Synthetic resumes to generate")
+    parser.add_argument('--corpus', help="Use an existing directory of PDFs instead of generating one")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--groq-latency', type=float, default=0.3, help="Mean stub Groq latency (seconds)")
+    parser.add_argument('--groq-jitter', type=float, default=0.1)
+    parser.add_argument('--groq-error-rate', type=float, default=0.0, help="Fraction of Groq calls answered 429/500")
+    parser.add_argument('--sheets-latency', type=float, default=0.2, help="Mean fake Sheets call latency (seconds)")
+    parser.add_argument('--sheets-jitter', type=float, default=0.05)
+    parser.add_argument('--sheets-error-rate', type=float, default=0.0)
+    parser.add_argument('--pdf-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--llm-workers', type=int, default=4)
+    parser.add_argument('--web-clients', type=int, default=4, help="Concurrent uploads on the web path")
+    parser.add_argument('-o', '--output', help="Write the results as JSON to this path")
+    parser.add_argument('--compare', help="Earlier results JSON to compare against")
+    parser.add_argument('--logs', action='store_true', help="Keep the structured stage logs")
+    # Internal: run a single path in this process and write its result to a file
+    parser.add_argument('--run-path', choices=PATHS, help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_path:
+        result = run_path(args.run_path, os.path.abspath(args.corpus), os.path.abspath(args.workdir), args)
+        with open(args.result_file, 'w') as f:
+            json.dump(result, f)
+        return 0
+
+    paths = [path.strip() for path in args.paths.split(',') if path.strip()]
+    unknown = set(paths) - set(PATHS)
+    if unknown:
+        parser.error(f"unknown paths: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory(prefix='bench_e2e_') as tmp:
+        corpus = args.corpus or os.path.join(tmp, 'corpus')
+        if not args.corpus:
+            write_corpus(corpus, args.count, args.seed)
+
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [os.getcwd(), env.get('PYTHONPATH')]))
+        if not args.logs:
+            env['STRUCTURED_LOGS'] = '0'
+        forwarded = []
+        for option in CHILD_OPTIONS:
+            forwarded += [f"--{option.replace('_', '-')}", str(getattr(args, option))]
+
+        report = {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'config': {'count': len([name for name in os.listdir(corpus) if name.endswith('.pdf')]),
+                       'corpus': args.corpus, **{option: getattr(args, option) for option in CHILD_OPTIONS}},
+            'paths': {},
+        }
+        for path in paths:
+            result_file = os.path.join(tmp, f'{path}.json')
+            command = [sys.executable, '-m', 'benchmarks.bench_e2e', *forwarded, '--run-path', path,
+                       '--corpus', corpus, '--workdir', os.path.join(tmp, path), '--result-file', result_file]
+            print(f"Running {path} path...", flush=True)
+            completed = subprocess.run(command, env=env, stdout=subprocess.DEVNULL if not args.logs else None)
+            if completed.returncode != 0 or not os.path.exists(result_file):
+                print(f"{path} path failed (exit code {completed.returncode})")
+                continue
+            with open(result_file) as f:
+                report['paths'][path] = json.load(f)
+
+    print_report(report)
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(json.load(f), report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    return 0 if report['paths'] else 1
+
+if __name__ == '__main__':
+    raise SystemExit(main())
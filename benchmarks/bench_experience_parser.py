@@ -0,0 +1,104 @@
+"""Check experience_parser against a labelled corpus and benchmark it.
+
+Run from the repository root:
+    python -m benchmarks.bench_experience_parser --strings 200000
+"""
+import argparse
+import random
+import time
+
+from experience_parser import _parse, duration_months, month_index, total_experience_months
+
+TODAY = month_index(2024, 6)  # Fixed "present" so the expected values never drift
+
+# (duration string, expected months)
+CORPUS = [
+    ("Jan 2019 - Mar 2021", 26),
+    ("January 2019 – March 2021", 26),
+    ("Sept 2020 to Aug 2022", 23),
+    ("Mar '19 - Jun '20", 15),
+    ("01/2019 - 03/2021", 26),
+    ("6/2018 - 6/2019", 12),
+    ("2018 - 2021", 36),
+    ("2019-20", 12),
+    ("1998 - 02", 48),
+    ("2021 - Present", 41),
+    ("Jun 2023 - Current", 12),
+    ("Feb 2022 – till date", 28),
+    ("May 2020 - May 2020", 1),
+    ("2 years", 24),
+    ("3+ years", 36),
+    ("1.5 yrs", 18),
+    ("2 years 3 months", 27),
+    ("6 months", 6),
+    ("One year", 12),
+    ("Less than a year", 0),
+    ("Under 6 months", 0),
+    ("Jan 2019 - Mar 2021, 2 years", 26),
+    ("Jan 2019 - Mar 2021 (2 yrs 2 mos)", 26),
+    ("Present", 0),
+    ("", 0),
+    (None, 0),
+    ("Internship", 0),
+    ("Mar 2021 - Jan 2019", 0),
+]
+
+# (durations of one candidate's jobs, expected total months)
+TOTALS = [
+    (["Jan 2019 - Dec 2020", "Jun 2020 - Jun 2021"], 29),  # Overlapping jobs count once
+    (["2015 - 2017", "2017 - 2019"], 48),  # Back-to-back jobs
+    (["Jan 2019 - Jan 2020", "2 years"], 36),  # Stated lengths are added on top
+    (["Jan 2022 - Present", "Mar 2023 - Present"], 29),
+    ([], 0),
+]
+
+def check_corpus():
+    failures = []
+    for duration, expected in CORPUS:
+        months = duration_months(duration, today=TODAY)
+        if months != expected:
+            failures.append((duration, expected, months))
+    for durations, expected in TOTALS:
+        months = total_experience_months([{"duration": d} for d in durations], today=TODAY)
+        if months != expected:
+            failures.append((durations, expected, months))
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--strings", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    failures = check_corpus()
+    for duration, expected, months in failures:
+        print(f"MISMATCH {duration!r}: expected {expected}, got {months}")
+    print(f"Corpus: {len(CORPUS) + len(TOTALS) - len(failures)}/{len(CORPUS) + len(TOTALS)} correct")
+
+    # A resume pool repeats the same few duration strings, which is what the cache exploits
+    rng = random.Random(args.seed)
+    pool = [duration for duration, _ in CORPUS if duration] + [
+        f"{rng.choice(['Jan', 'Apr', 'Jul', 'Oct'])} {year} - {rng.choice(['Present', f'Dec {year + 2}'])}"
+        for year in range(2000, 2024)
+    ]
+    strings = [rng.choice(pool) for _ in range(args.strings)]
+
+    _parse.cache_clear()
+    start = time.perf_counter()
+    for duration in strings:
+        _parse.__wrapped__(duration, TODAY)
+    uncached_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for duration in strings:
+        duration_months(duration, today=TODAY)
+    cached_seconds = time.perf_counter() - start
+
+    print(f"Strings:  {args.strings} ({len(set(strings))} distinct)")
+    print(f"Uncached: {uncached_seconds:.3f}s ({args.strings / uncached_seconds:,.0f}/s)")
+    print(f"Cached:   {cached_seconds:.3f}s ({args.strings / cached_seconds:,.0f}/s)")
+    print(f"Cache:    {_parse.cache_info()}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
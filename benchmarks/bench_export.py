@@ -0,0 +1,77 @@
+"""Benchmark bulk export and import of the candidate store and check that memory stays flat.
+
+Run from the repository root:
+    python -m benchmarks.bench_export --records 8000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_resume_model import make_reply
+from candidate_export import EXPORT_FORMATS, export_candidates, import_candidates, rescore_candidates
+from candidate_store import CandidateStore
+
+def fill_store(store, count, seed):
+    rng = random.Random(seed)
+    for start in range(0, count, 2000):
+        batch = [make_reply(rng) for _ in range(min(2000, count - start))]
+        for index, candidate in enumerate(batch):
+            candidate['email'] = f"candidate{start + index}@example.com"
+            candidate['phone'] = f"+1 555 {start + index:07d}"  # make_reply repeats one phone; dedupe matches on it
+        rescore_candidates(batch)
+        store.add_many(batch, dedupe=False)
+
+def measure(action):
+    """(seconds, peak traced Python memory in MB, result) of action().
+
+    Runs it twice: timed without tracemalloc, which slows it several times, then traced.
+    """
+    start = time.perf_counter()
+    result = action()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    action()
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return seconds, peak, result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=8000)
+    parser.add_argument('--seed', type=int, default=5)
+    parser.add_argument('--formats', default=','.join(EXPORT_FORMATS))
+    args = parser.parse_args(argv)
+
+    failures = 0
+    with tempfile.TemporaryDirectory(prefix='bench_export_') as tmp:
+        # A pool and one four times its size: peak memory should not grow with it
+        for count in (args.records // 4, args.records):
+            store = CandidateStore(os.path.join(tmp, f'pool{count}.db'))
+            fill_store(store, count, args.seed)
+            print(f"pool of {count} candidates")
+            for fmt in args.formats.split(','):
+                path = os.path.join(tmp, f'pool{count}.{fmt}')
+                try:
+                    seconds, peak, exported = measure(lambda: export_candidates(store, path, fmt))
+                except RuntimeError as e:
+                    print(f"  {fmt:<8} skipped: {e}")
+                    continue
+                size = os.path.getsize(path) / 1e6
+                print(f"  export {fmt:<8} {exported / seconds:>9,.0f} rows/s  peak {peak:6.1f} MB  file {size:7.1f} MB")
+
+                # Dedupe makes the second (traced) run update the same records
+                target = CandidateStore(os.path.join(tmp, f'import{count}{fmt}.db'))
+                seconds, peak, imported = measure(lambda: import_candidates(target, path, rescore=True))
+                print(f"  import {fmt:<8} {imported / seconds:>9,.0f} rows/s  peak {peak:6.1f} MB  (re-scored)")
+                original = {(c['email'], c['resume_score']) for c in store.iter_candidates()}
+                copied = {(c['email'], c['resume_score']) for c in target.iter_candidates()}
+                if exported != count or imported != count or original != copied:
+                    print(f"  MISMATCH: exported {exported}, imported {imported}, {len(original ^ copied)} differences")
+                    failures += 1
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+"""Compare tail latency of Groq extraction with and without hedged requests, against a local stub.
+
+Run from the repository root:
+    python -m benchmarks.bench_model_router --requests 400 --tail-rate 0.05 --tail-latency 2
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stub_services import StubGroqServer
+from benchmarks.synthetic_corpus import generate_corpus
+from groq_client import GroqClient
+from model_router import ModelRouter
+from resume_model import parse_reply
+from resume_parser import (GROQ_MODEL, GROQ_SMALL_MODEL, SMALL_MODEL_MAX_TOKENS, build_payload,
+                           extract_text_from_pdf)
+
+def parse(data):
+    return parse_reply(data["choices"][0]["message"]["content"])
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+def run(payloads, stub, hedge, args):
+    client = GroqClient('bench-key', stub.url, requests_per_minute=args.requests_per_minute, tokens_per_minute=0)
+    routes = [(SMALL_MODEL_MAX_TOKENS, GROQ_SMALL_MODEL), (None, GROQ_MODEL)]
+    router = ModelRouter(client, routes, hedge=hedge, initial_delay=args.initial_delay, budget=args.budget)
+    stub.models.clear()
+
+    def one(payload):
+        start = time.perf_counter()
+        _, model = router.chat(router.route(payload), parse=parse)
+        return time.perf_counter() - start, model
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(one, payloads))
+    latencies = [seconds for seconds, _ in results]
+    label = "hedged" if hedge else "single"
+    print(f"[{label}] p50 {1000 * statistics.median(latencies):7.1f} ms   p95 {1000 * percentile(latencies, 95):7.1f} ms"
+          f"   p99 {1000 * percentile(latencies, 99):7.1f} ms   max {1000 * max(latencies):7.1f} ms")
+    print(f"  hedges sent {router.hedges}/{router.requests}, stub requests by model {dict(stub.models)}")
+    return latencies
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--resumes', type=int, default=30, help="Distinct synthetic resumes to cycle through")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.15, help="Mean stub latency of the large model (seconds)")
+    parser.add_argument('--small-latency', type=float, default=0.05, help="Mean stub latency of the small model")
+    parser.add_argument('--jitter', type=float, default=0.02)
+    parser.add_argument('--tail-rate', type=float, default=0.05, help="Fraction of requests that stall")
+    parser.add_argument('--tail-latency', type=float, default=2.0, help="Extra seconds a stalled request takes")
+    parser.add_argument('--initial-delay', type=float, default=1.0, help="Hedge delay before enough samples exist")
+    parser.add_argument('--budget', type=float, default=0.1, help="Fraction of requests that may be hedged")
+    parser.add_argument('--requests-per-minute', type=int, default=0,
+                        help="Local rate limit; time queued for it must not trigger hedges (0 = off)")
+    args = parser.parse_args(argv)
+
+    texts = [extract_text_from_pdf(pdf) for _, pdf, _ in generate_corpus(args.resumes, seed=3)]
+    payloads = [build_payload(texts[index % len(texts)]) for index in range(args.requests)]
+
+    for hedge in (False, True):
+        # Same seed for both runs so they see the same stalls
+        stub = StubGroqServer(latency=args.latency, jitter=args.jitter, tail_rate=args.tail_rate,
+                              tail_latency=args.tail_latency, seed=11, stream_interval=0,
+                              model_latency={GROQ_SMALL_MODEL: args.small_latency}).start()
+        try:
+            run(payloads, stub, hedge, args)
+        finally:
+            stub.stop()
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
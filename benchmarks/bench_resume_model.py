@@ -0,0 +1,108 @@
+"""Check the tolerant reply parser against damaged replies and benchmark the resume model.
+
+Run from the repository root:
+    python -m benchmarks.bench_resume_model --records 20000
+"""
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+from resume_model import Resume, dumps, loads, parse_reply
+
+SKILL_POOL = ["Python", "Java", "JavaScript", "SQL", "AWS", "Docker", "Kubernetes", "React", "Angular", "Node",
+              "Excel", "Communication", "Go", "Rust", "C++", "Figma", "Leadership", "Pandas", "Linux", "Git"]
+
+def make_reply(rng):
+    """A plausible LLM extraction reply as a dict"""
+    return {
+        "name": rng.choice(["Jane Doe", "Ravi Kumar Singh", "Ana Lima"]),
+        "email": "candidate@example.com",
+        "phone": "+91 98765 43210",
+        "skills": rng.sample(SKILL_POOL, rng.randint(3, 12)),
+        "education": [{"institution": "State University", "degree": "B.Tech", "graduation": "2018",
+                       "cgpa": rng.choice([8.7, "9.1/10", 3.4]), "percentage": rng.choice(["85%", 72, None])}
+                      for _ in range(rng.randint(1, 2))],
+        "work_experience": [{"company": f"Company {index}", "role": "Software Engineer",
+                             "duration": "Jan 2019 - Mar 2021",
+                             "responsibilities": ["Built REST services", "Reviewed code", "Mentored interns"]}
+                            for index in range(rng.randint(1, 4))],
+        "certifications": rng.sample(["AWS Certified", "CKA", "Scrum Master"], rng.randint(0, 2)),
+        "projects": [{"name": f"Project {index}", "description": "Search backend for internal documents",
+                      "technologies_used": rng.sample(SKILL_POOL, 3)} for index in range(rng.randint(0, 3))],
+    }
+
+def damaged(reply):
+    """(label, text) variants of a reply that json.loads rejects"""
+    text = json.dumps(reply, indent=2)
+    return [
+        ("code fence", f"```json\n{text}\n```"),
+        ("surrounding prose", f"Here is the extracted data:\n{text}\nLet me know if you need anything else."),
+        ("trailing commas", text.replace('\n  }', ',\n  }').replace('\n  ]', ',\n  ]')),
+        ("truncated", text[:len(text) * 2 // 3]),
+    ]
+
+def measure_memory(build, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = [build(index) for index in range(count)]
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del items
+    return size / count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    replies = [make_reply(rng) for _ in range(args.records)]
+    texts = [json.dumps(reply) for reply in replies]
+
+    recovered = 0
+    cases = [case for reply in replies[:50] for case in damaged(reply)]
+    for label, text in cases:
+        try:
+            data = parse_reply(text)
+            recovered += bool(data.get("name"))
+        except ValueError as e:
+            print(f"not recovered ({label}): {e}")
+    print(f"damaged replies recovered: {recovered}/{len(cases)}")
+
+    start = time.perf_counter()
+    for text in texts:
+        json.loads(text)
+    plain = time.perf_counter() - start
+    start = time.perf_counter()
+    for text in texts:
+        parse_reply(text)
+    validated = time.perf_counter() - start
+    fenced = [f"```json\n{text}\n```" for text in texts[:2000]]
+    start = time.perf_counter()
+    for text in fenced:
+        parse_reply(text)
+    repaired = (time.perf_counter() - start) / len(fenced)
+    print(f"json.loads:          {1e6 * plain / len(texts):8.1f} us/reply")
+    print(f"parse_reply:         {1e6 * validated / len(texts):8.1f} us/reply")
+    print(f"parse_reply (fence): {1e6 * repaired:8.1f} us/reply")
+
+    dict_bytes = measure_memory(lambda index: json.loads(texts[index]), len(texts))
+    model_bytes = measure_memory(lambda index: Resume.from_dict(json.loads(texts[index])), len(texts))
+    print(f"memory per candidate: dict {dict_bytes:,.0f} B, Resume {model_bytes:,.0f} B "
+          f"({100 * (1 - model_bytes / dict_bytes):.0f}% less)")
+
+    rows = [dumps(reply) for reply in replies]
+    json_size = sum(len(json.dumps(Resume.from_dict(reply).to_dict(), separators=(',', ':'))) for reply in replies)
+    row_size = sum(len(row) for row in rows)
+    print(f"serialized size: JSON dict {json_size / len(rows):,.0f} B, compact row {row_size / len(rows):,.0f} B "
+          f"({100 * (1 - row_size / json_size):.0f}% smaller)")
+    start = time.perf_counter()
+    mismatches = sum(loads(row) != Resume.from_dict(reply) for row, reply in zip(rows, replies))
+    print(f"row round trip: {1e6 * (time.perf_counter() - start) / len(rows):.1f} us/record, {mismatches} mismatches")
+    return 1 if mismatches or recovered < len(cases) else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+"""Measure cold-start import time of the app entry points in fresh interpreters.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup --runs 10
+    python -m benchmarks.bench_startup --modules app --importtime
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+MODULES = ("resume_parser", "batch_processor", "app")
+
+_TIMER = "import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+
+def time_import(module, env, cwd):
+    """Seconds to import module in a new interpreter, or None if the import failed"""
+    completed = subprocess.run([sys.executable, '-c', _TIMER.format(module=module)], env=env, cwd=cwd,
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        print(f"  import {module} failed: {completed.stderr.strip().splitlines()[-1:]}")
+        return None
+    return float(completed.stdout.strip().splitlines()[-1])
+
+def slowest_imports(module, env, cwd, top=10):
+    """(cumulative microseconds, package) of the slowest imports, from python -X importtime"""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], env=env, cwd=cwd,
+                               capture_output=True, text=True)
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, package = (part.strip() for part in line[len('import time:'):].split('|'))
+        if not package.startswith(' ') and '.' not in package.strip():
+            rows.append((int(cumulative), package.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modules', default=','.join(MODULES))
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--importtime', action='store_true', help="Also list the slowest top-level imports")
+    parser.add_argument('-o', '--output', help="Write the results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    repo = os.getcwd()
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='bench_startup_') as tmp:
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [repo, env.get('PYTHONPATH')]))
+        # Databases and uploads/ go to a scratch directory; no network is needed to start
+        env.update({'CANDIDATES_DB': os.path.join(tmp, 'candidates.db'), 'JOBS_DB': os.path.join(tmp, 'jobs.db')})
+
+        for module in args.modules.split(','):
+            times = [time_import(module, env, tmp) for _ in range(args.runs)]
+            times = [seconds for seconds in times if seconds is not None]
+            if not times:
+                results[module] = None
+                continue
+            results[module] = {
+                'runs': len(times),
+                'median_ms': round(1000 * statistics.median(times), 1),
+                'min_ms': round(1000 * min(times), 1),
+                'max_ms': round(1000 * max(times), 1),
+            }
+            print(f"import {module:<16} median {results[module]['median_ms']:>8} ms   "
+                  f"min {results[module]['min_ms']:>8} ms")
+            if args.importtime:
+                for cumulative, package in slowest_imports(module, env, tmp):
+                    print(f"    {cumulative / 1000:>8.1f} ms  {package}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0 if all(results.values()) else 1
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,209 @@
+"""Local stand-ins for the Groq API and Google Sheets with latency and error injection."""
+import collections
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fast_extract import extract_fast
+from groq_client import estimate_tokens
+
+_field_re = re.compile(r'^- (\w+)', re.MULTILINE)
+
+def _latency(rng, mean, jitter):
+    return max(0.0, rng.gauss(mean, jitter)) if mean else 0.0
+
+def fake_extraction(prompt):
+    """A plausible Groq reply for a parse prompt: local extraction for contacts and skills, filler for the rest"""
+    instructions, _, resume_text = prompt.partition("Resume Text:")
+    found = extract_fast(resume_text)
+    reply = {
+        "name": found["name"],
+        "email": found["email"],
+        "phone": found["phone"],
+        "skills": found["skills"],
+        "education": [{"institution": "State University", "degree": "B.Tech", "graduation": "2018", "cgpa": 8.4}],
+        "work_experience": [{"company": "Acme Corp", "role": "Software Engineer", "duration": "Jan 2019 - Present",
+                             "responsibilities": ["Built services"]}],
+        "certifications": ["AWS Certified"],
+        "projects": [{"name": "Search", "description": "Search backend", "technologies_used": found["skills"][:3]}],
+    }
+    # Only answer with the fields the prompt asked for
+    requested = set(_field_re.findall(instructions))
+    return {field: value for field, value in reply.items() if not requested or field in requested}
+
+class StubGroqServer:
+    """Chat-completions endpoint on localhost.
+
+    Each request sleeps for a Gaussian latency (plus tail_latency for a
+    fraction tail_rate of requests, or the per-model latency in
+    model_latency), and a fraction error_rate of requests is answered with
+    429 or 500 (with Retry-After) instead.
+    Streaming requests get the reply as Server-Sent Events in small chunks,
+    stream_interval seconds apart, after the same initial latency.
+    """
+
+    def __init__(self, latency=0.3, jitter=0.1, error_rate=0.0, seed=0, host='127.0.0.1', port=0,
+                 stream_interval=0.005, chunk_size=16, tail_rate=0.0, tail_latency=0.0, model_latency=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.model_latency = dict(model_latency or {})  # model -> mean latency instead of latency
+        self.models = collections.Counter()  # Requests received per model
+        self.error_rate = error_rate
+        self.stream_interval = stream_interval
+        self.chunk_size = chunk_size
+        self.requests = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, like the real API
+            disable_nagle_algorithm = True  # Otherwise delayed ACKs add ~40 ms to every keep-alive response
+
+            def do_POST(self):
+                try:
+                    self.reply()
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True  # The client cancelled the request and closed the connection
+
+            def reply(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                payload = json.loads(body or b'{}')
+                status, reply = stub.respond(payload)
+                if status == 200 and payload.get('stream'):
+                    self.stream(reply)
+                    return
+                data = json.dumps(reply).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                if status != 200:
+                    self.send_header('Retry-After', '0')
+                self.end_headers()
+                self.wfile.write(data)
+
+            def stream(self, reply):
+                events = [f"data: {json.dumps(chunk)}\n\n".encode('utf-8') for chunk in stub.stream_chunks(reply)]
+                events.append(b"data: [DONE]\n\n")
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Content-Length', str(sum(len(event) for event in events)))
+                self.end_headers()
+                for event in events:
+                    self.wfile.write(event)
+                    self.wfile.flush()
+                    time.sleep(stub.stream_interval)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.url = f'http://{host}:{self.server.server_address[1]}/openai/v1/chat/completions'
+        self._thread = None
+
+    def respond(self, payload):
+        with self._lock:
+            self.requests += 1
+            model = payload.get("model")
+            self.models[model] += 1
+            delay = _latency(self._rng, self.model_latency.get(model, self.latency), self.jitter)
+            if self._rng.random() < self.tail_rate:
+                delay += self.tail_latency
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+                status = self._rng.choice((429, 500))
+        time.sleep(delay)
+        if failed:
+            return status, {"error": {"message": "injected error"}}
+
+        prompt = ''.join(message.get('content', '') for message in payload.get('messages', []))
+        content = json.dumps(fake_extraction(prompt))
+        return 200, {
+            "model": payload.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": estimate_tokens(prompt), "completion_tokens": estimate_tokens(content)},
+        }
+
+    def stream_chunks(self, reply):
+        """Split a chat-completions reply into streaming chunks, with usage on the last one"""
+        content = reply["choices"][0]["message"]["content"]
+        for start in range(0, len(content), self.chunk_size):
+            yield {"model": reply["model"],
+                   "choices": [{"index": 0, "delta": {"content": content[start:start + self.chunk_size]}}]}
+        yield {"model": reply["model"], "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+               "x_groq": {"usage": reply["usage"]}}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="stub-groq", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+class FakeSheetsService:
+    """Mimics the spreadsheets().values() calls SheetsManager makes"""
+
+    def __init__(self, latency=0.2, jitter=0.05, error_rate=0.0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rows = 0
+        self.calls = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, **kwargs):
+        return _Request(self, lambda: {'values': [['Name']]})
+
+    def update(self, **kwargs):
+        return _Request(self, lambda: {})
+
+    def append(self, body=None, **kwargs):
+        def execute():
+            with self._lock:
+                self.rows += len(body['values'])
+            return {'updates': {'updatedRows': len(body['values'])}}
+        return _Request(self, execute)
+
+class _Request:
+    def __init__(self, service, result):
+        self.service = service
+        self.result = result
+
+    def execute(self):
+        service = self.service
+        with service._lock:
+            service.calls += 1
+            delay = _latency(service._rng, service.latency, service.jitter)
+            failed = service._rng.random() < service.error_rate
+            if failed:
+                service.errors += 1
+        time.sleep(delay)
+        if failed:
+            raise RuntimeError("injected Sheets error")
+        return self.result()
+
+def fake_sheets_manager(service):
+    """A SheetsManager wired to a FakeSheetsService instead of Google"""
+    from sheets_manager import SheetsManager
+    manager = SheetsManager.__new__(SheetsManager)
+    manager.creds = None
+    manager.service = service
+    return manager
@@ -0,0 +1,167 @@
+"""Generate a synthetic corpus of resume PDFs in different sizes and layouts.
+
+Run from the repository root:
+    python -m benchmarks.synthetic_corpus bench_corpus --count 200
+"""
+import argparse
+import json
+import os
+import random
+
+FIRST_NAMES = ["Jane", "Ravi", "Maria", "Chen", "Amara", "Lukas", "Priya", "Diego", "Fatima", "Noah", "Aiko", "Omar"]
+LAST_NAMES = ["Doe", "Kumar", "Garcia", "Wei", "Okafor", "Muller", "Sharma", "Lopez", "Hassan", "Smith", "Sato", "Ali"]
+SKILLS = ["Python", "Java", "JavaScript", "SQL", "AWS", "Docker", "Kubernetes", "React", "Angular", "Node.js",
+          "Go", "Rust", "C++", "TensorFlow", "Pandas", "PostgreSQL", "MongoDB", "Kafka", "Terraform", "Git",
+          "Linux", "Figma", "Excel", "Power BI", "Spark", "Redis", "GraphQL", "Flask", "Django", "Azure"]
+ROLES = ["Software Engineer", "Data Analyst", "Backend Developer", "ML Engineer", "DevOps Engineer",
+         "Frontend Developer", "Data Scientist", "QA Engineer", "Site Reliability Engineer"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Tech", "Hooli", "Vandelay"]
+DEGREES = ["B.Tech Computer Science", "B.Sc Mathematics", "M.Sc Data Science", "MBA", "B.E. Electronics"]
+SCHOOLS = ["State University", "Institute of Technology", "City College", "National University"]
+VERBS = ["Built", "Designed", "Migrated", "Optimized", "Led", "Automated", "Maintained", "Shipped"]
+OBJECTS = ["a payments service", "the data pipeline", "CI/CD workflows", "an analytics dashboard",
+           "the search backend", "a recommendation model", "internal tooling", "the mobile API"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# name: (page range, jobs, bullets per job, projects)
+SIZES = {
+    "short": ((1, 1), 2, 3, 1),
+    "medium": ((2, 3), 4, 5, 3),
+    "long": ((6, 10), 8, 8, 6),
+}
+# name: (font size, leading, columns)
+LAYOUTS = {
+    "single_column": (11, 14, 1),
+    "two_column": (10, 13, 2),
+    "dense": (8, 9, 1),
+}
+PAGE_WIDTH, PAGE_HEIGHT, MARGIN = 612, 792, 50
+
+def _escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)').encode('latin-1', 'replace').decode('latin-1')
+
+def build_pdf(pages):
+    """Minimal PDF from pages of text blocks: [(x, y, font_size, leading, [lines]), ...]"""
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None]
+    font_id = 3 + 2 * len(pages)
+    kids = []
+    for index, blocks in enumerate(pages):
+        page_id, content_id = 3 + 2 * index, 4 + 2 * index
+        kids.append(f'{page_id} 0 R')
+        stream = ''.join(
+            f'BT /F1 {size} Tf {leading} TL {x} {y} Td ' + ' '.join(f"({_escape(line)}) '" for line in lines) + ' ET\n'
+            for x, y, size, leading, lines in blocks
+        )
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] '
+                       f'/Contents {content_id} 0 R /Resources << /Font << /F1 {font_id} 0 R >> >> >>')
+        objects.append(f'<< /Length {len(stream)} >>\nstream\n{stream}endstream')
+    objects[1] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {len(pages)} >>'
+    objects.append('<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+
+    out = '%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f'{number} 0 obj\n{body}\nendobj\n'
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n' + ''.join(f'{offset:010d} 00000 n \n' for offset in offsets)
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'
+    return out.encode('latin-1')
+
+def make_resume(rng, size):
+    """Random resume content as (contact lines, sidebar lines, body lines)"""
+    _, jobs, bullets, projects = SIZES[size]
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    contact = [f"{first} {last}", f"{first.lower()}.{last.lower()}{rng.randint(1, 9999)}@example.com",
+               f"+1 {rng.randint(200, 999)} {rng.randint(200, 999)} {rng.randint(1000, 9999)}"]
+    sidebar = ["SKILLS"] + rng.sample(SKILLS, rng.randint(4, 14)) + ["", "EDUCATION"]
+    for _ in range(rng.randint(1, 2)):
+        year = rng.randint(2005, 2020)
+        sidebar += [rng.choice(DEGREES), f"{rng.choice(SCHOOLS)}, {year}", f"CGPA: {rng.uniform(6.5, 9.8):.1f}"]
+
+    body = ["PROFESSIONAL SUMMARY", " ".join(rng.choice(VERBS) + " " + rng.choice(OBJECTS) for _ in range(3)), "",
+            "WORK EXPERIENCE"]
+    year = 2024
+    for _ in range(jobs):
+        start = year - rng.randint(1, 4)
+        end = "Present" if year == 2024 else f"{rng.choice(MONTHS)} {year}"
+        body += [f"{rng.choice(ROLES)} - {rng.choice(COMPANIES)}", f"{rng.choice(MONTHS)} {start} - {end}"]
+        body += [f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)}, cutting latency by "
+                 f"{rng.randint(5, 60)}%" for _ in range(bullets)]
+        body.append("")
+        year = start
+    body.append("PROJECTS")
+    for number in range(projects):
+        body += [f"Project {number + 1}: {rng.choice(OBJECTS).title()}",
+                 f"Technologies: {', '.join(rng.sample(SKILLS, 3))}"]
+    body += ["", "CERTIFICATIONS"] + [f"{rng.choice(SKILLS)} Certified Professional" for _ in range(rng.randint(0, 4))]
+    return contact, sidebar, body
+
+def layout_pages(contact, sidebar, body, layout, page_count):
+    """Lay resume lines out over page_count pages, with a repeated footer and page numbers"""
+    size, leading, columns = LAYOUTS[layout]
+    lines_per_page = (PAGE_HEIGHT - 2 * MARGIN) // leading - 2
+    footer = contact[0] + " - Resume"
+    if columns == 1:
+        main_lines = contact + [""] + sidebar + [""] + body
+        sidebar_lines = []
+    else:
+        main_lines = body
+        sidebar_lines = contact + [""] + sidebar
+    # Pad the body so it fills the requested number of pages
+    filler = [line for line in body if line.startswith("- ")] or ["-"]
+    index = 0
+    while len(main_lines) < lines_per_page * (page_count - 1) + 1:
+        main_lines.append(filler[index % len(filler)])
+        index += 1
+
+    pages = []
+    for number in range(page_count):
+        chunk = main_lines[number * lines_per_page:(number + 1) * lines_per_page]
+        if number == page_count - 1:
+            chunk = main_lines[number * lines_per_page:]
+        x = MARGIN if columns == 1 else MARGIN + 190
+        blocks = [(x, PAGE_HEIGHT - MARGIN, size, leading, chunk)]
+        if number == 0 and sidebar_lines:
+            blocks.append((MARGIN, PAGE_HEIGHT - MARGIN, size, leading, sidebar_lines))
+        blocks.append((MARGIN, MARGIN - 20, 8, 10, [footer, f"Page {number + 1} of {page_count}"]))
+        pages.append(blocks)
+    return pages
+
+def generate_corpus(count, seed=42, sizes=tuple(SIZES), layouts=tuple(LAYOUTS)):
+    """Yield (filename, pdf_bytes, info) for count synthetic resumes, cycling through sizes and layouts"""
+    rng = random.Random(seed)
+    for number in range(count):
+        size = sizes[number % len(sizes)]
+        layout = layouts[(number // len(sizes)) % len(layouts)]
+        low, high = SIZES[size][0]
+        page_count = rng.randint(low, high)
+        contact, sidebar, body = make_resume(rng, size)
+        pdf_bytes = build_pdf(layout_pages(contact, sidebar, body, layout, page_count))
+        filename = f"resume_{number:05d}_{size}_{layout}.pdf"
+        yield filename, pdf_bytes, {"size": size, "layout": layout, "pages": page_count, "bytes": len(pdf_bytes)}
+
+def write_corpus(directory, count, seed=42):
+    """Write the corpus and a manifest.json to directory; returns the manifest"""
+    os.makedirs(directory, exist_ok=True)
+    manifest = {"seed": seed, "count": count, "files": {}}
+    for filename, pdf_bytes, info in generate_corpus(count, seed):
+        with open(os.path.join(directory, filename), 'wb') as f:
+            f.write(pdf_bytes)
+        manifest["files"][filename] = info
+    with open(os.path.join(directory, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory")
+    parser.add_argument("--count", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    manifest = write_corpus(args.directory, args.count, args.seed)
+    total = sum(info["bytes"] for info in manifest["files"].values())
+    print(f"Wrote {args.count} PDFs ({total / 1024:.0f} KB) to {args.directory}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import numpy as np
+
+from experience_parser import duration_months, total_experience_months
+from resume_parser import TECHNICAL_KEYWORDS, ATS_RECOMMENDATIONS, ATS_DEFAULT_RECOMMENDATION
+
+# ----------- Bulk Scoring ------------
+# Columnar re-implementation of score_resume for re-scoring the whole pool.
+# extract_features turns parsed resumes into flat numpy columns once; score_features
+# then computes every sub-score with array operations, so trying new weights or
+# keywords only repeats the cheap vectorized step. Results match score_resume exactly.
+
+def _record_features(parsed_data):
+    # Mirrors the checks in score_resume; raises wherever score_resume would raise
+    name = parsed_data.get("name")
+    name_ok = bool(name and len(parsed_data["name"].split()) >= 2)
+
+    email = parsed_data.get("email", "")
+    email = ''.join(char for char in email if ord(char) < 128).strip()
+    email_ok = bool(email and "@" in email and "." in email.split("@")[1])
+
+    phone_ok = False
+    if parsed_data.get("phone"):
+        phone_ok = len(''.join(filter(str.isdigit, parsed_data["phone"]))) >= 10
+
+    skills = parsed_data.get("skills", [])
+    skills = [skill.lower() for skill in skills] if isinstance(skills, list) else []
+
+    education = parsed_data.get("education", [])
+    education_count = len(education) if isinstance(education, list) else 0
+    education_entries = []
+    for edu in education if isinstance(education, list) else ():
+        if not isinstance(edu, dict):
+            continue
+        try:
+            percentage = float(str(edu.get("percentage", "0")).replace('%', ''))
+        except (ValueError, TypeError):
+            # score_resume skips the whole entry, including its CGPA
+            continue
+        cgpa = edu.get("cgpa", 0)
+        cgpa = float(cgpa) if isinstance(cgpa, (int, float)) else np.nan
+        education_entries.append((percentage, cgpa))
+
+    work_experience = parsed_data.get("work_experience", [])
+    work_count = len(work_experience) if isinstance(work_experience, list) else 0
+    work_years = []
+    for exp in work_experience if isinstance(work_experience, list) else ():
+        if isinstance(exp, dict) and "duration" in exp:
+            work_years.append(duration_months(exp["duration"]) // 12)
+
+    projects = parsed_data.get("projects", [])
+    certifications = parsed_data.get("certifications", [])
+    return (name_ok, email_ok, phone_ok, skills, education_count, education_entries, work_count, work_years,
+            len(projects) if isinstance(projects, list) else 0,
+            len(certifications) if isinstance(certifications, list) else 0)
+
+def extract_features(records):
+    """Convert parsed resume dicts into a columnar feature batch.
+
+    Variable-length fields (skills, education entries, work durations) are
+    stored flat with a row index column. Records that score_resume would fail
+    on are marked False in "valid" and contribute no features.
+    """
+    name_ok, email_ok, phone_ok, valid = [], [], [], []
+    skill_count, education_count, work_count, project_count, certification_count = [], [], [], [], []
+    skill_row, skill_id, vocabulary = [], [], {}
+    education_row, percentage, cgpa = [], [], []
+    work_row, work_years = [], []
+
+    for row, parsed_data in enumerate(records):
+        try:
+            features = _record_features(parsed_data)
+        except Exception:
+            features = (False, False, False, [], 0, [], 0, [], 0, 0)
+            valid.append(False)
+        else:
+            valid.append(True)
+
+        name, email, phone, skills, edu_count, edu_entries, exp_count, years, projects, certifications = features
+        name_ok.append(name)
+        email_ok.append(email)
+        phone_ok.append(phone)
+        skill_count.append(len(skills))
+        for skill in skills:
+            skill_row.append(row)
+            skill_id.append(vocabulary.setdefault(skill, len(vocabulary)))
+        education_count.append(edu_count)
+        for entry_percentage, entry_cgpa in edu_entries:
+            education_row.append(row)
+            percentage.append(entry_percentage)
+            cgpa.append(entry_cgpa)
+        work_count.append(exp_count)
+        work_row.extend([row] * len(years))
+        work_years.extend(years)
+        project_count.append(projects)
+        certification_count.append(certifications)
+
+    return {
+        'size': len(valid),
+        'valid': np.array(valid, dtype=bool),
+        'name_ok': np.array(name_ok, dtype=bool),
+        'email_ok': np.array(email_ok, dtype=bool),
+        'phone_ok': np.array(phone_ok, dtype=bool),
+        'skill_count': np.array(skill_count, dtype=np.int64),
+        'skill_row': np.array(skill_row, dtype=np.int64),
+        'skill_id': np.array(skill_id, dtype=np.int64),
+        'skill_vocabulary': list(vocabulary),
+        'education_count': np.array(education_count, dtype=np.int64),
+        'education_row': np.array(education_row, dtype=np.int64),
+        'percentage': np.array(percentage, dtype=np.float64),
+        'cgpa': np.array(cgpa, dtype=np.float64),
+        'work_count': np.array(work_count, dtype=np.int64),
+        'work_row': np.array(work_row, dtype=np.int64),
+        'work_years': np.array(work_years, dtype=np.int64),
+        'project_count': np.array(project_count, dtype=np.int64),
+        'certification_count': np.array(certification_count, dtype=np.int64),
+    }
+
+def _per_row(rows, values, size):
+    return np.bincount(rows, weights=values, minlength=size).astype(np.int64)
+
+def score_features(features, technical_keywords=TECHNICAL_KEYWORDS):
+    """Vectorized sub-scores, totals and ATS recommendations for a feature batch"""
+    size = features['size']
+
+    basic = 5 * (features['name_ok'].astype(np.int64) + features['email_ok'] + features['phone_ok'])
+
+    skill_count = features['skill_count']
+    skills = np.select([skill_count >= 8, skill_count >= 5, skill_count >= 3], [15, 10, 5], 0)
+    keyword_ids = [i for i, skill in enumerate(features['skill_vocabulary']) if skill in technical_keywords]
+    is_technical = np.isin(features['skill_id'], keyword_ids)
+    tech_count = _per_row(features['skill_row'], is_technical.astype(np.int64), size)
+    skills = skills + np.minimum(tech_count * 2, 10)
+
+    percentage, cgpa = features['percentage'], features['cgpa']
+    entry_points = np.select([percentage >= 80, percentage >= 70], [3, 2], 0)
+    # NaN (non-numeric CGPA) compares False, matching the isinstance check in score_resume
+    entry_points = entry_points + np.select([cgpa >= 3.5, cgpa >= 3.0], [3, 2], 0)
+    education = np.minimum(features['education_count'] * 5, 10)
+    education = np.minimum(education + _per_row(features['education_row'], entry_points, size), 20)
+
+    experience = np.minimum(features['work_count'] * 5, 15)
+    year_points = np.minimum(features['work_years'] * 2, 10)
+    experience = np.minimum(experience + _per_row(features['work_row'], year_points, size), 25)
+
+    extra = np.minimum(features['project_count'] * 3, 8) + np.minimum(features['certification_count'] * 2, 7)
+
+    total = basic + skills + education + experience + extra
+    thresholds = [total >= threshold for threshold, _ in ATS_RECOMMENDATIONS]
+    recommendations = [recommendation for _, recommendation in ATS_RECOMMENDATIONS]
+    ats = np.select(thresholds, recommendations, ATS_DEFAULT_RECOMMENDATION)
+
+    return {
+        'valid': features['valid'],
+        'basic_information': basic,
+        'skills': skills,
+        'education': education,
+        'work_experience': experience,
+        'projects_certifications': extra,
+        'total_score': total,
+        'ats_recommendation': ats,
+    }
+
+def bulk_score(records, technical_keywords=TECHNICAL_KEYWORDS):
+    """Score many parsed resumes at once; same output fields as score_resume.
+
+    Returns one dict per record with detailed_scores, total_score,
+    ats_recommendation and total_experience_months, or None for records
+    score_resume cannot score.
+    """
+    records = list(records)
+    scores = score_features(extract_features(records), technical_keywords)
+    columns = ('basic_information', 'skills', 'education', 'work_experience', 'projects_certifications')
+    results = []
+    for row in range(len(scores['valid'])):
+        if not scores['valid'][row]:
+            results.append(None)
+            continue
+        results.append({
+            'detailed_scores': {column: int(scores[column][row]) for column in columns},
+            'total_score': int(scores['total_score'][row]),
+            'ats_recommendation': str(scores['ats_recommendation'][row]),
+            # Interval merging does not vectorize; the duration parse behind it is cached
+            'total_experience_months': total_experience_months(records[row].get('work_experience', [])),
+        })
+    return results
@@ -0,0 +1,272 @@
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import sys
+
+from candidate_store import CANDIDATES_DB, CandidateStore, experience_months, parse_score
+
+# ----------- Export Config ------------
+EXPORT_FORMATS = ("jsonl", "csv", "parquet")
+EXPORT_BATCH_SIZE = 2000  # Candidates read, converted and written per chunk (one Parquet row group)
+# Flat columns for analysts; "data" keeps the full parsed JSON so an export can be imported again
+EXPORT_COLUMNS = ('id', 'name', 'email', 'phone', 'score', 'ats_recommendation', 'experience_months', 'skills',
+                  'degree', 'institution', 'cgpa', 'work_experience', 'projects', 'certifications', 'data')
+CSV_LIST_SEPARATOR = '; '
+# Spreadsheet apps run cells starting with these as formulas; such CSV cells get a leading quote
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+class ParquetUnavailable(RuntimeError):
+    """Parquet was requested but pyarrow is not installed"""
+
+def format_from_path(path):
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    fmt = {'json': 'jsonl', 'ndjson': 'jsonl', 'pq': 'parquet'}.get(extension, extension)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Cannot tell the format of {path}; use one of: {', '.join(EXPORT_FORMATS)}")
+    return fmt
+
+def _batches(items, size):
+    items = iter(items)
+    while True:
+        batch = list(itertools.islice(items, size))
+        if not batch:
+            return
+        yield batch
+        del batch  # Not kept while the next batch is read
+
+def _number(value):
+    try:
+        return float(str(value).split('/')[0].rstrip('%')) if value not in (None, '') else None
+    except ValueError:
+        return None
+
+def _list(value):
+    return [str(item) for item in value if item] if isinstance(value, list) else []
+
+def flatten_candidate(candidate):
+    """One export row (EXPORT_COLUMNS) for a stored candidate"""
+    data = {key: value for key, value in candidate.items() if key != 'id'}
+    education = data.get('education') if isinstance(data.get('education'), list) else []
+    education = education[0] if education and isinstance(education[0], dict) else {}
+    work = data.get('work_experience') if isinstance(data.get('work_experience'), list) else []
+    return {
+        'id': candidate.get('id'),
+        'name': data.get('name') or '',
+        'email': data.get('email') or '',
+        'phone': data.get('phone') or '',
+        'score': parse_score(data),
+        'ats_recommendation': data.get('ats_recommendation') or '',
+        'experience_months': experience_months(data),
+        'skills': _list(data.get('skills')),
+        'degree': str(education.get('degree') or ''),
+        'institution': str(education.get('institution') or ''),
+        'cgpa': _number(education.get('cgpa')),
+        'work_experience': ', '.join(f"{exp.get('company', '')} - {exp.get('role', '')}"
+                                     for exp in work if isinstance(exp, dict)),
+        'projects': len(data.get('projects') or []),
+        'certifications': len(data.get('certifications') or []),
+        'data': json.dumps(data, ensure_ascii=False),
+    }
+
+def escape_csv_cell(value):
+    """Cell text that a spreadsheet shows as text instead of evaluating it as a formula"""
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+def _unescape_csv_cell(value):
+    if isinstance(value, str) and value.startswith("'") and value[1:].startswith(CSV_FORMULA_PREFIXES):
+        return value[1:]
+    return value
+
+def _unflatten(row):
+    """Candidate dict from a CSV/Parquet row: the "data" column, or the flat contact columns without it"""
+    if row.get('data'):
+        return json.loads(row['data'])
+    row = {key: _unescape_csv_cell(value) for key, value in row.items()}
+    skills = row.get('skills') or []
+    if isinstance(skills, str):
+        skills = [skill.strip() for skill in skills.split(CSV_LIST_SEPARATOR.strip()) if skill.strip()]
+    return {'name': row.get('name') or '', 'email': row.get('email') or '', 'phone': row.get('phone') or '',
+            'skills': [_unescape_csv_cell(skill) for skill in skills]}
+
+# ----------- Export ------------
+def iter_export(candidates, fmt, batch_size=EXPORT_BATCH_SIZE):
+    """Yield a CSV or JSONL export of candidates (e.g. store.iter_candidates()) as text, one chunk per batch.
+
+    CSV cells that would start a spreadsheet formula (resume text is untrusted) are escaped.
+    """
+    if fmt not in ('csv', 'jsonl'):
+        raise ValueError(f"Streaming export supports csv and jsonl, not {fmt}")
+    buffer = io.StringIO()
+    writer = None
+    if fmt == 'csv':
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+        writer.writeheader()
+    for batch in _batches(candidates, batch_size):
+        for candidate in batch:
+            if writer:
+                row = flatten_candidate(candidate)
+                row['skills'] = CSV_LIST_SEPARATOR.join(escape_csv_cell(skill) for skill in row['skills'])
+                writer.writerow({key: escape_csv_cell(value) for key, value in row.items()})
+            else:
+                buffer.write(json.dumps(candidate, ensure_ascii=False))
+                buffer.write('\n')
+        del batch  # Otherwise it stays alive while the next batch is read
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()  # CSV header of an empty store
+
+def _parquet():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ParquetUnavailable("Parquet export and import need pyarrow: pip install pyarrow") from None
+    return pyarrow, pyarrow.parquet
+
+def _parquet_schema(pa):
+    return pa.schema([
+        ('id', pa.int64()), ('name', pa.string()), ('email', pa.string()), ('phone', pa.string()),
+        ('score', pa.int32()), ('ats_recommendation', pa.string()), ('experience_months', pa.int32()),
+        ('skills', pa.list_(pa.string())), ('degree', pa.string()), ('institution', pa.string()),
+        ('cgpa', pa.float64()), ('work_experience', pa.string()), ('projects', pa.int32()),
+        ('certifications', pa.int32()), ('data', pa.string()),
+    ])
+
+def write_parquet(candidates, output, batch_size=EXPORT_BATCH_SIZE):
+    """Write candidates to a Parquet file (path or binary file object), one row group per batch; returns the count"""
+    pa, pq = _parquet()
+    schema = _parquet_schema(pa)
+    count = 0
+    with pq.ParquetWriter(output, schema, compression='zstd') as writer:
+        for batch in _batches(candidates, batch_size):
+            rows = [flatten_candidate(candidate) for candidate in batch]
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            count += len(rows)
+            del batch, rows  # Otherwise they stay alive while the next batch is read
+    return count
+
+def export_candidates(store, path, fmt=None, batch_size=EXPORT_BATCH_SIZE):
+    """Export every stored candidate to path ("-" for stdout) in constant memory; returns the count"""
+    fmt = fmt or format_from_path(path)
+    count = 0
+
+    def counted():
+        nonlocal count
+        for candidate in store.iter_candidates(batch_size):
+            count += 1
+            yield candidate
+
+    if fmt == 'parquet':
+        return write_parquet(counted(), path, batch_size)
+    output = sys.stdout if path == '-' else open(path, 'w', encoding='utf-8', newline='')
+    try:
+        for chunk in iter_export(counted(), fmt, batch_size):
+            output.write(chunk)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return count
+
+# ----------- Import ------------
+def iter_import(path, fmt=None, batch_size=EXPORT_BATCH_SIZE):
+    """Yield candidate dicts from an export file.
+
+    JSONL lines may also be compact resume_model rows (JSON arrays).
+    Exported ids are dropped; the target store assigns its own.
+    """
+    fmt = fmt or format_from_path(path)
+    if fmt == 'parquet':
+        _, pq = _parquet()
+        for record_batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            for row in record_batch.to_pylist():
+                yield _unflatten(row)
+        return
+
+    with (sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')) as f:
+        if fmt == 'csv':
+            for row in csv.DictReader(f):
+                yield _unflatten(row)
+            return
+        for line in f:
+            if not line.strip():
+                continue
+            candidate = json.loads(line)
+            if isinstance(candidate, list):
+                from resume_model import Resume
+                candidate = Resume.from_row(candidate).to_dict()
+            candidate.pop('id', None)
+            yield candidate
+
+def rescore_candidates(candidates, requisition_registry=None):
+    """Score a batch in place with bulk_score (same results as score_resume) and, optionally, open requisitions"""
+    from bulk_scoring import bulk_score
+
+    for candidate, scores in zip(candidates, bulk_score(candidates)):
+        if scores is None:
+            continue  # score_resume could not score it either; keep the old score
+        candidate.update(scores)
+        candidate['resume_score'] = f"{max(0, min(100, round(scores['total_score'])))}/100"
+        if requisition_registry is not None:
+            requisition_scores = requisition_registry.score(candidate)
+            if requisition_scores:
+                candidate['requisition_scores'] = requisition_scores
+            else:
+                candidate.pop('requisition_scores', None)
+
+def import_candidates(store, path, fmt=None, rescore=False, requisition_registry=None, dedupe=True,
+                      batch_size=EXPORT_BATCH_SIZE):
+    """Load an export into the store one batch per transaction; returns the number imported.
+
+    With dedupe, candidates with a known email or phone update the existing
+    record, so re-importing a re-scored export updates in place.
+    """
+    count = 0
+    for batch in _batches(iter_import(path, fmt, batch_size), batch_size):
+        if rescore:
+            rescore_candidates(batch, requisition_registry)
+        store.add_many(batch, dedupe=dedupe)
+        count += len(batch)
+        del batch  # Otherwise it stays alive while the next batch is read
+        print(f"Imported {count} candidates", file=sys.stderr)
+    return count
+
+# ----------- Command Line ------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk export or import the candidate store")
+    parser.add_argument('command', choices=('export', 'import'))
+    parser.add_argument('path', help="File to write or read (.jsonl, .csv or .parquet; '-' for stdout/stdin)")
+    parser.add_argument('--format', choices=EXPORT_FORMATS, help="Defaults to the file extension")
+    parser.add_argument('--db', default=CANDIDATES_DB, help="Candidate store (SQLite)")
+    parser.add_argument('--batch-size', type=int, default=EXPORT_BATCH_SIZE)
+    parser.add_argument('--rescore', action='store_true', help="Import: score every candidate again")
+    parser.add_argument('--no-dedupe', action='store_true',
+                        help="Import: always insert instead of updating candidates with the same email/phone")
+    args = parser.parse_args(argv)
+    if args.path == '-' and not args.format:
+        parser.error("--format is required with '-'")
+
+    store = CandidateStore(args.db)
+    try:
+        if args.command == 'export':
+            count = export_candidates(store, args.path, args.format, args.batch_size)
+            print(f"Exported {count} candidates to {args.path}", file=sys.stderr)
+        else:
+            registry = None
+            if args.rescore:
+                from requisitions import RequisitionRegistry
+                registry = RequisitionRegistry(args.db)
+            import_candidates(store, args.path, args.format, rescore=args.rescore, requisition_registry=registry,
+                              dedupe=not args.no_dedupe, batch_size=args.batch_size)
+    except (RuntimeError, ValueError) as e:
+        parser.error(str(e))
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
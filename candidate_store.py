@@ -0,0 +1,336 @@
+import json
+import re
+import sqlite3
+import time
+
+from experience_parser import total_experience_months
+from fast_extract import extract_fast, valid_email, valid_phone
+
+# ----------- Candidate Store Config ------------
+CANDIDATES_DB = 'candidates.db'
+
+def normalize_email(email):
+    return (email or '').strip().lower()
+
+def normalize_phone(phone):
+    digits = re.sub(r'\D', '', phone or '')
+    return digits[-10:]  # Ignore country codes so "+91 98765 43210" matches "9876543210"
+
+def contact_keys(email, phone):
+    """Normalized (email, phone) to match candidates on; a value that fails validation is left out"""
+    return (normalize_email(email) if valid_email(email) else '',
+            normalize_phone(phone) if valid_phone(phone) else '')
+
+def normalize_skill(skill):
+    return re.sub(r'\s+', ' ', str(skill)).strip().lower()
+
+def experience_months(parsed_data):
+    """Total months of experience, from score_resume's field or the work history"""
+    months = parsed_data.get('total_experience_months')
+    if isinstance(months, int):
+        return months
+    return total_experience_months(parsed_data.get('work_experience', []))
+
+def parse_score(parsed_data):
+    """Integer score from "resume_score" ("NN/100") or "total_score" """
+    score = parsed_data.get('resume_score')
+    if isinstance(score, str) and '/' in score:
+        try:
+            return int(score.split('/')[0])
+        except ValueError:
+            pass
+    total = parsed_data.get('total_score')
+    return int(total) if isinstance(total, (int, float)) else None
+
+class CandidateStore:
+    """Local SQLite store of every parsed candidate.
+
+    Holds the full parsed JSON and score with indexes on email, phone, name,
+    score, total experience and skills, so lookups and filters never need the Google Sheet.
+    The "synced" flag tracks which candidates the Sheets mirror has written.
+    """
+
+    def __init__(self, db_path=CANDIDATES_DB, mirror=None, dedup_index=None):
+        self.db_path = db_path
+        self.mirror = None
+        self.dedup_index = dedup_index  # Optional DedupIndex used by find_duplicate
+        self.listeners = []  # Called with (candidate_id, parsed_data) after every add
+        self.setup_db()
+        if mirror is not None:
+            self.attach_mirror(mirror)
+
+    def attach_mirror(self, mirror):
+        """Mirror stored candidates to a SheetsBatchWriter.
+
+        Candidates a previous run stored but never wrote to the sheet are
+        queued again, as many as the mirror buffers, and written batches
+        are marked as synced.
+        """
+        mirror.on_flush = self.mark_synced
+        self.mirror = mirror
+        after_id = 0
+        while True:
+            pending = self.unsynced(after_id=after_id)
+            if not pending:
+                break
+            for candidate in pending:
+                if not mirror.add_candidate(candidate, key=candidate['id']) and mirror.pending() >= mirror.max_buffered:
+                    return  # The rest stay unsynced until a later start
+            after_id = pending[-1]['id']
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA synchronous=NORMAL')  # Safe with WAL and avoids an fsync per insert
+        return conn
+
+    def setup_db(self):
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS candidates (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT COLLATE NOCASE,
+                    email TEXT,
+                    phone TEXT,
+                    score INTEGER,
+                    ats_recommendation TEXT,
+                    experience_months INTEGER,
+                    data TEXT NOT NULL,
+                    synced INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_candidates_email ON candidates (email);
+                CREATE INDEX IF NOT EXISTS idx_candidates_phone ON candidates (phone);
+                CREATE INDEX IF NOT EXISTS idx_candidates_name ON candidates (name);
+                CREATE INDEX IF NOT EXISTS idx_candidates_score ON candidates (score);
+                CREATE INDEX IF NOT EXISTS idx_candidates_unsynced ON candidates (synced) WHERE synced = 0;
+                CREATE TABLE IF NOT EXISTS candidate_skills (
+                    skill TEXT NOT NULL,
+                    candidate_id INTEGER NOT NULL REFERENCES candidates (id) ON DELETE CASCADE,
+                    PRIMARY KEY (skill, candidate_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_candidate_skills_candidate ON candidate_skills (candidate_id);
+            ''')
+            columns = {row['name'] for row in conn.execute('PRAGMA table_info(candidates)')}
+            if 'experience_months' not in columns:
+                # Stores created before the column existed: add it and fill it from the stored JSON
+                conn.execute('ALTER TABLE candidates ADD COLUMN experience_months INTEGER')
+                conn.executemany(
+                    'UPDATE candidates SET experience_months = ? WHERE id = ?',
+                    [(experience_months(json.loads(row['data'])), row['id'])
+                     for row in conn.execute('SELECT id, data FROM candidates')]
+                )
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_candidates_experience ON candidates (experience_months)')
+
+    def _find_duplicate(self, conn, email, phone):
+        if email:
+            row = conn.execute('SELECT id FROM candidates WHERE email = ? LIMIT 1', (email,)).fetchone()
+            if row:
+                return row['id']
+        if phone:
+            row = conn.execute('SELECT id FROM candidates WHERE phone = ? LIMIT 1', (phone,)).fetchone()
+            if row:
+                return row['id']
+        return None
+
+    def find_duplicate(self, text):
+        """Stored candidate that the extracted resume text most likely belongs to, or None.
+
+        Checks the email/phone found by the local extractor first (when they
+        pass validation), then near-duplicate text through the dedup index.
+        The returned candidate has "duplicate_reason" and "similarity" set.
+        A contact match whose text is not a near-duplicate of the stored
+        resume is an updated resume: its reason is "updated" and callers
+        should parse it again rather than skip it.
+        """
+        local = extract_fast(text)
+        with self._connect() as conn:
+            candidate_id = self._find_duplicate(conn, *contact_keys(local['email'], local['phone']))
+        candidate = self.get(candidate_id) if candidate_id is not None else None
+        if candidate is not None:
+            score = self.dedup_index.similarity_to(candidate_id, text) if self.dedup_index is not None else None
+            unchanged = score is not None and score >= self.dedup_index.threshold
+            candidate.update({'duplicate_reason': 'contact' if unchanged else 'updated',
+                              'similarity': round(score, 3) if score is not None else None})
+            return candidate
+
+        if self.dedup_index is not None:
+            match = self.dedup_index.find(text)
+            if match is not None:
+                candidate = self.get(match[0])
+                if candidate is not None:
+                    candidate.update({'duplicate_reason': 'text', 'similarity': round(match[1], 3)})
+                    return candidate
+        return None
+
+    def _write(self, conn, parsed_data, dedupe, now):
+        candidate_id = self._find_duplicate(conn, *contact_keys(parsed_data.get('email'), parsed_data.get('phone'))) \
+            if dedupe else None
+        if candidate_id is not None:
+            # Merged into that candidate's record, so it is not a duplicate of another one
+            parsed_data.pop('duplicate_of', None)
+        email = normalize_email(parsed_data.get('email'))
+        phone = normalize_phone(parsed_data.get('phone'))
+        skills = parsed_data.get('skills', [])
+        skills = {normalize_skill(skill) for skill in skills if skill} if isinstance(skills, list) else set()
+        values = (
+            (parsed_data.get('name') or '').strip(),
+            email,
+            phone,
+            parse_score(parsed_data),
+            parsed_data.get('ats_recommendation', ''),
+            experience_months(parsed_data),
+            json.dumps(parsed_data),
+        )
+
+        if candidate_id is None:
+            candidate_id = conn.execute(
+                'INSERT INTO candidates (name, email, phone, score, ats_recommendation, experience_months, data, '
+                'created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', values + (now, now)
+            ).lastrowid
+        else:
+            conn.execute(
+                'UPDATE candidates SET name = ?, email = ?, phone = ?, score = ?, ats_recommendation = ?, '
+                'experience_months = ?, data = ?, synced = 0, updated_at = ? WHERE id = ?', values + (now, candidate_id)
+            )
+            conn.execute('DELETE FROM candidate_skills WHERE candidate_id = ?', (candidate_id,))
+        conn.executemany(
+            'INSERT INTO candidate_skills (skill, candidate_id) VALUES (?, ?)',
+            [(skill, candidate_id) for skill in skills]
+        )
+        return candidate_id
+
+    def _added(self, candidate_id, parsed_data, text=None):
+        if text and self.dedup_index is not None:
+            self.dedup_index.add(candidate_id, text)
+        if self.mirror is not None:
+            self.mirror.add_candidate(parsed_data, key=candidate_id)
+        for listener in self.listeners:
+            listener(candidate_id, parsed_data)
+
+    def add(self, parsed_data, dedupe=True, text=None):
+        """Store a parsed candidate and return its id.
+
+        With dedupe, a candidate with the same email (or phone) is updated in
+        place instead of creating a second record. Passing the extracted
+        resume text also indexes it for near-duplicate detection.
+        """
+        with self._connect() as conn:
+            candidate_id = self._write(conn, parsed_data, dedupe, time.time())
+        self._added(candidate_id, parsed_data, text)
+        return candidate_id
+
+    def add_many(self, candidates, dedupe=True):
+        """Store several parsed candidates in one transaction and return their ids (same rules as add)"""
+        now = time.time()
+        with self._connect() as conn:
+            candidate_ids = [self._write(conn, parsed_data, dedupe, now) for parsed_data in candidates]
+        for candidate_id, parsed_data in zip(candidate_ids, candidates):
+            self._added(candidate_id, parsed_data)
+        return candidate_ids
+
+    def add_candidate(self, parsed_data, text=None):
+        """Same interface as SheetsManager.add_candidate: True if the candidate was stored"""
+        try:
+            self.add(parsed_data, text=text)
+            return True
+        except Exception as e:
+            print(f"Error storing candidate: {str(e)}")
+            return False
+
+    def _to_candidate(self, row):
+        candidate = json.loads(row['data'])
+        candidate['id'] = row['id']
+        return candidate
+
+    def get(self, candidate_id):
+        with self._connect() as conn:
+            row = conn.execute('SELECT id, data FROM candidates WHERE id = ?', (candidate_id,)).fetchone()
+        return self._to_candidate(row) if row else None
+
+    def find_by_email(self, email):
+        return self.query(email=email)
+
+    def find_by_phone(self, phone):
+        return self.query(phone=phone)
+
+    def query(self, skills=None, min_score=None, max_score=None, name=None, email=None, phone=None,
+              min_experience_months=None, max_experience_months=None, limit=100, offset=0):
+        """Candidates matching every given filter, highest score first.
+
+        skills must all be present; name is a case-insensitive prefix match;
+        experience bounds are total months with overlapping jobs counted once.
+        """
+        conditions, params = [], []
+        if skills:
+            skills = sorted({normalize_skill(skill) for skill in skills})
+            conditions.append(
+                'id IN (SELECT candidate_id FROM candidate_skills WHERE skill IN (%s) '
+                'GROUP BY candidate_id HAVING COUNT(*) = ?)' % ','.join('?' * len(skills))
+            )
+            params.extend(skills)
+            params.append(len(skills))
+        if min_score is not None:
+            conditions.append('score >= ?')
+            params.append(min_score)
+        if max_score is not None:
+            conditions.append('score <= ?')
+            params.append(max_score)
+        if min_experience_months is not None:
+            conditions.append('experience_months >= ?')
+            params.append(min_experience_months)
+        if max_experience_months is not None:
+            conditions.append('experience_months <= ?')
+            params.append(max_experience_months)
+        if name:
+            # Prefix range on the NOCASE name index
+            conditions.append('name >= ? AND name < ?')
+            params.extend([name, name + '\uffff'])
+        if email:
+            conditions.append('email = ?')
+            params.append(normalize_email(email))
+        if phone:
+            conditions.append('phone = ?')
+            params.append(normalize_phone(phone))
+
+        sql = 'SELECT id, data FROM candidates'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY score DESC, id LIMIT ? OFFSET ?'
+        params.extend([limit, offset])
+
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [self._to_candidate(row) for row in rows]
+
+    def iter_candidates(self, batch_size=1000):
+        """Yield every stored candidate in id order, reading batch_size rows at a time"""
+        after_id = 0
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    'SELECT id, data FROM candidates WHERE id > ? ORDER BY id LIMIT ?', (after_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._to_candidate(row)
+            after_id = rows[-1]['id']
+
+    def count(self):
+        with self._connect() as conn:
+            return conn.execute('SELECT COUNT(*) FROM candidates').fetchone()[0]
+
+    def unsynced(self, limit=1000, after_id=0):
+        """Candidates not yet written to the Sheets mirror, oldest first"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT id, data FROM candidates WHERE synced = 0 AND id > ? ORDER BY id LIMIT ?', (after_id, limit)
+            ).fetchall()
+        return [self._to_candidate(row) for row in rows]
+
+    def mark_synced(self, candidate_ids):
+        with self._connect() as conn:
+            conn.executemany('UPDATE candidates SET synced = 1 WHERE id = ?', [(i,) for i in candidate_ids])
@@ -0,0 +1,143 @@
+import re
+import sqlite3
+import zlib
+
+import numpy as np
+
+# ----------- Near-Duplicate Index Config ------------
+NUM_PERMUTATIONS = 128  # MinHash signature length
+LSH_BANDS = 16  # 16 bands of 8 rows: resumes above ~0.7 similarity almost always share a bucket
+SHINGLE_SIZE = 3  # Words per shingle
+DUPLICATE_THRESHOLD = 0.8  # Estimated Jaccard similarity above which two resumes are duplicates
+# What ingest does with a near-duplicate of another candidate: "skip" returns the stored
+# candidate without calling the LLM, "flag" parses it anyway and records "duplicate_of",
+# "off" disables the check. An unchanged resume of a known candidate is skipped under both.
+DEDUP_ACTIONS = ('skip', 'flag', 'off')
+DEDUP_ACTION = 'flag'
+
+_PRIME = (1 << 31) - 1
+# Fixed seed so signatures stored by earlier runs stay comparable
+_random = np.random.RandomState(20240601)
+_A = _random.randint(1, _PRIME, size=NUM_PERMUTATIONS).astype(np.uint64)
+_B = _random.randint(0, _PRIME, size=NUM_PERMUTATIONS).astype(np.uint64)
+_ROWS_PER_BAND = NUM_PERMUTATIONS // LSH_BANDS
+_word_re = re.compile(r'[a-z0-9]+')
+
+def shingle_hashes(text):
+    """32-bit hashes of the distinct word shingles in text"""
+    words = _word_re.findall(text.lower())
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    size = min(SHINGLE_SIZE, len(words))
+    hashes = {zlib.crc32(' '.join(words[i:i + size]).encode('utf-8')) for i in range(len(words) - size + 1)}
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+def minhash_signature(text):
+    """MinHash signature of the text, or None if it has no words"""
+    hashes = shingle_hashes(text)
+    if not len(hashes):
+        return None
+    # (a * x + b) mod p for every shingle and permutation; products stay below 2^63
+    return ((hashes[:, None] * _A + _B) % _PRIME).min(axis=0).astype(np.uint32)
+
+def band_keys(signature):
+    """One bucket key per LSH band: the band number in the high bits, a hash of its rows below"""
+    return [
+        (band << 32) | zlib.crc32(signature[band * _ROWS_PER_BAND:(band + 1) * _ROWS_PER_BAND].tobytes())
+        for band in range(LSH_BANDS)
+    ]
+
+def skips_parsing(duplicate, action):
+    """Whether a CandidateStore.find_duplicate match is answered with the stored candidate, without the LLM"""
+    if duplicate is None or action not in ('skip', 'flag'):
+        return False
+    # Same contact and same text is the same resume; "updated" resumes always need parsing
+    return duplicate['duplicate_reason'] == 'contact' or (action == 'skip' and duplicate['duplicate_reason'] == 'text')
+
+def similarity(signature, other):
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.mean(signature == other))
+
+class DedupIndex:
+    """MinHash/LSH index of extracted resume text stored in SQLite.
+
+    A lookup only compares against the candidates sharing at least one LSH
+    bucket, found through an index, so its cost does not grow with the pool.
+    """
+
+    def __init__(self, db_path, threshold=DUPLICATE_THRESHOLD):
+        self.db_path = db_path
+        self.threshold = threshold
+        self.setup_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def setup_db(self):
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS minhash_signatures (
+                    candidate_id INTEGER PRIMARY KEY,
+                    signature BLOB NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS lsh_buckets (
+                    bucket_key INTEGER NOT NULL,
+                    candidate_id INTEGER NOT NULL,
+                    PRIMARY KEY (bucket_key, candidate_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_lsh_buckets_candidate ON lsh_buckets (candidate_id);
+            ''')
+
+    def add(self, candidate_id, text):
+        """Index (or re-index) the extracted text of a stored candidate"""
+        signature = minhash_signature(text)
+        if signature is None:
+            return
+        with self._connect() as conn:
+            conn.execute('DELETE FROM lsh_buckets WHERE candidate_id = ?', (candidate_id,))
+            conn.execute(
+                'INSERT OR REPLACE INTO minhash_signatures (candidate_id, signature) VALUES (?, ?)',
+                (candidate_id, signature.tobytes())
+            )
+            conn.executemany(
+                'INSERT OR IGNORE INTO lsh_buckets (bucket_key, candidate_id) VALUES (?, ?)',
+                [(key, candidate_id) for key in band_keys(signature)]
+            )
+
+    def find(self, text):
+        """(candidate_id, similarity) of the closest indexed resume above the threshold, or None"""
+        signature = minhash_signature(text)
+        if signature is None:
+            return None
+        keys = band_keys(signature)
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT candidate_id, signature FROM minhash_signatures WHERE candidate_id IN '
+                '(SELECT candidate_id FROM lsh_buckets WHERE bucket_key IN (%s))' % ','.join('?' * len(keys)),
+                keys
+            ).fetchall()
+
+        best = None
+        for candidate_id, blob in rows:
+            score = similarity(signature, np.frombuffer(blob, dtype=np.uint32))
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (candidate_id, score)
+        return best
+
+    def similarity_to(self, candidate_id, text):
+        """Estimated similarity of text to one indexed candidate, or None if it is not indexed"""
+        signature = minhash_signature(text)
+        with self._connect() as conn:
+            row = conn.execute('SELECT signature FROM minhash_signatures WHERE candidate_id = ?',
+                               (candidate_id,)).fetchone()
+        if signature is None or row is None:
+            return None
+        return similarity(signature, np.frombuffer(row[0], dtype=np.uint32))
+
+    def remove(self, candidate_id):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM lsh_buckets WHERE candidate_id = ?', (candidate_id,))
+            conn.execute('DELETE FROM minhash_signatures WHERE candidate_id = ?', (candidate_id,))
@@ -0,0 +1,130 @@
+import datetime
+import re
+from functools import lru_cache
+
+# ----------- Experience Duration Parser ------------
+# Turns free-text durations ("Jan 2019 - Mar 2021", "2 yrs 3 months", "2020 - Present")
+# into month intervals, so overlapping jobs can be merged into total experience.
+# Months are counted as absolute indexes (year * 12 + month - 1).
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'sept': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+NUMBER_WORDS = {
+    'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6,
+    'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'half': 0.5,
+}
+MAX_JOB_MONTHS = 50 * 12  # Anything longer is a parsing accident, not a job
+
+_month_name = r'(?P<{0}mon>jan|feb|mar|apr|may|jun|jul|aug|sept?|oct|nov|dec)[a-z]*\.?'
+_date = (
+    r'(?:' + _month_name + r"[\s,']*(?P<{0}year>(?:19|20)\d{{2}}|'?\d{{2}})"  # Jan 2019, Jan '19
+    r'|(?P<{0}num>0?[1-9]|1[0-2])\s*[/.-]\s*(?P<{0}numyear>(?:19|20)\d{{2}})'  # 01/2019, 1-2019
+    r'|(?P<{0}onlyyear>(?:19|20)\d{{2}}))'  # 2019
+)
+_present = r'(?P<present>present|current(?:ly)?|now|today|till\s+date|to\s+date|ongoing|date)'
+_short_year = r'(?P<shortyear>\d{2})(?!-)'  # "2019-20": only after a bare start year
+RANGE_RE = re.compile(
+    r'(?<![\w/])' + _date.format('s') + r'\s*(?:-|–|—|to|till|until)\s*(?:' + _present + r'|' + _date.format('e') +
+    r'|' + _short_year + r')(?![\w/])',
+    re.IGNORECASE
+)
+# "less than a year" is an upper bound, not a length, so qualified values are not counted
+STATED_RE = re.compile(
+    r'(?P<less>(?:less|fewer)\s+than\s+|under\s+|below\s+|<\s*)?'
+    r'(?P<value>\d+(?:\.\d+)?|' + '|'.join(NUMBER_WORDS) + r')\s*\+?\s*(?P<unit>years?|yrs?|months?|mos?)\b',
+    re.IGNORECASE
+)
+
+def month_index(year, month):
+    return year * 12 + month - 1
+
+def current_month_index():
+    today = datetime.date.today()
+    return month_index(today.year, today.month)
+
+def _match_month(match, prefix):
+    """Month index of the start ("s") or end ("e") date in a range match, or None"""
+    mon = match.group(prefix + 'mon')
+    if mon:
+        year = match.group(prefix + 'year').lstrip("'")
+        year = int(year) if len(year) == 4 else 2000 + int(year)
+        return month_index(year, MONTHS[mon.lower()[:4] if mon.lower().startswith('sept') else mon.lower()[:3]])
+    if match.group(prefix + 'num'):
+        return month_index(int(match.group(prefix + 'numyear')), int(match.group(prefix + 'num')))
+    if match.group(prefix + 'onlyyear'):
+        return month_index(int(match.group(prefix + 'onlyyear')), 1)
+    if prefix == 'e' and match.group('shortyear') and match.group('sonlyyear'):
+        # Same century as the start year, or the next one for "1998-02"
+        start_year = int(match.group('sonlyyear'))
+        year = start_year - start_year % 100 + int(match.group('shortyear'))
+        return month_index(year if year >= start_year else year + 100, 1)
+    return None
+
+@lru_cache(maxsize=65536)
+def _parse(duration, today):
+    intervals = []
+    for match in RANGE_RE.finditer(duration):
+        start = _match_month(match, 's')
+        end = today if match.group('present') else _match_month(match, 'e')
+        if start is None or end is None or end < start or end - start > MAX_JOB_MONTHS:
+            continue
+        # A range within a single month still counts as one month of work
+        intervals.append((start, max(end, start + 1)))
+
+    stated = 0.0
+    for match in STATED_RE.finditer(duration):
+        if match.group('less'):
+            continue
+        value = match.group('value').lower()
+        value = NUMBER_WORDS[value] if value in NUMBER_WORDS else float(value)
+        stated += value * 12 if match.group('unit').lower().startswith('y') else value
+    return tuple(intervals), int(round(min(stated, MAX_JOB_MONTHS)))
+
+def parse_duration(duration, today=None):
+    """(intervals, stated_months) for one duration string.
+
+    intervals are (start, end) month indexes of every date range found,
+    stated_months is the length written out in words ("2 years 3 months").
+    Results are cached per distinct string.
+    """
+    if not isinstance(duration, str) or not duration.strip():
+        return (), 0
+    return _parse(duration.strip(), current_month_index() if today is None else today)
+
+def duration_months(duration, today=None):
+    """Months of experience for one job: its date ranges, else the stated length"""
+    intervals, stated = parse_duration(duration, today)
+    if intervals:
+        return sum(end - start for start, end in merge_intervals(intervals))
+    return stated
+
+def merge_intervals(intervals):
+    """Merge overlapping or touching (start, end) intervals"""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+def total_experience_months(work_experience, today=None):
+    """Total months of experience across jobs, counting overlapping periods once.
+
+    Jobs with only a stated length ("2 years") cannot be placed on the
+    calendar, so they are added on top of the merged date ranges.
+    """
+    intervals = []
+    stated_total = 0
+    for exp in work_experience if isinstance(work_experience, list) else ():
+        if not isinstance(exp, dict):
+            continue
+        exp_intervals, stated = parse_duration(exp.get('duration'), today)
+        if exp_intervals:
+            intervals.extend(exp_intervals)
+        else:
+            stated_total += stated
+    return sum(end - start for start, end in merge_intervals(intervals)) + stated_total
@@ -0,0 +1,140 @@
+import re
+
+# ----------- Local Fast-Path Extractor ------------
+# Rule-based extraction of the fields that do not need an LLM. Every pattern
+# is compiled once at import so a resume is processed in a few milliseconds.
+
+EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+EMAIL_PREFIX_RE = re.compile(r'^pe(?=[a-zA-Z0-9._%+-]+@)')  # Stray "pe" left over from a phone/email icon
+# Digits joined by at most one separator each, so columns of years ("2016 - 2020  2020") do not run together
+PHONE_RE = re.compile(r'(?<![\w+])(?:\+\d{1,3}[\s.-]?)?(?:\(\d{2,5}\)[\s.-]?)?\d(?:[\s.-]?\d){6,14}(?![\w])')
+YEAR_RANGE_RE = re.compile(r'(?:19|20)\d{2}\s*[-\u2013]\s*(?:19|20)\d{2}')
+NAME_WORD_RE = re.compile(r"^[A-Z][a-zA-Z.'-]*$")
+# Words of document headings and job titles that look like a name in Title Case
+NAME_STOPWORDS = {
+    'curriculum', 'vitae', 'resume', 'cv', 'profile', 'contact', 'page', 'portfolio', 'personal', 'details',
+    'engineer', 'developer', 'manager', 'analyst', 'consultant', 'designer', 'scientist', 'architect', 'intern',
+    'student', 'specialist', 'administrator', 'lead', 'senior', 'junior', 'software', 'data', 'full', 'stack',
+    'web', 'frontend', 'backend', 'devops', 'technical', 'executive', 'officer', 'director', 'associate',
+}
+
+SECTION_ALIASES = {
+    'summary': ('summary', 'profile', 'objective', 'about me', 'professional summary', 'career objective'),
+    'education': ('education', 'academic background', 'academics', 'educational qualifications', 'qualifications'),
+    'work_experience': ('experience', 'work experience', 'professional experience', 'employment history',
+                        'work history', 'internships', 'internship', 'employment'),
+    'skills': ('skills', 'technical skills', 'key skills', 'core competencies', 'technologies', 'tech stack'),
+    'projects': ('projects', 'academic projects', 'personal projects', 'key projects'),
+    'certifications': ('certifications', 'certificates', 'licenses', 'courses'),
+    'achievements': ('achievements', 'awards', 'honors', 'accomplishments', 'extracurricular activities'),
+    'languages': ('languages',),
+    'interests': ('interests', 'hobbies'),
+}
+_section_lookup = {alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases}
+SECTION_RE = re.compile(
+    r'^[ \t]*(' + '|'.join(re.escape(alias) for alias in sorted(_section_lookup, key=len, reverse=True))
+    + r')[ \t]*:?[ \t]*$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+SKILLS = (
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'C', 'C++', 'C#', 'Go', 'Rust', 'Kotlin', 'Swift', 'Ruby',
+    'PHP', 'Scala', 'R', 'MATLAB', 'SQL', 'NoSQL', 'HTML', 'CSS', 'Bash', 'Shell',
+    'React', 'Angular', 'Vue', 'Node', 'Node.js', 'Express', 'Django', 'Flask', 'FastAPI', 'Spring',
+    'Spring Boot', '.NET', 'Next.js', 'jQuery', 'Bootstrap', 'Tailwind',
+    'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'SQLite', 'Oracle', 'Elasticsearch', 'Cassandra', 'Firebase',
+    'AWS', 'Azure', 'GCP', 'Google Cloud', 'Docker', 'Kubernetes', 'Terraform', 'Ansible', 'Jenkins',
+    'Git', 'GitHub', 'GitLab', 'CI/CD', 'Linux', 'Kafka', 'Spark', 'Hadoop', 'Airflow',
+    'Machine Learning', 'Deep Learning', 'NLP', 'Computer Vision', 'TensorFlow', 'PyTorch', 'Keras',
+    'scikit-learn', 'Pandas', 'NumPy', 'OpenCV', 'Tableau', 'Power BI', 'Excel',
+    'REST', 'GraphQL', 'Microservices', 'Agile', 'Scrum', 'JIRA', 'Figma',
+)
+# Short skills and skills that are also ordinary words only match with their exact capitalization
+CASE_SENSITIVE_SKILLS = {'C', 'R', 'Go', 'Rust', 'Swift', 'Ruby', 'Shell', 'Spring', 'Express', 'Oracle',
+                         'Spark', 'REST', 'Excel', 'Agile', 'Node', 'Git', 'Vue'}
+_skill_lookup = {skill.lower(): skill for skill in SKILLS}
+
+def _alternatives(skills):
+    return '|'.join(re.escape(skill) for skill in sorted(skills, key=len, reverse=True))
+
+# Custom boundaries so "C++", "C#" and ".NET" match but "C" does not match inside "CSS" or "R&D"
+SKILL_RE = re.compile(
+    r'(?<![\w+#./&-])((?i:' + _alternatives(skill.lower() for skill in SKILLS if skill not in CASE_SENSITIVE_SKILLS)
+    + r')|' + _alternatives(CASE_SENSITIVE_SKILLS) + r')(?![\w+#/&-]|\.\w)'
+)
+
+def valid_email(email):
+    return bool(EMAIL_RE.fullmatch((email or '').strip()))
+
+def valid_phone(phone):
+    """10-15 digits that are not a run of years"""
+    phone = (phone or '').strip()
+    digits = sum(char.isdigit() for char in phone)
+    return 10 <= digits <= 15 and not YEAR_RANGE_RE.search(phone)
+
+def find_email(text):
+    match = EMAIL_RE.search(text)
+    return EMAIL_PREFIX_RE.sub('', match.group(0)) if match else ''
+
+def find_phone(text):
+    for match in PHONE_RE.finditer(text):
+        candidate = match.group(0).strip()
+        # Skip date ranges like "2019-2021 2022" that the pattern also accepts
+        if valid_phone(candidate):
+            return candidate
+    return ''
+
+def find_name(text, max_lines=5):
+    """Take the first short line of capitalized words near the top of the resume"""
+    checked = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        checked += 1
+        if checked > max_lines:
+            break
+        if '@' in line or any(char.isdigit() for char in line) or SECTION_RE.match(line):
+            continue
+        words = line.split()
+        if any(word.lower().strip('.,:') in NAME_STOPWORDS for word in words):
+            continue  # "Curriculum Vitae", "Software Engineer"
+        if 2 <= len(words) <= 4 and all(NAME_WORD_RE.match(word) for word in words):
+            return ' '.join(word.capitalize() if word.isupper() else word for word in words)
+    return ''
+
+def _in_list(text, start, end):
+    before = text[:start].rstrip(' \t')[-1:]
+    after = text[end:].lstrip(' \t')[:1]
+    return before in ('', '\n', ',', ':', ';', '|', '(', '\u2022', '-', '*') and after in ('', '\n', ',', ';', '|', ')')
+
+def find_skills(text):
+    """Dictionary match of known skills, in order of first appearance"""
+    found = {}
+    for match in SKILL_RE.finditer(text):
+        skill = _skill_lookup[match.group(1).lower()]
+        if len(skill) == 1 and not _in_list(text, match.start(), match.end()):
+            continue  # "grade C", "option R": single letters count only as a list item
+        found.setdefault(skill, None)
+    return list(found)
+
+def find_sections(text):
+    """Map each recognized section header to its (start, end) character offsets"""
+    headers = [(match.start(), match.end(), _section_lookup[match.group(1).lower()])
+               for match in SECTION_RE.finditer(text)]
+    sections = {}
+    for i, (start, body_start, section) in enumerate(headers):
+        end = headers[i + 1][0] if i + 1 < len(headers) else len(text)
+        # Keep the first occurrence when a header repeats on later pages
+        sections.setdefault(section, (body_start, end))
+    return sections
+
+def extract_fast(text):
+    """Contact details, dictionary skills and section boundaries without an LLM call"""
+    return {
+        'name': find_name(text),
+        'email': find_email(text),
+        'phone': find_phone(text),
+        'skills': find_skills(text),
+        'sections': find_sections(text),
+    }
@@ -0,0 +1,284 @@
+import email.utils
+import json
+import random
+import socket
+import threading
+import time
+
+from metrics import GROQ_RETRIES, GROQ_TOKENS
+
+# ----------- Groq Client Config ------------
+GROQ_TIMEOUT = (5, 60)  # (connect, read) seconds
+GROQ_MAX_RETRIES = 4
+GROQ_BACKOFF_BASE = 0.5  # Seconds; doubled on every retry
+GROQ_BACKOFF_MAX = 30
+GROQ_POOL_SIZE = 10  # Keep-alive connections shared by all worker threads
+GROQ_REQUESTS_PER_MINUTE = 30  # Match these to the quotas of your Groq plan
+GROQ_TOKENS_PER_MINUTE = 6000
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class RequestCancelled(Exception):
+    """Raised by a request whose cancel event was set before it could finish"""
+
+class CancelToken(threading.Event):
+    """Event that cancels a request: setting it also aborts the HTTP call the request is blocked in"""
+
+    def __init__(self):
+        super().__init__()
+        self._connection = None
+        self._connection_lock = threading.Lock()
+
+    def attach(self, connection):
+        with self._connection_lock:
+            self._connection = connection
+            if self.is_set():
+                _abort(connection)
+
+    def detach(self, connection):
+        with self._connection_lock:
+            if self._connection is connection:
+                self._connection = None
+
+    def set(self):
+        super().set()
+        with self._connection_lock:
+            if self._connection is not None:
+                _abort(self._connection)
+                self._connection = None
+
+def _abort(connection):
+    # shutdown (unlike close) wakes a thread blocked reading the socket
+    sock = getattr(connection, 'sock', None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+_request_state = threading.local()  # CancelToken of the request this thread is sending
+_pool_classes = None
+
+def _cancellable_pool_classes():
+    """urllib3 connection pools whose connections register with the sending thread's CancelToken"""
+    global _pool_classes
+    if _pool_classes is None:
+        from urllib3.connection import HTTPConnection, HTTPSConnection
+        from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+        class CancellableMixin:
+            def getresponse(self, *args, **kwargs):
+                self.cancel_token = getattr(_request_state, 'cancel_token', None)
+                if self.cancel_token is not None:
+                    self.cancel_token.attach(self)
+                return super().getresponse(*args, **kwargs)
+
+        class PoolMixin:
+            def _put_conn(self, conn):
+                # Detached before the connection can be handed to another request
+                token = getattr(conn, 'cancel_token', None)
+                if token is not None:
+                    token.detach(conn)
+                    conn.cancel_token = None
+                super()._put_conn(conn)
+
+        class CancellableHTTPConnection(CancellableMixin, HTTPConnection):
+            pass
+
+        class CancellableHTTPSConnection(CancellableMixin, HTTPSConnection):
+            pass
+
+        class CancellableHTTPConnectionPool(PoolMixin, HTTPConnectionPool):
+            ConnectionCls = CancellableHTTPConnection
+
+        class CancellableHTTPSConnectionPool(PoolMixin, HTTPSConnectionPool):
+            ConnectionCls = CancellableHTTPSConnection
+
+        _pool_classes = {'http': CancellableHTTPConnectionPool, 'https': CancellableHTTPSConnectionPool}
+    return _pool_classes
+
+def estimate_tokens(text):
+    """Rough token count (about 4 characters per token for English text)"""
+    return len(text) // 4 + 1
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at rate_per_minute"""
+
+    def __init__(self, rate_per_minute):
+        self.capacity = float(rate_per_minute)
+        self.rate = rate_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self, amount=1):
+        """Whether acquire(amount) would return without waiting"""
+        with self._lock:
+            self._refill()
+            return self.tokens >= min(float(amount), self.capacity)
+
+    def acquire(self, amount=1, cancelled=None):
+        """Block until amount tokens are available and take them.
+
+        Raises RequestCancelled if the cancelled event is set while waiting.
+        """
+        amount = min(float(amount), self.capacity)  # Oversized requests wait for a full bucket
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            if cancelled is None:
+                time.sleep(wait)
+            elif cancelled.wait(wait):
+                raise RequestCancelled()
+
+class GroqClient:
+    """Shared Groq chat-completions client.
+
+    Reuses pooled keep-alive connections, applies explicit timeouts, keeps
+    callers under the requests/tokens per minute quotas and retries 429/5xx
+    responses with jittered exponential backoff, honoring Retry-After.
+    """
+
+    def __init__(self, api_key, api_url, requests_per_minute=GROQ_REQUESTS_PER_MINUTE,
+                 tokens_per_minute=GROQ_TOKENS_PER_MINUTE, timeout=GROQ_TIMEOUT,
+                 max_retries=GROQ_MAX_RETRIES, pool_size=GROQ_POOL_SIZE):
+        self.api_key = api_key
+        self.api_url = api_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.request_limiter = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_limiter = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+        # requests is imported here, not at module level, so importing the parser stays fast
+        import requests
+        from requests.adapters import HTTPAdapter
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        adapter.poolmanager.pool_classes_by_scheme = _cancellable_pool_classes()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        })
+
+    def _quota_tokens(self, payload):
+        prompt = ''.join(message.get('content', '') for message in payload.get('messages', []))
+        return estimate_tokens(prompt) + payload.get('max_tokens', 1024)
+
+    def has_quota(self, payload):
+        """Whether payload could be sent now without waiting for the local rate limits"""
+        return ((not self.request_limiter or self.request_limiter.available(1)) and
+                (not self.token_limiter or self.token_limiter.available(self._quota_tokens(payload))))
+
+    def _wait_for_quota(self, payload, cancelled=None):
+        if self.request_limiter:
+            self.request_limiter.acquire(1, cancelled)
+        if self.token_limiter:
+            self.token_limiter.acquire(self._quota_tokens(payload), cancelled)
+
+    def _backoff(self, attempt, response=None):
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return retry_after + random.uniform(0, GROQ_BACKOFF_BASE)
+        # Full jitter keeps concurrent workers from retrying in lockstep
+        return random.uniform(0, min(GROQ_BACKOFF_MAX, GROQ_BACKOFF_BASE * 2 ** attempt))
+
+    def post(self, payload, stream=False, cancelled=None, on_send=None):
+        """POST a chat-completions payload and return the successful response.
+
+        Setting the cancelled event (a CancelToken aborts the call in flight
+        as well) stops the quota wait and any further retries with
+        RequestCancelled. on_send() is called once quota is acquired, right
+        before each attempt goes out.
+        """
+        import requests
+        attempt = 0
+        while True:
+            if cancelled is not None and cancelled.is_set():
+                raise RequestCancelled()
+            self._wait_for_quota(payload, cancelled)
+            if on_send is not None:
+                on_send()
+            _request_state.cancel_token = cancelled if isinstance(cancelled, CancelToken) else None
+            try:
+                response = self.session.post(self.api_url, json=payload, timeout=self.timeout, stream=stream)
+            except requests.exceptions.RequestException as e:
+                if cancelled is not None and cancelled.is_set():
+                    raise RequestCancelled() from None  # Aborted by the token, not a network failure
+                retryable = isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                GROQ_RETRIES.inc(reason=type(e).__name__)
+                print(f"Groq request failed ({e}), retrying in {delay:.1f}s")
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    response.raise_for_status()
+                    return response
+                delay = self._backoff(attempt, response)
+                GROQ_RETRIES.inc(reason=response.status_code)
+                print(f"Groq returned {response.status_code}, retrying in {delay:.1f}s")
+                response.close()
+            finally:
+                _request_state.cancel_token = None
+
+            attempt += 1
+            if cancelled is not None:
+                cancelled.wait(delay)
+            else:
+                time.sleep(delay)
+
+    def chat(self, payload, cancelled=None, on_send=None):
+        """Send a chat-completions request and return the decoded JSON body"""
+        data = self.post(payload, cancelled=cancelled, on_send=on_send).json()
+        count_usage(data.get('usage'))
+        return data
+
+    def chat_stream(self, payload):
+        """Send a streaming chat-completions request and yield the reply text as it arrives"""
+        response = self.post(dict(payload, stream=True), stream=True)
+        with response:
+            for line in response.iter_lines():
+                line = line.decode('utf-8').strip()
+                if not line.startswith('data:'):
+                    continue
+                data = line[len('data:'):].strip()
+                if data == '[DONE]':
+                    return
+                chunk = json.loads(data)
+                # Groq reports usage on the last chunk under "x_groq"
+                count_usage(chunk.get('usage') or (chunk.get('x_groq') or {}).get('usage'))
+                for choice in chunk.get('choices', []):
+                    content = (choice.get('delta') or {}).get('content')
+                    if content:
+                        yield content
+
+def count_usage(usage):
+    """Add a response's reported token usage to the metrics"""
+    if usage:
+        GROQ_TOKENS.inc(usage.get('prompt_tokens', 0), type='prompt')
+        GROQ_TOKENS.inc(usage.get('completion_tokens', 0), type='completion')
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
@@ -0,0 +1,106 @@
+import json
+import tkinter as tk
+from tkinter import filedialog, messagebox, scrolledtext
+from tkinter import ttk
+
+import requests
+
+from resume_parser import extract_info_with_groq, extract_text_from_pdf, score_resume
+from sheets_manager import get_sheets_manager
+
+# ----------- GUI Application ------------
+class ResumeParserApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Resume Parser with Groq AI")
+        self.root.geometry("800x600")
+
+        # Add status label
+        self.status_label = tk.Label(root, text="", fg="blue")
+        self.status_label.pack(pady=5)
+
+        self.notebook = ttk.Notebook(root)
+        self.notebook.pack(expand=True, fill='both')
+
+        self.resume_tab = tk.Frame(self.notebook)
+        self.notebook.add(self.resume_tab, text='Resume Data')
+
+        self.output_box = scrolledtext.ScrolledText(self.resume_tab, wrap=tk.WORD, width=100, height=30)
+        self.output_box.pack(padx=10, pady=10)
+
+        self.export_tab = tk.Frame(self.notebook)
+        self.notebook.add(self.export_tab, text='Export')
+
+        tk.Button(self.export_tab, text="Export to File", command=self.export_to_file).pack(pady=5)
+
+        tk.Button(root, text="Upload Resume (PDF)", command=self.upload_resume).pack(pady=10)
+
+    def update_status(self, message):
+        self.status_label.config(text=message)
+        self.root.update()
+
+    def upload_resume(self):
+        filepath = filedialog.askopenfilename(filetypes=[("PDF Files", "*.pdf")])
+        if not filepath:
+            return
+
+        try:
+            self.update_status("Reading PDF file...")
+            text = extract_text_from_pdf(filepath)
+            if not text.strip():
+                messagebox.showerror("Error", "Could not extract text from PDF")
+                self.update_status("")
+                return
+
+            self.update_status("Analyzing resume...")
+            parsed_data = extract_info_with_groq(text)
+            
+            self.update_status("Calculating score...")
+            score = score_resume(parsed_data)
+            parsed_data["resume_score"] = f"{score}/100"
+
+            # Add to Google Sheets with visual confirmation
+            self.update_status("Adding to Google Sheets...")
+            # Google authentication happens on the first upload, not at startup
+            try:
+                added = get_sheets_manager().add_candidate(parsed_data)
+            except Exception as e:
+                print(f"Google Sheets unavailable: {str(e)}")
+                added = False
+            if added:
+                messagebox.showinfo("Success", "Resume data added to Google Sheets successfully!")
+            else:
+                messagebox.showerror("Error", "Failed to add data to Google Sheets")
+
+            pretty_output = json.dumps(parsed_data, indent=2)
+            self.output_box.delete(1.0, tk.END)
+            self.output_box.insert(tk.END, pretty_output)
+
+            self.last_output = pretty_output
+            self.update_status("Analysis complete!")
+            
+        except requests.exceptions.RequestException as e:
+            messagebox.showerror("API Error", "Failed to connect to Groq API. Please check your internet connection.")
+        except json.JSONDecodeError:
+            messagebox.showerror("Error", "Failed to parse API response")
+        except Exception as e:
+            messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
+        finally:
+            self.update_status("")
+
+    def export_to_file(self):
+        if hasattr(self, "last_output"):
+            file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON Files", "*.json")])
+            if file_path:
+                with open(file_path, "w", encoding="utf-8") as f:
+                    f.write(self.last_output)
+                messagebox.showinfo("Success", "Output exported successfully.")
+
+def main():
+    root = tk.Tk()
+    app = ResumeParserApp(root)
+    root.mainloop()
+
+# ----------- Run the App ------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+
+from metrics import request_context
+
+# ----------- Job Queue Config ------------
+JOBS_DB = 'jobs.db'
+JOB_WORKERS = 2  # Number of resumes processed at the same time
+POLL_INTERVAL = 1.0  # Seconds an idle worker waits before checking the store again
+JOB_LEASE_SECONDS = 60  # A running job whose process has not renewed its lease for this long is picked up again
+HEARTBEAT_INTERVAL = 15  # Seconds between lease renewals of a process's running jobs
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+FINISHED_STATES = (DONE, FAILED)
+
+class JobQueue:
+    """SQLite-backed queue of resume uploads drained by a local worker pool.
+
+    The uploaded PDF is stored with the job, so queued jobs survive a
+    restart. Running jobs hold a lease that their process renews every
+    HEARTBEAT_INTERVAL seconds; once it has lapsed for JOB_LEASE_SECONDS
+    (the process died) any queue sharing the database picks the job up
+    again, while jobs of other live processes are left alone.
+    """
+
+    def __init__(self, handler, db_path=JOBS_DB, workers=JOB_WORKERS):
+        self.handler = handler  # handler(filename, pdf_bytes) -> result dict
+        self.db_path = db_path
+        self.workers = workers
+        self.worker_id = uuid.uuid4().hex  # Owner of the leases of this queue's running jobs
+        self._threads = []
+        self._wakeup = threading.Condition()
+        self._stopping = False
+        self._stopped = threading.Event()
+        self.setup_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def setup_db(self):
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    filename TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    payload BLOB,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)')
+            columns = {row['name'] for row in conn.execute('PRAGMA table_info(jobs)')}
+            if 'worker' not in columns:
+                # Databases created before leases: running jobs without a heartbeat count as lapsed
+                conn.execute('ALTER TABLE jobs ADD COLUMN worker TEXT')
+                conn.execute('ALTER TABLE jobs ADD COLUMN heartbeat_at REAL')
+
+    def submit(self, filename, pdf_bytes):
+        """Queue a resume and return its job id"""
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO jobs (id, filename, status, payload, created_at) VALUES (?, ?, ?, ?, ?)',
+                (job_id, filename, QUEUED, sqlite3.Binary(pdf_bytes), time.time())
+            )
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def get(self, job_id):
+        """Return the job status (and result once finished) or None if unknown"""
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT id, filename, status, result, error, created_at, started_at, finished_at '
+                'FROM jobs WHERE id = ?', (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        job = dict(row)
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        if job['status'] == QUEUED:
+            job['position'] = self._position(job['created_at'])
+        return job
+
+    def _position(self, created_at):
+        with self._connect() as conn:
+            return conn.execute(
+                'SELECT COUNT(*) FROM jobs WHERE status = ? AND created_at < ?', (QUEUED, created_at)
+            ).fetchone()[0]
+
+    def _claim(self):
+        # BEGIN IMMEDIATE takes the write lock so two workers never claim the same job
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            now = time.time()
+            # Queued jobs, and running jobs whose process stopped renewing their lease
+            row = conn.execute(
+                'SELECT id, filename, payload, status FROM jobs WHERE status = ? '
+                'OR (status = ? AND COALESCE(heartbeat_at, 0) < ?) ORDER BY created_at LIMIT 1',
+                (QUEUED, RUNNING, now - JOB_LEASE_SECONDS)
+            ).fetchone()
+            if row is None:
+                conn.rollback()
+                return None
+            conn.execute(
+                'UPDATE jobs SET status = ?, started_at = ?, heartbeat_at = ?, worker = ? WHERE id = ?',
+                (RUNNING, now, now, self.worker_id, row['id'])
+            )
+            conn.commit()
+            if row['status'] == RUNNING:
+                print(f"Resuming job {row['id']} ({row['filename']}): its lease lapsed")
+            return row['id'], row['filename'], bytes(row['payload'])
+        finally:
+            conn.close()
+
+    def _heartbeat(self):
+        while not self._stopped.wait(HEARTBEAT_INTERVAL):
+            with self._connect() as conn:
+                conn.execute('UPDATE jobs SET heartbeat_at = ? WHERE worker = ? AND status = ?',
+                             (time.time(), self.worker_id, RUNNING))
+
+    def _finish(self, job_id, result=None, error=None):
+        status = FAILED if error is not None else DONE
+        with self._connect() as conn:
+            # Drop the stored PDF once the job is finished, only the result is kept
+            conn.execute(
+                'UPDATE jobs SET status = ?, result = ?, error = ?, payload = NULL, finished_at = ? WHERE id = ?',
+                (status, json.dumps(result) if result is not None else None, error, time.time(), job_id)
+            )
+
+    def _worker(self):
+        while not self._stopping:
+            job = self._claim()
+            if job is None:
+                with self._wakeup:
+                    self._wakeup.wait(POLL_INTERVAL)
+                continue
+
+            job_id, filename, pdf_bytes = job
+            try:
+                with request_context(job_id):
+                    result = self.handler(filename, pdf_bytes)
+                self._finish(job_id, result=result)
+            except Exception as e:
+                print(f"Error processing job {job_id} ({filename}): {str(e)}")
+                self._finish(job_id, error=str(e) or type(e).__name__)
+
+    def start(self):
+        """Start the worker threads and the lease heartbeat"""
+        self._stopping = False
+        self._stopped.clear()
+        thread = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        """Ask the workers to exit after their current job and wait for them"""
+        self._stopping = True
+        self._stopped.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
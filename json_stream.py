@@ -0,0 +1,61 @@
+import json
+
+# ----------- Incremental JSON Object Parser ------------
+class JSONFieldStream:
+    """Parses the top-level members of a JSON object as its text arrives in chunks.
+
+    feed() returns the (key, value) pairs completed by the new text, so a
+    streamed LLM reply can be shown field by field before it has finished.
+    Text before the opening brace (such as a code fence) is ignored.
+    """
+
+    def __init__(self):
+        self.buffer = ''
+        self.position = 0  # Next character to scan
+        self.member_start = None  # Start of the member being read, once inside the object
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.done = False
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        members = []
+        buffer = self.buffer
+        while self.position < len(buffer) and not self.done:
+            char = buffer[self.position]
+            self.position += 1
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif self.depth == 0 and char != '{':
+                continue  # Still before the object
+            elif char == '"':
+                self.in_string = True
+            elif char in '{[':
+                self.depth += 1
+                if self.depth == 1:
+                    self.member_start = self.position
+            elif char in '}]':
+                self.depth -= 1
+                if self.depth == 0:
+                    members.extend(self._member(buffer[self.member_start:self.position - 1]))
+                    self.done = True
+            elif char == ',' and self.depth == 1:
+                members.extend(self._member(buffer[self.member_start:self.position - 1]))
+                self.member_start = self.position
+        return members
+
+    @staticmethod
+    def _member(text):
+        if not text.strip():
+            return []
+        try:
+            return list(json.loads('{' + text + '}').items())
+        except ValueError:
+            # Malformed members are left for the parse of the complete reply to report
+            return []
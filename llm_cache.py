@@ -0,0 +1,127 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+
+# ----------- LLM Cache Config ------------
+LLM_CACHE_DB = 'llm_cache.db'
+LLM_CACHE_MAX_ENTRIES = 50000
+LLM_CACHE_TTL = 30 * 24 * 60 * 60  # 30 days; set to None to keep entries until evicted by size
+
+_whitespace_re = re.compile(r'\s+')
+
+def make_cache_key(resume_text, model, prompt_version):
+    """Hash of the normalized resume text plus everything that changes the LLM output"""
+    normalized = _whitespace_re.sub(' ', resume_text).strip()
+    digest = hashlib.sha256()
+    digest.update(f"{model}\0{prompt_version}\0".encode('utf-8'))
+    digest.update(normalized.encode('utf-8'))
+    return digest.hexdigest()
+
+class LLMCache:
+    """Persistent, content-addressed cache of parsed LLM replies.
+
+    Entries expire after ttl seconds and the least recently used entries are
+    evicted once the cache grows past max_entries.
+    """
+
+    def __init__(self, db_path=LLM_CACHE_DB, max_entries=LLM_CACHE_MAX_ENTRIES, ttl=LLM_CACHE_TTL):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        if not self._ready:
+            with self._lock:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS llm_cache (
+                        key TEXT PRIMARY KEY,
+                        value TEXT NOT NULL,
+                        created_at REAL NOT NULL,
+                        accessed_at REAL NOT NULL
+                    )
+                ''')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)')
+                conn.commit()
+                self._ready = True
+        return conn
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key):
+        """Return the cached parsed JSON for key, or None on a miss"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                row = conn.execute('SELECT value, created_at FROM llm_cache WHERE key = ?', (key,)).fetchone()
+                if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                    conn.execute('DELETE FROM llm_cache WHERE key = ?', (key,))
+                    row = None
+                if row is not None:
+                    conn.execute('UPDATE llm_cache SET accessed_at = ? WHERE key = ?', (now, key))
+        finally:
+            conn.close()
+
+        self._count(row is not None)
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, key, value):
+        """Store parsed JSON for key and evict old entries if needed"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                    (key, json.dumps(value), now, now)
+                )
+                self._evict(conn, now)
+        finally:
+            conn.close()
+
+    def _evict(self, conn, now):
+        if self.ttl is not None:
+            conn.execute('DELETE FROM llm_cache WHERE created_at < ?', (now - self.ttl,))
+        if self.max_entries is not None:
+            overflow = conn.execute('SELECT COUNT(*) FROM llm_cache').fetchone()[0] - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    'DELETE FROM llm_cache WHERE key IN '
+                    '(SELECT key FROM llm_cache ORDER BY accessed_at LIMIT ?)', (overflow,)
+                )
+
+    def clear(self):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute('DELETE FROM llm_cache')
+        finally:
+            conn.close()
+
+    def stats(self):
+        conn = self._connect()
+        try:
+            entries = conn.execute('SELECT COUNT(*) FROM llm_cache').fetchone()[0]
+        finally:
+            conn.close()
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            'entries': entries
+        }
@@ -0,0 +1,194 @@
+import bisect
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+# ----------- Metrics Config ------------
+# Histogram bucket upper bounds; the +Inf bucket is implicit
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 3000, 4000, 6000, 8000, 12000, 16000)
+STRUCTURED_LOGS = os.environ.get('STRUCTURED_LOGS', '1') == '1'  # One JSON line per pipeline stage
+
+_request_id = contextvars.ContextVar('request_id', default=None)
+
+# ----------- Request IDs and Structured Logs ------------
+def new_request_id():
+    return uuid.uuid4().hex[:16]
+
+def current_request_id():
+    return _request_id.get()
+
+def set_request_id(request_id=None):
+    """Set the current request ID (a new one if not given); returns a token for reset_request_id"""
+    return _request_id.set(request_id or new_request_id())
+
+def reset_request_id(token):
+    _request_id.reset(token)
+
+@contextmanager
+def request_context(request_id=None):
+    """Tag everything logged inside the block with request_id (a new one if not given)"""
+    token = set_request_id(request_id)
+    try:
+        yield _request_id.get()
+    finally:
+        reset_request_id(token)
+
+def log_event(event, **fields):
+    """Print one JSON log line carrying the current request ID"""
+    if not STRUCTURED_LOGS:
+        return
+    record = {'ts': round(time.time(), 3), 'event': event, 'request_id': current_request_id()}
+    record.update(fields)
+    print(json.dumps(record, default=str), flush=True)
+
+# ----------- Metric Types ------------
+def _format_labels(label_names, label_values, extra=()):
+    pairs = list(zip(label_names, label_values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(str(labels.get(name, '')) for name in self.label_names), 0)
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield self.name + _format_labels(self.label_names, key), value
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, label_names=(), buckets=STAGE_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}  # labels -> [per-bucket counts (+Inf last), sum]
+        self.listeners = []  # Called with (value, labels) for every observation, e.g. to keep raw samples
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.label_names)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+        for listener in self.listeners:
+            listener(value, labels)
+
+    def count(self, **labels):
+        entry = self._values.get(tuple(str(labels.get(name, '')) for name in self.label_names))
+        return sum(entry[0]) if entry else 0
+
+    def samples(self):
+        with self._lock:
+            values = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, key, [('le', _format_value(bound))])
+                yield self.name + '_bucket' + labels, cumulative
+            yield self.name + '_sum' + _format_labels(self.label_names, key), total
+            yield self.name + '_count' + _format_labels(self.label_names, key), cumulative
+
+class MetricsRegistry:
+    """Named metrics rendered in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text, label_names=()):
+        return self._register(Counter(name, help_text, label_names))
+
+    def histogram(self, name, help_text, label_names=(), buckets=STAGE_BUCKETS):
+        return self._register(Histogram(name, help_text, label_names, buckets))
+
+    def render(self):
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(f'{sample} {_format_value(value)}' for sample, value in metric.samples())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = MetricsRegistry()
+
+# ----------- Pipeline Metrics ------------
+STAGE_SECONDS = REGISTRY.histogram(
+    'resume_stage_seconds', 'Time spent in each resume pipeline stage', ('stage',), STAGE_BUCKETS
+)
+STAGE_ERRORS = REGISTRY.counter('resume_stage_errors_total', 'Exceptions raised in each pipeline stage', ('stage',))
+PROMPT_TOKENS = REGISTRY.histogram(
+    'resume_prompt_tokens', 'Estimated resume tokens before and after prompt compaction', ('phase',), TOKEN_BUCKETS
+)
+GROQ_TOKENS = REGISTRY.counter('groq_tokens_total', 'Tokens reported by the Groq API', ('type',))
+GROQ_RETRIES = REGISTRY.counter('groq_retries_total', 'Groq requests retried', ('reason',))
+GROQ_ROUTED = REGISTRY.counter('groq_routed_requests_total', 'Groq extraction requests by routed model', ('model',))
+GROQ_HEDGES = REGISTRY.counter('groq_hedged_requests_total', 'Hedged Groq requests by which one answered first',
+                               ('winner',))
+CACHE_REQUESTS = REGISTRY.counter('llm_cache_requests_total', 'Extraction cache lookups', ('result',))
+RESUMES_PROCESSED = REGISTRY.counter('resumes_processed_total', 'Resumes parsed and scored', ('mode', 'status'))
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    'http_request_seconds', 'Web request latency by endpoint', ('endpoint', 'status'), STAGE_BUCKETS
+)
+
+def record_stage(stage, seconds, error=None, **fields):
+    """Record a stage the caller timed itself, like stage_timer does"""
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    if error is not None:
+        STAGE_ERRORS.inc(stage=stage)
+        log_event('stage', stage=stage, seconds=round(seconds, 4), status='error', error=str(error), **fields)
+    else:
+        log_event('stage', stage=stage, seconds=round(seconds, 4), status='ok', **fields)
+
+@contextmanager
+def stage_timer(stage, **fields):
+    """Time a pipeline stage into STAGE_SECONDS, count its errors and log it"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        record_stage(stage, time.perf_counter() - start, e, **fields)
+        raise
+    record_stage(stage, time.perf_counter() - start, **fields)
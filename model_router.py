@@ -0,0 +1,165 @@
+import collections
+import contextvars
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from groq_client import CancelToken, estimate_tokens
+from metrics import GROQ_HEDGES, GROQ_ROUTED
+
+# ----------- Model Routing Config ------------
+HEDGE_ENABLED = True
+HEDGE_PERCENTILE = 95  # A request slower than this percentile of recent ones is sent a second time
+HEDGE_MIN_SAMPLES = 20  # Latencies a model needs before its percentile is trusted
+HEDGE_INITIAL_DELAY = 8.0  # Seconds before hedging until then
+HEDGE_WINDOW = 200  # Recent latencies kept per model
+HEDGE_BUDGET = 0.1  # At most this fraction of requests is hedged
+ROUTER_WORKERS = 32  # Threads running primary and hedged requests
+
+class LatencyWindow:
+    """Latencies of the most recent requests to one model (thread-safe)"""
+
+    def __init__(self, size=HEDGE_WINDOW):
+        self._samples = collections.deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, percent):
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+class ModelRouter:
+    """Picks the Groq model for each extraction request and hedges slow ones.
+
+    routes is a sequence of (max prompt tokens, model) checked in order, the
+    last with None for no limit, so short resumes can go to a cheap model and
+    long ones to a large model. A request still unanswered after the hedge
+    delay (HEDGE_PERCENTILE of its model's recent latencies) is sent again to
+    hedge_models.get(model, model). The first valid reply wins and the other
+    request is cancelled: its quota wait or HTTP call is aborted and it is not
+    retried. Latencies and the hedge clock start once a request has its local
+    quota and is sent, and no hedge is sent while the quota is used up, so
+    queueing behind the rate limits never triggers a hedge.
+    """
+
+    def __init__(self, client, routes, hedge_models=None, hedge=HEDGE_ENABLED, percentile=HEDGE_PERCENTILE,
+                 min_samples=HEDGE_MIN_SAMPLES, initial_delay=HEDGE_INITIAL_DELAY, window=HEDGE_WINDOW,
+                 budget=HEDGE_BUDGET, workers=ROUTER_WORKERS):
+        self.client = client
+        self.routes = tuple(routes)
+        self.hedge_models = dict(hedge_models or {})
+        self.hedge = hedge
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.window = window
+        self.budget = budget
+        self.requests = 0
+        self.hedges = 0
+        self._latencies = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="groq-request")
+
+    def route(self, payload):
+        """Copy of payload addressed to the model for its estimated prompt size"""
+        tokens = estimate_tokens(''.join(message.get('content', '') for message in payload.get('messages', [])))
+        model = self.routes[-1][1]
+        for max_tokens, candidate in self.routes:
+            if max_tokens is None or tokens <= max_tokens:
+                model = candidate
+                break
+        GROQ_ROUTED.inc(model=model)
+        return dict(payload, model=model)
+
+    def latencies(self, model):
+        with self._lock:
+            if model not in self._latencies:
+                self._latencies[model] = LatencyWindow(self.window)
+            return self._latencies[model]
+
+    def hedge_delay(self, model):
+        """Seconds to wait for a request to model before hedging it"""
+        latencies = self.latencies(model)
+        if len(latencies) < self.min_samples:
+            return self.initial_delay
+        return latencies.percentile(self.percentile)
+
+    def _take_hedge(self):
+        with self._lock:
+            if self.hedges >= self.budget * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def _send(self, payload, parse, cancelled, sent):
+        sent_at = []
+
+        def on_send():
+            if not sent_at:
+                sent_at.append(time.perf_counter())
+                sent.set()
+
+        data = self.client.chat(payload, cancelled=cancelled, on_send=on_send)
+        self.latencies(payload['model']).add(time.perf_counter() - sent_at[0])
+        return parse(data) if parse else data
+
+    def chat(self, payload, parse=None):
+        """Send a routed payload (see route) and return (result, model that answered).
+
+        parse(data) turns the decoded reply into the result and raises
+        ValueError if it is not usable, so an invalid reply never wins the race.
+        """
+        model = payload['model']
+        with self._lock:
+            self.requests += 1
+        pending = {}
+
+        def submit(request_payload, role):
+            cancelled = CancelToken()
+            sent = threading.Event()
+            # Run in a copy of the caller's context so the request ID reaches the worker's logs
+            future = self._executor.submit(contextvars.copy_context().run, self._send, request_payload,
+                                           parse, cancelled, sent)
+            future.add_done_callback(lambda _: sent.set())
+            pending[future] = (request_payload['model'], role, cancelled)
+            return sent
+
+        sent = submit(payload, "primary")
+        if self.hedge:
+            # Waiting for local quota is not Groq latency: the hedge clock starts once the request is sent
+            sent.wait()
+            done, _ = wait(pending, timeout=self.hedge_delay(model))
+            hedge_payload = dict(payload, model=self.hedge_models.get(model, model))
+            # A hedge that would queue for quota only takes it from other requests
+            if not done and self.client.has_quota(hedge_payload) and self._take_hedge():
+                submit(hedge_payload, "hedge")
+        hedged = len(pending) > 1
+
+        error = None
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                answered_model, role, _ = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Failed or invalid; the other request may still answer
+                    error = e
+                    continue
+                for other, (_, _, cancelled) in pending.items():
+                    cancelled.set()
+                    other.cancel()
+                if hedged:
+                    GROQ_HEDGES.inc(winner=role)
+                return result, answered_model
+        raise error
@@ -0,0 +1,99 @@
+import re
+from collections import Counter
+
+from fast_extract import SECTION_RE, find_sections
+from groq_client import estimate_tokens
+
+# ----------- Prompt Compaction Config ------------
+PROMPT_TOKEN_BUDGET = 3000  # Max estimated tokens of resume text sent to the LLM
+PAGE_BREAK = "\f"  # Separator extract_text_from_pdf puts between pages
+HEADER_FOOTER_LINES = 2  # Lines at the top/bottom of each page checked for repeated headers/footers
+# Sections dropped (in this order) when the text is over budget
+LOW_VALUE_SECTIONS = ('interests', 'languages', 'achievements', 'summary')
+
+_page_number_re = re.compile(r'^(?:page\s*)?\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?$|^-\s*\d{1,3}\s*-$', re.IGNORECASE)
+_inline_space_re = re.compile(r'[^\S\n]+')
+
+def _normalize_line(line):
+    return _inline_space_re.sub(' ', line).strip()
+
+def _remove_repeated_lines(pages):
+    # A line sitting at the top (or bottom) of two or more pages is a running header/footer.
+    # Section headings are real content even when a section starts a new page.
+    top_counts = Counter(line.lower() for lines in pages for line in set(lines[:HEADER_FOOTER_LINES]))
+    bottom_counts = Counter(line.lower() for lines in pages for line in set(lines[-HEADER_FOOTER_LINES:]))
+    repeated = {line for counts in (top_counts, bottom_counts) for line, count in counts.items()
+                if count >= 2 and not SECTION_RE.match(line)}
+
+    seen = set()
+    kept = []
+    for lines in pages:
+        for line in lines:
+            key = line.lower()
+            if key in repeated:
+                if key in seen:
+                    continue
+                seen.add(key)
+            # Collapse immediate duplicates that PyPDF2 sometimes emits for bold text
+            if kept and kept[-1].lower() == key:
+                continue
+            kept.append(line)
+    return kept
+
+def _drop_sections(text, sections_to_drop):
+    sections = find_sections(text)
+    spans = sorted((start, end, name) for name, (start, end) in sections.items() if name in sections_to_drop)
+    if not spans:
+        return text, []
+    parts = []
+    position = 0
+    for start, end, _ in spans:
+        # Also drop the header line that precedes the section body
+        header_start = text.rfind('\n', 0, start) + 1
+        parts.append(text[position:header_start])
+        position = end
+    parts.append(text[position:])
+    return ''.join(parts), [name for _, _, name in spans]
+
+def _truncate(text, token_budget):
+    max_chars = token_budget * 4
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind('\n', 0, max_chars)
+    return text[:cut if cut > 0 else max_chars]
+
+def compact_resume_text(text, token_budget=PROMPT_TOKEN_BUDGET):
+    """Shrink resume text before it goes into the prompt.
+
+    Drops page numbers and running headers/footers, collapses whitespace and,
+    if still over token_budget, removes low-value sections and finally
+    truncates. Returns (compacted_text, stats).
+    """
+    tokens_before = estimate_tokens(text)
+    pages = []
+    for page in text.split(PAGE_BREAK):
+        lines = [_normalize_line(line) for line in page.splitlines()]
+        pages.append([line for line in lines if line and not _page_number_re.match(line)])
+    compacted = '\n'.join(_remove_repeated_lines(pages))
+
+    dropped_sections = []
+    truncated = False
+    if token_budget is not None and estimate_tokens(compacted) > token_budget:
+        for section in LOW_VALUE_SECTIONS:
+            compacted, dropped = _drop_sections(compacted, (section,))
+            dropped_sections.extend(dropped)
+            if estimate_tokens(compacted) <= token_budget:
+                break
+        if estimate_tokens(compacted) > token_budget:
+            compacted = _truncate(compacted, token_budget)
+            truncated = True
+
+    stats = {
+        'tokens_before': tokens_before,
+        'tokens_after': estimate_tokens(compacted),
+        'chars_before': len(text),
+        'chars_after': len(compacted),
+        'dropped_sections': dropped_sections,
+        'truncated': truncated
+    }
+    return compacted, stats
@@ -0,0 +1,207 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+
+from experience_parser import total_experience_months
+from fast_extract import find_skills
+
+# ----------- Requisition Matching Config ------------
+REQUIRED_WEIGHT = 60  # Points for covering every required skill
+PREFERRED_WEIGHT = 25  # Points for covering every preferred skill
+EXPERIENCE_WEIGHT = 15  # Points for meeting the minimum years of experience
+
+# Alternative spellings mapped to one canonical skill name
+SKILL_SYNONYMS = {
+    'js': 'javascript', 'es6': 'javascript', 'ts': 'typescript',
+    'node.js': 'node', 'nodejs': 'node', 'node js': 'node',
+    'react.js': 'react', 'reactjs': 'react', 'vue.js': 'vue', 'vuejs': 'vue', 'angularjs': 'angular',
+    'next.js': 'nextjs', 'express.js': 'express',
+    'golang': 'go', 'c sharp': 'c#', 'cpp': 'c++', 'py': 'python', 'python3': 'python',
+    'postgres': 'postgresql', 'psql': 'postgresql', 'mongo': 'mongodb', 'ms sql': 'sql server', 'mssql': 'sql server',
+    'k8s': 'kubernetes', 'amazon web services': 'aws', 'gcp': 'google cloud', 'google cloud platform': 'google cloud',
+    'microsoft azure': 'azure', 'ml': 'machine learning', 'dl': 'deep learning',
+    'natural language processing': 'nlp', 'sklearn': 'scikit-learn', 'scikit learn': 'scikit-learn',
+    'tf': 'tensorflow', 'powerbi': 'power bi', 'ci cd': 'ci/cd', 'cicd': 'ci/cd',
+}
+
+def canonical_skill(skill):
+    skill = re.sub(r'\s+', ' ', str(skill)).strip().lower()
+    return SKILL_SYNONYMS.get(skill, skill)
+
+def candidate_skills(parsed_data):
+    """Canonical skills listed on a resume, including project technologies"""
+    skills = set()
+    if isinstance(parsed_data.get('skills'), list):
+        skills.update(canonical_skill(skill) for skill in parsed_data['skills'] if skill)
+    for project in parsed_data.get('projects', []) or []:
+        if isinstance(project, dict) and isinstance(project.get('technologies_used'), list):
+            skills.update(canonical_skill(skill) for skill in project['technologies_used'] if skill)
+    return skills
+
+def experience_years(parsed_data):
+    """Total years of work experience, counting overlapping jobs once"""
+    months = parsed_data.get('total_experience_months')
+    if not isinstance(months, int):
+        months = total_experience_months(parsed_data.get('work_experience', []))
+    return months / 12
+
+class CompiledRequisition:
+    """A job description reduced to canonical skill sets and an experience threshold"""
+
+    __slots__ = ('id', 'title', 'required', 'preferred', 'min_years')
+
+    def __init__(self, requisition_id, spec):
+        """Raises ValueError if spec is malformed"""
+        self.id = requisition_id
+        self.title = str(spec.get('title') or '')
+        self.required = {canonical_skill(skill) for skill in _skill_list(spec, 'required_skills') if skill}
+        preferred = {canonical_skill(skill) for skill in _skill_list(spec, 'preferred_skills') if skill}
+        # Skills mentioned in the free-text description count as preferred
+        if spec.get('description'):
+            if not isinstance(spec['description'], str):
+                raise ValueError('description must be a string')
+            preferred.update(canonical_skill(skill) for skill in find_skills(spec['description']))
+        self.preferred = preferred - self.required
+        min_years = spec.get('min_years_experience') or 0
+        if isinstance(min_years, bool):
+            raise ValueError('min_years_experience must be a number')
+        try:
+            self.min_years = float(min_years)
+        except (TypeError, ValueError):
+            raise ValueError('min_years_experience must be a number') from None
+        if not 0 <= self.min_years < float('inf'):
+            raise ValueError('min_years_experience must be a non-negative number')
+
+def _skill_list(spec, key):
+    skills = spec.get(key) or []
+    # A string would otherwise be iterated into single characters
+    if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        raise ValueError(f'{key} must be a list of strings')
+    return skills
+
+class RequisitionRegistry:
+    """Open requisitions persisted in SQLite and compiled for one-pass scoring.
+
+    All active requisitions share one skill -> [(requisition, kind)] lookup,
+    so a resume is scored against every requisition by walking its own
+    skills once, without any LLM call.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.setup_db()
+        self._load()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def setup_db(self):
+        with self._connect() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS requisitions (
+                    id INTEGER PRIMARY KEY,
+                    spec TEXT NOT NULL,
+                    active INTEGER NOT NULL DEFAULT 1,
+                    created_at REAL NOT NULL
+                )
+            ''')
+
+    def _load(self):
+        with self._connect() as conn:
+            rows = conn.execute('SELECT id, spec FROM requisitions WHERE active = 1 ORDER BY id').fetchall()
+        compiled = []
+        for row in rows:
+            try:
+                compiled.append(CompiledRequisition(row['id'], json.loads(row['spec'])))
+            except (ValueError, AttributeError) as e:
+                # A bad row stored by an older version must not stop the app from starting
+                print(f"Skipping requisition {row['id']}: {e}")
+
+        skill_lookup = {}
+        for index, requisition in enumerate(compiled):
+            for skill in requisition.required:
+                skill_lookup.setdefault(skill, []).append((index, True))
+            for skill in requisition.preferred:
+                skill_lookup.setdefault(skill, []).append((index, False))
+        # Swap in the new structures together so scoring never sees a half-built state
+        with self._lock:
+            self.active = compiled
+            self.skill_lookup = skill_lookup
+
+    def register(self, spec):
+        """Store a requisition spec and return its id.
+
+        spec: {"title", "required_skills", "preferred_skills",
+        "min_years_experience", "description"}. It is compiled before it is
+        stored, so a malformed spec raises ValueError and nothing is saved.
+        """
+        CompiledRequisition(None, spec)
+        with self._connect() as conn:
+            requisition_id = conn.execute(
+                'INSERT INTO requisitions (spec, created_at) VALUES (?, ?)', (json.dumps(spec), time.time())
+            ).lastrowid
+        self._load()
+        return requisition_id
+
+    def deactivate(self, requisition_id):
+        with self._connect() as conn:
+            changed = conn.execute('UPDATE requisitions SET active = 0 WHERE id = ?', (requisition_id,)).rowcount
+        self._load()
+        return bool(changed)
+
+    def list(self, include_inactive=False):
+        sql = 'SELECT id, spec, active FROM requisitions'
+        if not include_inactive:
+            sql += ' WHERE active = 1'
+        with self._connect() as conn:
+            rows = conn.execute(sql + ' ORDER BY id').fetchall()
+        return [{'id': row['id'], 'active': bool(row['active']), **json.loads(row['spec'])} for row in rows]
+
+    def score(self, parsed_data):
+        """Score one parsed resume against every active requisition"""
+        with self._lock:
+            active, skill_lookup = self.active, self.skill_lookup
+        if not active:
+            return {}
+
+        required_hits = [0] * len(active)
+        preferred_hits = [0] * len(active)
+        for skill in candidate_skills(parsed_data):
+            for index, required in skill_lookup.get(skill, ()):
+                if required:
+                    required_hits[index] += 1
+                else:
+                    preferred_hits[index] += 1
+        years = experience_years(parsed_data)
+
+        scores = {}
+        for index, requisition in enumerate(active):
+            required = required_hits[index] / len(requisition.required) if requisition.required else 1.0
+            preferred = preferred_hits[index] / len(requisition.preferred) if requisition.preferred else 1.0
+            experience = min(years / requisition.min_years, 1.0) if requisition.min_years else 1.0
+            scores[requisition.id] = {
+                'title': requisition.title,
+                'score': round(REQUIRED_WEIGHT * required + PREFERRED_WEIGHT * preferred + EXPERIENCE_WEIGHT * experience, 1),
+                'meets_requirements': required_hits[index] == len(requisition.required) and years >= requisition.min_years,
+            }
+        return scores
+
+    def score_matrix(self, candidates):
+        """Scores of many candidates (dicts with "id") against all active requisitions.
+
+        Returns {"requisitions": [ids], "candidates": [ids], "scores": rows},
+        one row per candidate in requisition order.
+        """
+        with self._lock:
+            requisition_ids = [requisition.id for requisition in self.active]
+        candidate_ids, rows = [], []
+        for candidate in candidates:
+            scores = self.score(candidate)
+            candidate_ids.append(candidate.get('id'))
+            rows.append([scores[i]['score'] if i in scores else None for i in requisition_ids])
+        return {'requisitions': requisition_ids, 'candidates': candidate_ids, 'scores': rows}
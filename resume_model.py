@@ -0,0 +1,254 @@
+import json
+import re
+
+# ----------- Reply Repair ------------
+def _drop_trailing_comma(out):
+    end = len(out)
+    while end and out[end - 1].isspace():
+        end -= 1
+    if end and out[end - 1] == ',':
+        del out[end - 1:]
+
+def _close(out, closers):
+    out = list(out)
+    for closer in reversed(closers):
+        _drop_trailing_comma(out)
+        out.append(closer)
+    return ''.join(out)
+
+def repair_json(text):
+    """Best-effort fix of a damaged JSON object from an LLM reply.
+
+    Keeps only the first top-level object (dropping code fences and prose
+    around it), removes trailing commas and closes a reply that was cut off
+    mid-object, dropping the member it was cut off in if that is incomplete.
+    Commas and brackets inside strings are left alone.
+    """
+    start = text.find('{')
+    if start == -1:
+        return text
+    out = []
+    closers = []
+    checkpoint = (0, [])  # Output length and open brackets after the last complete member
+    in_string = escaped = False
+    for char in text[start:]:
+        if in_string:
+            out.append(char)
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in '{[':
+            closers.append('}' if char == '{' else ']')
+            out.append(char)
+            checkpoint = (len(out), list(closers))
+            continue
+        elif char in '}]':
+            _drop_trailing_comma(out)
+            out.append(closers.pop())
+            if not closers:
+                return ''.join(out)
+            continue
+        elif char == ',':
+            checkpoint = (len(out), list(closers))
+        out.append(char)
+
+    # Truncated reply: close the open string and brackets, or fall back to the last complete member
+    repaired = _close(out + ['"'] if in_string else out, closers)
+    try:
+        json.loads(repaired)
+        return repaired
+    except ValueError:
+        length, open_closers = checkpoint
+        return _close(out[:length], open_closers)
+
+def loads_reply(text):
+    """Parse an LLM reply that should be a JSON object, repairing it if needed.
+
+    Raises json.JSONDecodeError if it cannot be read as an object even after repair.
+    """
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = json.loads(repair_json(text))
+    if not isinstance(data, dict):
+        raise json.JSONDecodeError("Expected a JSON object", text, 0)
+    return data
+
+# ----------- Field Coercion ------------
+# None means "not in the reply" and is kept as None so absent fields stay absent
+_list_split_re = re.compile(r'\s*(?:[,;\n•])\s*')
+# Sentences such as responsibilities contain commas, so they are only split into lines and bullets
+_prose_split_re = re.compile(r'\s*(?:\n|•|^[-*]\s)\s*', re.MULTILINE)
+_number_re = re.compile(r'-?\d+(?:\.\d+)?')
+
+def _text(value):
+    if value is None or isinstance(value, str):
+        return value.strip() if value else value
+    if isinstance(value, (list, tuple)):
+        return ', '.join(str(item).strip() for item in value if item not in (None, ''))
+    return str(value)
+
+def _text_list(value, split_re=_list_split_re):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = split_re.split(value)
+    elif not isinstance(value, (list, tuple)):
+        value = [value]
+    items = []
+    for item in value:
+        if isinstance(item, dict):
+            item = item.get('name') or item.get('title')
+        item = _text(item)
+        if item:
+            items.append(item)
+    return items
+
+def _prose_list(value):
+    return _text_list(value, _prose_split_re)
+
+def _number(value):
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    match = _number_re.search(str(value))
+    return float(match.group()) if match else None
+
+# ----------- Resume Model ------------
+class _Record:
+    """Base for the parsed-resume records.
+
+    _fields lists (name, kind) in slot order; kind is a coercion function or
+    a _Record subclass for a list of nested records. Rows (to_row/from_row)
+    are the field values in that order, so new fields must only be appended.
+    A nested record given as a bare string keeps it in its _text_field.
+    """
+
+    __slots__ = ()
+    _fields = ()
+    _text_field = None
+
+    def __init__(self, **values):
+        for name, _ in self._fields:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def from_dict(cls, data):
+        """Validate a parsed dict, coercing every known field and dropping unknown keys"""
+        record = cls.__new__(cls)
+        for name, kind in cls._fields:
+            value = data.get(name)
+            if isinstance(kind, type):
+                if isinstance(value, (dict, str)):
+                    value = [value]
+                if value is not None:
+                    value = [kind.from_dict(item if isinstance(item, dict) else {kind._text_field: item})
+                             for item in value if isinstance(item, dict) or (isinstance(item, str) and item.strip())] \
+                        if isinstance(value, (list, tuple)) else None
+            else:
+                value = kind(value)
+            setattr(record, name, value)
+        return record
+
+    def to_dict(self):
+        """Plain dict of the fields that are set"""
+        data = {}
+        for name, kind in self._fields:
+            value = getattr(self, name)
+            if value is None:
+                continue
+            data[name] = [item.to_dict() for item in value] if isinstance(kind, type) else value
+        return data
+
+    def to_row(self):
+        row = []
+        for name, kind in self._fields:
+            value = getattr(self, name)
+            row.append([item.to_row() for item in value] if isinstance(kind, type) and value is not None else value)
+        while row and row[-1] is None:
+            row.pop()
+        return row
+
+    @classmethod
+    def from_row(cls, row):
+        record = cls.__new__(cls)
+        for index, (name, kind) in enumerate(cls._fields):
+            value = row[index] if index < len(row) else None
+            if isinstance(kind, type) and value is not None:
+                value = [kind.from_row(item) for item in value]
+            setattr(record, name, value)
+        return record
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_row() == other.to_row()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+class Education(_Record):
+    _fields = (('institution', _text), ('degree', _text), ('graduation', _text),
+               ('percentage', _number), ('cgpa', _number), ('year', _text))
+    __slots__ = tuple(name for name, _ in _fields)
+    _text_field = 'institution'
+
+class Experience(_Record):
+    _fields = (('company', _text), ('role', _text), ('duration', _text), ('responsibilities', _prose_list))
+    __slots__ = tuple(name for name, _ in _fields)
+    _text_field = 'company'
+
+class Project(_Record):
+    _fields = (('name', _text), ('description', _text), ('technologies_used', _text_list))
+    __slots__ = tuple(name for name, _ in _fields)
+    _text_field = 'name'
+
+class Resume(_Record):
+    """The fields the LLM extracts from a resume (see FIELD_PROMPTS in resume_parser.py)"""
+
+    _fields = (('name', _text), ('email', _text), ('phone', _text), ('skills', _text_list),
+               ('education', Education), ('work_experience', Experience),
+               ('certifications', _text_list), ('projects', Project))
+    __slots__ = tuple(name for name, _ in _fields)
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_dict(loads_reply(text))
+
+def parse_reply(text):
+    """Validated dict of the fields in an LLM extraction reply"""
+    return Resume.from_json(text).to_dict()
+
+def validate_field(field, value):
+    """Coerce one top-level Resume field the way from_dict would"""
+    return Resume.from_dict({field: value}).to_dict().get(field)
+
+# ----------- Compact Serialization ------------
+# One resume per line as a JSON array of field values (no keys), about a third smaller than the dict form.
+# Used for import/export files; the app itself passes and stores the plain dicts.
+def dumps(resume):
+    if not isinstance(resume, Resume):
+        resume = Resume.from_dict(resume)
+    return json.dumps(resume.to_row(), ensure_ascii=False, separators=(',', ':'))
+
+def loads(line):
+    return Resume.from_row(json.loads(line))
+
+def write_jsonl(resumes, f):
+    """Write resumes (Resume objects or parsed dicts) to a text file, one row per line; returns the count"""
+    count = 0
+    for resume in resumes:
+        f.write(dumps(resume))
+        f.write('\n')
+        count += 1
+    return count
+
+def iter_jsonl(f):
+    for line in f:
+        if line.strip():
+            yield loads(line)
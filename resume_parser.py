@@ -1,92 +1,268 @@
-import tkinter as tk
-from tkinter import filedialog, messagebox, scrolledtext
-from tkinter import ttk  # Add this line to import ttk
+import contextvars
+import io
 import os
-import requests
-from PyPDF2 import PdfReader
-import json
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from fast_extract import extract_fast
+from experience_parser import duration_months, total_experience_months
+from groq_client import GroqClient, estimate_tokens
+from llm_cache import LLMCache, make_cache_key
+from model_router import ModelRouter
+from json_stream import JSONFieldStream
+from resume_model import Resume, parse_reply, validate_field
+from metrics import CACHE_REQUESTS, PROMPT_TOKENS, RESUMES_PROCESSED, STAGE_SECONDS, record_stage, stage_timer
+from prompt_compaction import PAGE_BREAK, PROMPT_TOKEN_BUDGET, compact_resume_text
 
 # ----------- Groq API Config ------------
 GROQ_API_KEY = "ENTER YOUR API KEY"
 GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
 GROQ_MODEL = "llama3-70b-8192"
+GROQ_SMALL_MODEL = "llama3-8b-8192"  # Cheaper, faster model for short resumes
+SMALL_MODEL_MAX_TOKENS = 1200  # Prompts up to this estimated size go to GROQ_SMALL_MODEL; 0 always uses GROQ_MODEL
+HEDGE_MODELS = {}  # Model a slow request is hedged with, e.g. {GROQ_MODEL: GROQ_SMALL_MODEL}; default is the same model
+PROMPT_VERSION = 2  # Bump whenever the prompt changes so cached replies are not reused
+
+# "full": the LLM extracts every field, "hybrid": contact fields found by the local
+# extractor are not requested from the LLM, "fast": local extraction only, no LLM call
+EXTRACTION_MODES = ("full", "hybrid", "fast")
+EXTRACTION_MODE = "full"  # The LLM is authoritative; local values only fill fields it left empty
+
+# Shared pooled client (keep-alive, retries, rate limiting) used by every Groq call.
+# Created on first use by get_groq_client(); assign a client here to replace it
+groq_client = None
+_groq_client_lock = threading.Lock()
+
+def get_groq_client():
+    global groq_client
+    if groq_client is None:
+        with _groq_client_lock:
+            if groq_client is None:
+                groq_client = GroqClient(GROQ_API_KEY, GROQ_API_URL)
+    return groq_client
+
+# Routes extraction requests by resume size and hedges slow ones (see model_router.py)
+model_router = None
+_model_router_lock = threading.Lock()
+
+def get_model_router():
+    global model_router
+    if model_router is None:
+        with _model_router_lock:
+            if model_router is None:
+                routes = [(SMALL_MODEL_MAX_TOKENS, GROQ_SMALL_MODEL)] if SMALL_MODEL_MAX_TOKENS else []
+                routes.append((None, GROQ_MODEL))
+                model_router = ModelRouter(get_groq_client(), routes, hedge_models=HEDGE_MODELS)
+    return model_router
+
+# Parsed LLM replies keyed by resume text, model and prompt version
+llm_cache = LLMCache()
 
 # ----------- PDF Text Extractor ------------
-def extract_text_from_pdf(pdf_path):
+PDF_MAX_PAGES = 30  # Resumes longer than this are cut off
+PDF_MAX_CHARS = 60000  # Character budget across all pages
+PDF_PAGE_TIMEOUT = 10  # Seconds allowed per page before extraction stops
+PDF_SPOOL_MAX_BYTES = 4 * 1024 * 1024  # Unseekable streams larger than this are buffered in a temp file
+
+PDF_PAGE_WORKERS = 4  # Threads extracting page text for all resumes
+PDF_MAX_STUCK_PAGES = 8  # Timed-out extractions left running before the pool stops being replaced
+
+_page_executor = None
+_page_executor_lock = threading.Lock()
+_stuck_pages = set()  # Futures of timed-out extractions whose worker thread is still busy
+
+def _extract_page_text(page, timeout):
+    """Text of one page, raising FuturesTimeoutError after timeout seconds.
+
+    A thread cannot be killed, so a timed-out extraction keeps its worker
+    busy. The pool is then replaced so other resumes still get every worker;
+    the old pool's threads exit once their pages finish. Past
+    PDF_MAX_STUCK_PAGES stuck workers the pool is kept as is, which bounds
+    the number of threads.
+    """
+    global _page_executor
+    if timeout is None:
+        return page.extract_text()
+    with _page_executor_lock:
+        if _page_executor is None:
+            _page_executor = ThreadPoolExecutor(max_workers=PDF_PAGE_WORKERS, thread_name_prefix="pdf-page")
+        executor = _page_executor
+    future = executor.submit(contextvars.copy_context().run, page.extract_text)  # Keeps the request ID
     try:
-        reader = PdfReader(pdf_path)
-        text = ""
-        for page in reader.pages:
-            try:
-                # Extract text using PyPDF2
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            except Exception as page_error:
-                print(f"Error extracting text from page: {page_error}")
-                continue
-                
+        return future.result(timeout=timeout)
+    except FuturesTimeoutError:
+        with _page_executor_lock:
+            _stuck_pages.difference_update([stuck for stuck in _stuck_pages if stuck.done()])
+            _stuck_pages.add(future)
+            if _page_executor is executor and len(_stuck_pages) <= PDF_MAX_STUCK_PAGES:
+                executor.shutdown(wait=False)
+                _page_executor = None
+            elif len(_stuck_pages) > PDF_MAX_STUCK_PAGES:
+                print(f"{len(_stuck_pages)} PDF pages are still stuck; page extraction runs on fewer workers")
+        raise
+
+def _reset_page_executor():
+    # A forked child inherits the pool object but none of its worker threads
+    global _page_executor, _page_executor_lock
+    _page_executor = None
+    _page_executor_lock = threading.Lock()
+    _stuck_pages.clear()
+
+if hasattr(os, 'register_at_fork'):  # Not available on Windows, which never forks
+    os.register_at_fork(after_in_child=_reset_page_executor)
+
+def _is_seekable(stream):
+    try:
+        return stream.seekable()
+    except (AttributeError, ValueError):
+        return False
+
+def iter_pdf_pages(pdf_source, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS, page_timeout=PDF_PAGE_TIMEOUT):
+    """Yield the text of each page until the page/character budget is used up.
+
+    pdf_source is a path, the PDF bytes or a binary file object. Paths are
+    read through an open file handle so the whole PDF never has to be loaded
+    into memory. Unseekable streams are buffered first, in memory up to
+    PDF_SPOOL_MAX_BYTES and in an anonymous temp file beyond that.
+    """
+    if isinstance(pdf_source, (str, os.PathLike)):
+        with open(pdf_source, 'rb') as f:
+            yield from iter_pdf_pages(f, max_pages, max_chars, page_timeout)
+        return
+    if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+        pdf_source = io.BytesIO(pdf_source)
+    elif not _is_seekable(pdf_source):
+        with tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_BYTES) as spooled:
+            shutil.copyfileobj(pdf_source, spooled)
+            spooled.seek(0)
+            yield from iter_pdf_pages(spooled, max_pages, max_chars, page_timeout)
+        return
+
+    from PyPDF2 import PdfReader  # Deferred: PyPDF2 is slow to import and only needed once a PDF arrives
+    reader = PdfReader(pdf_source)
+    remaining = max_chars
+    for index in range(len(reader.pages)):
+        if max_pages is not None and index >= max_pages:
+            print(f"Stopped after {max_pages} pages")
+            return
+        try:
+            # Extract text using PyPDF2
+            page_text = _extract_page_text(reader.pages[index], page_timeout)
+        except FuturesTimeoutError:
+            # The reader is still busy on the stuck page, so no further pages can be read safely
+            print(f"Timed out extracting text from page {index + 1}, stopping")
+            return
+        except Exception as page_error:
+            print(f"Error extracting text from page: {page_error}")
+            continue
+
+        if not page_text:
+            continue
+        if remaining is not None:
+            if len(page_text) >= remaining:
+                yield page_text[:remaining]
+                print(f"Stopped at the {max_chars} character limit")
+                return
+            remaining -= len(page_text)
+        yield page_text
+
+def extract_text_from_pdf(pdf_source, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS, page_timeout=PDF_PAGE_TIMEOUT):
+    """Text of a PDF given as a path, bytes or binary file object ("" on failure)"""
+    try:
+        # Pages are separated by a form feed so later stages can tell them apart
+        with stage_timer("pdf_extraction"):
+            text = f"\n{PAGE_BREAK}\n".join(iter_pdf_pages(pdf_source, max_pages, max_chars, page_timeout))
+
         # Check if any text was extracted
         if not text.strip():
             print("No text could be extracted from the PDF.")
             return ""
-            
+
         return text.strip()
     except Exception as e:
         print(f"Error reading PDF file: {e}")
         return ""
 
-def extract_info_with_groq(resume_text):
-    # Clean up email addresses in the text before sending to API
-    import re
-    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    emails = re.findall(email_pattern, resume_text)
-    for email in emails:
-        # Ensure no unwanted prefixes are present
-        clean_email = re.sub(r'\bpe([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', r'\1', email)
-        resume_text = resume_text.replace(email, clean_email)
-
-    prompt = f"""
-You are an intelligent resume parser. Extract the following structured JSON fields from the resume text provided:
-- name
-- email (extract ONLY the actual email address, format: user@domain.com)
-- phone
-- skills (as a list)
-- education (as a list of entries, each entry with:
+# Schema description sent to the LLM for each field it is asked to extract
+FIELD_PROMPTS = {
+    "name": "- name",
+    "email": "- email (extract ONLY the actual email address, format: user@domain.com)",
+    "phone": "- phone",
+    "skills": "- skills (as a list)",
+    "education": """- education (as a list of entries, each entry with:
     - institution
     - degree
     - graduation
     - percentage (if available)
     - cgpa (if available, on a scale of 10 or 4)
     - year
-)
-- work_experience (as a list of entries, each entry with:
+)""",
+    "work_experience": """- work_experience (as a list of entries, each entry with:
     - company
     - role
     - duration
     - responsibilities (as a list)
-)
-- certifications (as a list)
-- projects (as a list of entries, each entry with:
+)""",
+    "certifications": "- certifications (as a list)",
+    "projects": """- projects (as a list of entries, each entry with:
     - name
     - description
     - technologies_used (as a list)
-)
+)""",
+}
+LLM_FIELDS = tuple(FIELD_PROMPTS)
+CONTACT_FIELDS = ("name", "email", "phone")
 
-Ensure to extract both percentage and CGPA if available in the education details.
-Only return the JSON data and nothing else.
+def build_prompt(resume_text, fields=LLM_FIELDS):
+    # Clean up email addresses in the text before sending to API
+    import re
+    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+    emails = re.findall(email_pattern, resume_text)
+    for email in emails:
+        # Ensure no unwanted prefixes are present
+        clean_email = re.sub(r'\bpe([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', r'\1', email)
+        resume_text = resume_text.replace(email, clean_email)
+
+    field_list = "\n".join(FIELD_PROMPTS[field] for field in fields)
+    education_note = "Ensure to extract both percentage and CGPA if available in the education details.\n" if "education" in fields else ""
+    prompt = f"""
+You are an intelligent resume parser. Extract the following structured JSON fields from the resume text provided:
+{field_list}
+
+{education_note}Only return the JSON data and nothing else.
 
 Resume Text:
 \"\"\"
 {resume_text}
 \"\"\"
 """
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
-
-    payload = {
+    return prompt
+
+def _cache_key(resume_text, fields):
+    prompt_version = f"{PROMPT_VERSION}:{PROMPT_TOKEN_BUDGET}"
+    if fields != LLM_FIELDS:
+        prompt_version += f":{','.join(fields)}"
+    model = GROQ_MODEL
+    if SMALL_MODEL_MAX_TOKENS:
+        model += f"+{GROQ_SMALL_MODEL}@{SMALL_MODEL_MAX_TOKENS}"
+    return make_cache_key(resume_text, model, prompt_version)
+
+def _cached_extraction(cache_key):
+    cached = llm_cache.get(cache_key)
+    CACHE_REQUESTS.inc(result="miss" if cached is None else "hit")
+    return cached
+
+def build_payload(resume_text, fields=LLM_FIELDS):
+    """Chat-completions payload for extracting fields from the (compacted) resume text"""
+    with stage_timer("prompt_build"):
+        compacted_text, stats = compact_resume_text(resume_text, PROMPT_TOKEN_BUDGET)
+        prompt = build_prompt(compacted_text, fields)
+    print(f"Prompt text compacted from ~{stats['tokens_before']} to ~{stats['tokens_after']} tokens")
+    PROMPT_TOKENS.observe(stats['tokens_before'], phase="before_compaction")
+    PROMPT_TOKENS.observe(stats['tokens_after'], phase="after_compaction")
+    return {
         "model": GROQ_MODEL,
         "messages": [
             {"role": "system", "content": "You are a resume parser that must extract clean data. For email addresses, never include emojis or special characters, only extract the raw email in format user@domain.com"},
@@ -95,14 +271,90 @@ Resume Text:
         "temperature": 0.1  # Reduced temperature for more consistent output
     }
 
-    response = requests.post(GROQ_API_URL, headers=headers, json=payload)
-    response.raise_for_status()
+def _parse_chat_reply(data):
+    with stage_timer("json_parse"):
+        reply = data["choices"][0]["message"]["content"]
+        # Validated against the resume schema; fenced or slightly malformed replies are repaired, not re-requested
+        return parse_reply(reply)
+
+def extract_info_with_groq(resume_text, use_cache=True, fields=LLM_FIELDS):
+    fields = tuple(fields)
+    cache_key = _cache_key(resume_text, fields)
+    if use_cache:
+        cached = _cached_extraction(cache_key)
+        if cached is not None:
+            return cached
+
+    router = get_model_router()
+    payload = router.route(build_payload(resume_text, fields))
+    with stage_timer("groq_call", model=payload["model"]):
+        # A hedged duplicate may answer first, possibly from another model
+        parsed_data, model = router.chat(payload, parse=_parse_chat_reply)
+    if model != payload["model"]:
+        print(f"Hedged request to {model} answered first")
+
+    if use_cache:
+        llm_cache.set(cache_key, parsed_data)
+    return parsed_data
+
+def stream_info_with_groq(resume_text, use_cache=True, fields=LLM_FIELDS):
+    """Streaming version of extract_info_with_groq.
+
+    Yields (field, value) as each field is parsed from the streamed reply
+    (all at once on a cache hit) and returns the complete parsed dict.
+    """
+    fields = tuple(fields)
+    cache_key = _cache_key(resume_text, fields)
+    if use_cache:
+        cached = _cached_extraction(cache_key)
+        if cached is not None:
+            yield from cached.items()
+            return cached
+
+    # Routed by size like extract_info_with_groq, but never hedged: fields are shown as they stream in
+    router = get_model_router()
+    payload = router.route(build_payload(resume_text, fields))
+    parser = JSONFieldStream()
+    chunks = []
+    stream = router.client.chat_stream(payload)
+    waited = 0.0  # groq_call counts only the waits for Groq, not the consumer's time between fields
+    try:
+        while True:
+            start = time.perf_counter()
+            chunk = next(stream, None)
+            waited += time.perf_counter() - start
+            if chunk is None:
+                break
+            if not chunks:
+                STAGE_SECONDS.observe(waited, stage="groq_first_token")
+            chunks.append(chunk)
+            for field, value in parser.feed(chunk):
+                if field in Resume.__slots__:
+                    yield field, validate_field(field, value)
+    except Exception as e:
+        record_stage("groq_call", waited, e, model=payload["model"], stream=True)
+        raise
+    finally:
+        stream.close()
+    record_stage("groq_call", waited, model=payload["model"], stream=True)
+
+    with stage_timer("json_parse"):
+        parsed_data = parse_reply("".join(chunks))
 
-    data = response.json()
-    reply = data["choices"][0]["message"]["content"]
-    return json.loads(reply)
+    if use_cache:
+        llm_cache.set(cache_key, parsed_data)
+    return parsed_data
 
 # ----------- Resume Scoring Logic ------------
+TECHNICAL_KEYWORDS = frozenset({"python", "java", "javascript", "sql", "aws", "docker", "kubernetes", "react", "angular", "node"})
+# (minimum score, recommendation), checked from the top
+ATS_RECOMMENDATIONS = (
+    (85, "Strong Match - Highly Recommended"),
+    (70, "Good Match - Recommended"),
+    (60, "Potential Match - Consider for Review"),
+)
+ATS_DEFAULT_RECOMMENDATION = "Weak Match - May Need Improvement"
+
 def score_resume(parsed_data):
     # Set random seed for consistency
     score = 0
@@ -141,8 +393,7 @@ def score_resume(parsed_data):
             skills_score += 5
         
         # Points for technical skills
-        technical_keywords = {"python", "java", "javascript", "sql", "aws", "docker", "kubernetes", "react", "angular", "node"}
-        tech_skill_count = sum(1 for skill in skills if skill.lower() in technical_keywords)
+        tech_skill_count = sum(1 for skill in skills if skill.lower() in TECHNICAL_KEYWORDS)
         skills_score += min(tech_skill_count * 2, 10)  # Max 10 points for technical skills
     detailed_scores["skills"] = skills_score
     score += skills_score
@@ -189,11 +440,9 @@ def score_resume(parsed_data):
         for exp in work_experience:
             if isinstance(exp, dict):
                 if "duration" in exp:
-                    # Add points for experience duration
-                    duration = exp["duration"].lower()
-                    if "year" in duration:
-                        years = int(''.join(filter(str.isdigit, duration)))
-                        experience_score += min(years * 2, 10)
+                    # Add points for experience duration (whole years from ranges or stated lengths)
+                    years = duration_months(exp["duration"]) // 12
+                    experience_score += min(years * 2, 10)
     detailed_scores["work_experience"] = min(experience_score, 25)  # Cap at 25
     score += min(experience_score, 25)
 
@@ -215,107 +464,144 @@ def score_resume(parsed_data):
     parsed_data["detailed_scores"] = detailed_scores
     parsed_data["total_score"] = score
     parsed_data["ats_recommendation"] = get_ats_recommendation(score)
+    parsed_data["total_experience_months"] = total_experience_months(work_experience)
 
     return score
 
 def get_ats_recommendation(score):
-    if score >= 85:
-        return "Strong Match - Highly Recommended"
-    elif score >= 70:
-        return "Good Match - Recommended"
-    elif score >= 60:
-        return "Potential Match - Consider for Review"
-    else:
-        return "Weak Match - May Need Improvement"
-
-# ----------- GUI Application ------------
-# Add at the top with other imports
-from sheets_manager import SheetsManager
-
-class ResumeParserApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Resume Parser with Groq AI")
-        self.sheets_manager = SheetsManager()  # Initialize sheets manager
-        self.root.geometry("800x600")
-
-        # Add status label
-        self.status_label = tk.Label(root, text="", fg="blue")
-        self.status_label.pack(pady=5)
-
-        self.notebook = ttk.Notebook(root)
-        self.notebook.pack(expand=True, fill='both')
-
-        self.resume_tab = tk.Frame(self.notebook)
-        self.notebook.add(self.resume_tab, text='Resume Data')
-
-        self.output_box = scrolledtext.ScrolledText(self.resume_tab, wrap=tk.WORD, width=100, height=30)
-        self.output_box.pack(padx=10, pady=10)
-
-        self.export_tab = tk.Frame(self.notebook)
-        self.notebook.add(self.export_tab, text='Export')
-
-        tk.Button(self.export_tab, text="Export to File", command=self.export_to_file).pack(pady=5)
-
-        tk.Button(root, text="Upload Resume (PDF)", command=self.upload_resume).pack(pady=10)
-
-    def update_status(self, message):
-        self.status_label.config(text=message)
-        self.root.update()
+    for threshold, recommendation in ATS_RECOMMENDATIONS:
+        if score >= threshold:
+            return recommendation
+    return ATS_DEFAULT_RECOMMENDATION
+
+# ----------- Parse + Score Pipeline ------------
+def clean_email(email):
+    """Extract only the valid email address (drops emojis and surrounding text)"""
+    # First, find the @ symbol position
+    at_pos = email.find('@')
+    if at_pos == -1:
+        return ''
+    # Extract from the character before @ until we find a non-email character
+    start = at_pos
+    while start > 0 and (email[start-1].isalnum() or email[start-1] in '._-'):
+        start -= 1
+    # Extract the rest of the email
+    end = at_pos
+    while end < len(email) and (email[end].isalnum() or email[end] in '@._-'):
+        end += 1
+    return email[start:end]
+
+def text_stats(text):
+    """Size of extracted resume text, as reported before parsing starts"""
+    return {
+        "pages": text.count(PAGE_BREAK) + 1,
+        "characters": len(text),
+        "words": len(text.split()),
+        "estimated_tokens": estimate_tokens(text),
+    }
 
-    def upload_resume(self):
-        filepath = filedialog.askopenfilename(filetypes=[("PDF Files", "*.pdf")])
-        if not filepath:
+def _check_mode(mode):
+    if mode not in EXTRACTION_MODES:
+        raise ValueError(f"Unknown extraction mode: {mode}")
+
+def _extract_local(text):
+    with stage_timer("local_extraction"):
+        local = extract_fast(text)
+    return local, {field: local[field] for field in CONTACT_FIELDS if local[field]}
+
+def _fast_result(local):
+    parsed_data = {field: local[field] for field in CONTACT_FIELDS}
+    parsed_data.update({"skills": local["skills"], "education": [], "work_experience": [],
+                        "certifications": [], "projects": []})
+    return parsed_data, {field: "local" for field in LLM_FIELDS}
+
+def _llm_request_fields(local_fields, mode):
+    # In hybrid mode the LLM is not asked for contact fields we already found locally
+    skipped = local_fields if mode == "hybrid" else {}
+    return skipped, [field for field in LLM_FIELDS if field not in skipped]
+
+def _merge_llm_result(llm_data, skipped, local_fields, fields):
+    parsed_data = {**skipped, **llm_data}
+    field_sources = {field: "llm" for field in fields}
+    for field, value in local_fields.items():
+        if field in skipped or not parsed_data.get(field):
+            parsed_data[field] = value
+            field_sources[field] = "local"
+    return parsed_data, field_sources
+
+def _finish_result(parsed_data, field_sources, mode):
+    # Clean up email (remove emojis and extract only valid email)
+    if 'email' in parsed_data:
+        parsed_data['email'] = clean_email(parsed_data['email'])
+
+    # Normalize and round the score
+    with stage_timer("scoring"):
+        score = score_resume(parsed_data)
+    score = max(0, min(100, round(score)))
+    parsed_data["resume_score"] = f"{score}/100"
+    parsed_data["field_sources"] = {field: field_sources[field] for field in LLM_FIELDS if field in field_sources}
+    RESUMES_PROCESSED.inc(mode=mode, status="ok")
+    return parsed_data
+
+def process_resume_text(text, mode=EXTRACTION_MODE):
+    """Extract and score already extracted resume text.
+
+    mode is one of EXTRACTION_MODES. The returned dict records in
+    "field_sources" whether each field came from the local extractor or the LLM.
+    """
+    _check_mode(mode)
+    local, local_fields = _extract_local(text)
+
+    if mode == "fast":
+        parsed_data, field_sources = _fast_result(local)
+    else:
+        skipped, fields = _llm_request_fields(local_fields, mode)
+        llm_data = extract_info_with_groq(text, fields=fields)
+        if not llm_data:
+            RESUMES_PROCESSED.inc(mode=mode, status="failed")
+            return None
+        parsed_data, field_sources = _merge_llm_result(llm_data, skipped, local_fields, fields)
+
+    return _finish_result(parsed_data, field_sources, mode)
+
+def iter_resume_events(text, mode=EXTRACTION_MODE):
+    """Same pipeline as process_resume_text, yielding (event, data) as each stage finishes.
+
+    Events, in order: "text" (text_stats), "contact" (locally extracted
+    contact fields and skills), "field" ({"field", "value"} for each LLM
+    field as soon as it is parsed from the streamed reply), "score", and
+    "result" with the dict process_resume_text would return (or None).
+    """
+    _check_mode(mode)
+    yield "text", text_stats(text)
+    local, local_fields = _extract_local(text)
+    yield "contact", {field: local[field] for field in CONTACT_FIELDS + ("skills",)}
+
+    if mode == "fast":
+        parsed_data, field_sources = _fast_result(local)
+    else:
+        skipped, fields = _llm_request_fields(local_fields, mode)
+        stream = stream_info_with_groq(text, fields=fields)
+        while True:
+            try:
+                field, value = next(stream)
+            except StopIteration as finished:
+                llm_data = finished.value
+                break
+            yield "field", {"field": field, "value": value}
+        if not llm_data:
+            RESUMES_PROCESSED.inc(mode=mode, status="failed")
+            yield "result", None
             return
+        parsed_data, field_sources = _merge_llm_result(llm_data, skipped, local_fields, fields)
 
-        try:
-            self.update_status("Reading PDF file...")
-            text = extract_text_from_pdf(filepath)
-            if not text.strip():
-                messagebox.showerror("Error", "Could not extract text from PDF")
-                self.update_status("")
-                return
-
-            self.update_status("Analyzing resume...")
-            parsed_data = extract_info_with_groq(text)
-            
-            self.update_status("Calculating score...")
-            score = score_resume(parsed_data)
-            parsed_data["resume_score"] = f"{score}/100"
-
-            # Add to Google Sheets with visual confirmation
-            self.update_status("Adding to Google Sheets...")
-            if self.sheets_manager.add_candidate(parsed_data):
-                messagebox.showinfo("Success", "Resume data added to Google Sheets successfully!")
-            else:
-                messagebox.showerror("Error", "Failed to add data to Google Sheets")
-
-            pretty_output = json.dumps(parsed_data, indent=2)
-            self.output_box.delete(1.0, tk.END)
-            self.output_box.insert(tk.END, pretty_output)
-
-            self.last_output = pretty_output
-            self.update_status("Analysis complete!")
-            
-        except requests.exceptions.RequestException as e:
-            messagebox.showerror("API Error", "Failed to connect to Groq API. Please check your internet connection.")
-        except json.JSONDecodeError:
-            messagebox.showerror("Error", "Failed to parse API response")
-        except Exception as e:
-            messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
-        finally:
-            self.update_status("")
-
-    def export_to_file(self):
-        if hasattr(self, "last_output"):
-            file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON Files", "*.json")])
-            if file_path:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(self.last_output)
-                messagebox.showinfo("Success", "Output exported successfully.")
+    parsed_data = _finish_result(parsed_data, field_sources, mode)
+    yield "score", {key: parsed_data.get(key) for key in
+                    ("resume_score", "total_score", "detailed_scores", "ats_recommendation", "total_experience_months")}
+    yield "result", parsed_data
 
 # ----------- Run the App ------------
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = ResumeParserApp(root)
-    root.mainloop()
+    # The desktop app lives in gui.py so importing the parser never loads tkinter
+    from gui import main
+    main()
@@ -0,0 +1,146 @@
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+
+# ----------- Search Index Config ------------
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Terms from these fields count this many times towards a candidate's term frequency
+FIELD_WEIGHTS = {
+    'skills': 3,
+    'technologies_used': 2,
+    'work_experience': 1,
+}
+MAX_DF_RATIO = 0.6  # Query terms found in more of the pool than this are ignored (unless nothing else matches)
+
+# Keeps tokens like "c++", "c#" and "node.js" whole
+_token_re = re.compile(r'[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]')
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has have in is it of on or our the this to we will with you your '
+    'experience years year work working team strong knowledge skills ability using'.split()
+)
+
+def tokenize(text):
+    return [token for token in _token_re.findall(str(text).lower()) if token not in STOPWORDS]
+
+def candidate_terms(parsed_data):
+    """Weighted term frequencies of a parsed resume"""
+    terms = Counter()
+
+    def add(values, weight):
+        for value in values:
+            for token in tokenize(value):
+                terms[token] += weight
+
+    skills = parsed_data.get('skills', [])
+    if isinstance(skills, list):
+        add(skills, FIELD_WEIGHTS['skills'])
+
+    for project in parsed_data.get('projects', []) or []:
+        if isinstance(project, dict) and isinstance(project.get('technologies_used'), list):
+            add(project['technologies_used'], FIELD_WEIGHTS['technologies_used'])
+
+    for exp in parsed_data.get('work_experience', []) or []:
+        if isinstance(exp, dict):
+            values = [exp.get('role', ''), exp.get('company', '')]
+            responsibilities = exp.get('responsibilities', [])
+            if isinstance(responsibilities, list):
+                values.extend(responsibilities)
+            add(values, FIELD_WEIGHTS['work_experience'])
+    return terms
+
+class SearchIndex:
+    """In-memory inverted index with BM25 ranking over candidate skills,
+    project technologies and work experience text.
+
+    Documents are added or replaced one at a time, so the index stays current
+    as resumes arrive without a full rebuild.
+    """
+
+    def __init__(self, k1=BM25_K1, b=BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}  # term -> {candidate_id: weighted term frequency}
+        self.doc_terms = {}  # candidate_id -> Counter of its terms
+        self.doc_lengths = {}
+        self.summaries = {}  # candidate_id -> fields returned with search hits
+        self.total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def add(self, candidate_id, parsed_data):
+        """Index a candidate, replacing any earlier version of it"""
+        terms = candidate_terms(parsed_data)
+        with self._lock:
+            self.remove(candidate_id)
+            for term, frequency in terms.items():
+                self.postings.setdefault(term, {})[candidate_id] = frequency
+            length = sum(terms.values())
+            self.doc_terms[candidate_id] = terms
+            self.doc_lengths[candidate_id] = length
+            self.total_length += length
+            self.summaries[candidate_id] = {
+                'name': parsed_data.get('name', ''),
+                'email': parsed_data.get('email', ''),
+                'resume_score': parsed_data.get('resume_score', ''),
+            }
+
+    def remove(self, candidate_id):
+        with self._lock:
+            terms = self.doc_terms.pop(candidate_id, None)
+            if terms is None:
+                return
+            for term in terms:
+                postings = self.postings[term]
+                del postings[candidate_id]
+                if not postings:
+                    del self.postings[term]
+            self.total_length -= self.doc_lengths.pop(candidate_id)
+            del self.summaries[candidate_id]
+
+    def build(self, candidate_store):
+        """Index every candidate already in the store"""
+        for candidate in candidate_store.iter_candidates():
+            self.add(candidate['id'], candidate)
+        print(f"Search index built with {len(self)} candidates")
+
+    def search(self, query, k=10):
+        """Top-k candidates for a free-text query (e.g. a job description), best first"""
+        query_terms = set(tokenize(query))
+        with self._lock:
+            doc_count = len(self.doc_lengths)
+            # Every indexed document empty: nothing can match and the average length would be 0
+            if not doc_count or not query_terms or not self.total_length:
+                return []
+            avg_length = self.total_length / doc_count
+
+            matched = [(term, self.postings[term]) for term in query_terms if term in self.postings]
+            selective = [(term, postings) for term, postings in matched if len(postings) <= MAX_DF_RATIO * doc_count]
+            matched = selective or matched
+
+            k1 = self.k1
+            base = k1 * (1 - self.b)
+            scale = k1 * self.b / avg_length
+            lengths = self.doc_lengths
+            scores = {}
+            for term, postings in matched:
+                df = len(postings)
+                weight = math.log(1 + (doc_count - df + 0.5) / (df + 0.5)) * (k1 + 1)
+                for candidate_id, frequency in postings.items():
+                    score = weight * frequency / (frequency + base + scale * lengths[candidate_id])
+                    scores[candidate_id] = scores.get(candidate_id, 0.0) + score
+
+            top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [
+                {
+                    'candidate_id': candidate_id,
+                    'score': round(score, 4),
+                    'matched_terms': sorted(term for term, _ in matched if term in self.doc_terms[candidate_id]),
+                    **self.summaries[candidate_id]
+                }
+                for candidate_id, score in top
+            ]
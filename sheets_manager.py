@@ -1,10 +1,10 @@
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+import atexit
 import os.path
 import json
+import random
+import threading
+
+from metrics import stage_timer
 
 # Update the RANGE_NAME constant
 SCOPES = [
@@ -14,7 +14,50 @@ SCOPES = [
 SPREADSHEET_ID = 'ENTER YOUR GOOGLE SPREADSHEET ID' # change it with your google spreadsheet id for more detail go through the readme page
 RANGE_NAME = 'Sheet1'  # Change to match your actual sheet name
 CREDS_FILE = r'PATH TO YOUR CREDENTIALS FILE' # Create the credentials file from google cloud console and paste the path here
+SHEETS_BATCH_SIZE = 50  # Rows per append call
+SHEETS_FLUSH_INTERVAL = 5.0  # Seconds before a partial batch is flushed
+SHEETS_MAX_RETRIES = 5
+SHEETS_MAX_BUFFERED_ROWS = 5000  # Rows held in memory while the sheet is unreachable; more are not buffered
+
+# ----------- Sheet Rows ------------
+def build_row(parsed_data):
+    """Build the sheet row for one parsed resume"""
+    # Clean email (remove emojis and unwanted characters)
+    email = parsed_data.get('email', '')
+    email = ''.join(char for char in email if ord(char) < 128 and char != '✉').strip()
+    if '@' not in email:
+        # Try to find email in the parsed data
+        for key, value in parsed_data.items():
+            if isinstance(value, str) and '@' in value and '.com' in value.lower():
+                email = value.strip()
+                break
+
+    # Get education info before using it
+    education = parsed_data.get('education') or [{}]
+    education_info = education[0] if isinstance(education, list) and isinstance(education[0], dict) else {}
+    degree = education_info.get('degree', '')
+    institution = education_info.get('institution', '')
+
+    # Format phone number
+    phone = parsed_data.get('phone', '').replace('-', '')
 
+    return [
+        parsed_data.get('name', ''),
+        email,  # Use cleaned email
+        phone,
+        ', '.join(parsed_data.get('skills', [])),
+        parsed_data.get('resume_score', '0/100'),
+        parsed_data.get('ats_recommendation', ''),
+        degree,
+        institution,
+        ', '.join([f"{exp.get('company', '')} - {exp.get('role', '')}"
+                  for exp in parsed_data.get('work_experience', [])]),
+        len(parsed_data.get('projects', [])),
+        len(parsed_data.get('certifications', [])),
+        education_info.get('cgpa', 'N/A')
+    ]
+
+# ----------- Sheets Client ------------
 class SheetsManager:
     def __init__(self):
         self.creds = None
@@ -54,51 +97,24 @@ class SheetsManager:
         except Exception as e:
             print(f"Error setting up sheet: {str(e)}")
 
-    # Update the range reference in add_candidate method
-    def add_candidate(self, parsed_data):
-        try:
-            # Clean email (remove emojis and unwanted characters)
-            email = parsed_data.get('email', '')
-            email = ''.join(char for char in email if ord(char) < 128 and char != '✉').strip()
-            if '@' not in email:
-                # Try to find email in the parsed data
-                for key, value in parsed_data.items():
-                    if isinstance(value, str) and '@' in value and '.com' in value.lower():
-                        email = value.strip()
-                        break
-
-            # Get education info before using it
-            education_info = parsed_data.get('education', [{}])[0]
-            degree = education_info.get('degree', '')
-            institution = education_info.get('institution', '')
-            
-            # Format phone number
-            phone = parsed_data.get('phone', '').replace('-', '')
-            
-            values = [[
-                parsed_data.get('name', ''),
-                email,  # Use cleaned email
-                phone,
-                ', '.join(parsed_data.get('skills', [])),
-                parsed_data.get('resume_score', '0/100'),
-                parsed_data.get('ats_recommendation', ''),
-                degree,
-                institution,
-                ', '.join([f"{exp.get('company', '')} - {exp.get('role', '')}" 
-                          for exp in parsed_data.get('work_experience', [])]),
-                len(parsed_data.get('projects', [])),
-                len(parsed_data.get('certifications', [])),
-                education_info.get('cgpa', 'N/A')
-            ]]
-
-            # Fix the range reference and ensure data is added
-            result = self.service.spreadsheets().values().append(
+    def build_row(self, parsed_data):
+        return build_row(parsed_data)
+
+    def append_rows(self, values):
+        """Append several rows in a single API call"""
+        # Fix the range reference and ensure data is added
+        with stage_timer('sheets_append', rows=len(values)):
+            return self.service.spreadsheets().values().append(
                 spreadsheetId=SPREADSHEET_ID,
                 range='Sheet1!A:L',  # Use full column range
                 valueInputOption='USER_ENTERED',
                 insertDataOption='INSERT_ROWS',
                 body={'values': values}
             ).execute()
+
+    def add_candidate(self, parsed_data):
+        try:
+            result = self.append_rows([self.build_row(parsed_data)])
             print(f"Data added successfully: {result}")
             return True
 
@@ -109,6 +125,7 @@ class SheetsManager:
     # Update the range reference in test_connection method
     def test_connection(self):
         """Test the connection to Google Sheets"""
+        from googleapiclient.errors import HttpError
         try:
             result = self.service.spreadsheets().values().get(
                 spreadsheetId=SPREADSHEET_ID,
@@ -123,45 +140,215 @@ class SheetsManager:
             raise
 
     def authenticate(self):
+        from googleapiclient.discovery import build
+        self.creds = load_credentials()
+        self.service = build('sheets', 'v4', credentials=self.creds)
+        print("✅ Authentication completed")
+
+# ----------- Shared Credentials and Client ------------
+# The Google libraries are imported on first use so the app starts without them
+_credentials = None
+_credentials_lock = threading.Lock()
+_shared_manager = None
+_shared_manager_lock = threading.Lock()
+
+def load_credentials():
+    """OAuth credentials cached for the whole process (and in token.json across runs)"""
+    global _credentials
+    with _credentials_lock:
+        if _credentials is not None and _credentials.valid:
+            return _credentials
+
+        from google.oauth2.credentials import Credentials
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        from google.auth.transport.requests import Request
+
         print(f"🔍 Looking for credentials file at: {CREDS_FILE}")
         if not os.path.exists(CREDS_FILE):
             raise FileNotFoundError(f"❌ Credentials file not found at: {CREDS_FILE}")
-        
+
         print("🔑 Starting authentication process...")
-        if os.path.exists('token.json'):
+        creds = _credentials
+        if creds is None and os.path.exists('token.json'):
             try:
-                self.creds = Credentials.from_authorized_user_file('token.json', SCOPES)
+                creds = Credentials.from_authorized_user_file('token.json', SCOPES)
                 print("📄 Found existing token.json")
             except Exception as e:
                 print(f"❌ Error with token.json: {str(e)}")
                 os.remove('token.json')
-                self.creds = None
-        
-        if not self.creds or not self.creds.valid:
-            if self.creds and self.creds.expired and self.creds.refresh_token:
+                creds = None
+
+        if not creds or not creds.valid:
+            if creds and creds.expired and creds.refresh_token:
                 print("🔄 Refreshing expired credentials...")
                 try:
-                    self.creds.refresh(Request())
+                    creds.refresh(Request())
+                    # Save the new access token so the next start does not refresh again
+                    with open('token.json', 'w') as token:
+                        token.write(creds.to_json())
                 except Exception as e:
                     print(f"❌ Error refreshing credentials: {str(e)}")
-                    os.remove('token.json')
-                    self.creds = None
-            
-            if not self.creds:
+                    if os.path.exists('token.json'):
+                        os.remove('token.json')
+                    creds = None
+
+            if not creds:
                 print("🔄 Getting new credentials...")
                 try:
                     flow = InstalledAppFlow.from_client_secrets_file(CREDS_FILE, SCOPES)
                     # Use local server with a specific port
-                    self.creds = flow.run_local_server(port=8080, 
-                                                     prompt='consent',
-                                                     access_type='offline')
-                    
+                    creds = flow.run_local_server(port=8080,
+                                                  prompt='consent',
+                                                  access_type='offline')
+
                     with open('token.json', 'w') as token:
-                        token.write(self.creds.to_json())
+                        token.write(creds.to_json())
                     print("✅ New token.json created")
                 except Exception as e:
                     print(f"❌ Authentication flow error: {str(e)}")
                     raise
 
-        self.service = build('sheets', 'v4', credentials=self.creds)
-        print("✅ Authentication completed")
+        _credentials = creds
+        return creds
+
+def get_sheets_manager():
+    """The process-wide SheetsManager, authenticated on first call.
+
+    Safe to call from several threads; a failed initialization is not
+    cached, so the next call tries again.
+    """
+    global _shared_manager
+    if _shared_manager is None:
+        with _shared_manager_lock:
+            if _shared_manager is None:
+                _shared_manager = SheetsManager()
+    return _shared_manager
+
+class SheetsBatchWriter:
+    """Buffers candidate rows and appends them to the sheet in the background.
+
+    Rows are flushed as one multi-row append once batch_size rows are waiting
+    or flush_interval seconds have passed. Failed flushes are retried with
+    backoff and anything still buffered is flushed on shutdown. Only the
+    writer thread talks to the Sheets API; without a sheets_manager it
+    uses get_sheets_manager(), so authentication waits for the first flush.
+
+    At most max_buffered rows are kept. Rows beyond that are dropped; rows
+    with a key stay unsynced in the CandidateStore and are queued again on
+    the next start.
+    """
+
+    def __init__(self, sheets_manager=None, batch_size=SHEETS_BATCH_SIZE,
+                 flush_interval=SHEETS_FLUSH_INTERVAL, max_retries=SHEETS_MAX_RETRIES, on_flush=None,
+                 max_buffered=SHEETS_MAX_BUFFERED_ROWS):
+        self._sheets_manager = sheets_manager
+        self.on_flush = on_flush  # Called with the keys of every successfully written batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.max_buffered = max_buffered
+        self.dropped = 0  # Rows not buffered because the buffer was full
+        self._rows = []
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._stopping = False
+        self._thread = None
+
+    def add_candidate(self, parsed_data, key=None):
+        """Queue a parsed resume; returns False if the row could not be built or the buffer is full"""
+        try:
+            row = self._sheets_manager.build_row(parsed_data) if self._sheets_manager else build_row(parsed_data)
+        except Exception as e:
+            print(f"Error processing data: {str(e)}")
+            return False
+
+        with self._condition:
+            if len(self._rows) >= self.max_buffered:
+                if not self.dropped:
+                    print(f"Sheets buffer is full ({self.max_buffered} rows); new rows are not buffered")
+                self.dropped += 1
+                return False
+            self._rows.append((row, key))
+            if len(self._rows) >= self.batch_size:
+                self._condition.notify()
+        return True
+
+    @property
+    def sheets_manager(self):
+        if self._sheets_manager is None:
+            self._sheets_manager = get_sheets_manager()
+        return self._sheets_manager
+
+    def pending(self):
+        with self._condition:
+            return len(self._rows)
+
+    def flush(self):
+        """Append every buffered row now; returns True if nothing is left unwritten.
+
+        Backoff between retries waits without holding any lock and ends
+        early once the writer is stopping, which then gets one last attempt.
+        """
+        with self._condition:
+            rows, self._rows = self._rows, []
+            self.dropped = 0
+        if not rows:
+            return True
+
+        for attempt in range(self.max_retries + 1):
+            with self._flush_lock:
+                try:
+                    self.sheets_manager.append_rows([row for row, _ in rows])
+                    print(f"Added {len(rows)} rows to Google Sheets")
+                    if self.on_flush:
+                        self.on_flush([key for _, key in rows if key is not None])
+                    return True
+                except Exception as e:
+                    error = e
+            with self._condition:
+                if attempt == self.max_retries or self._stopping:
+                    break
+                delay = random.uniform(0, min(60, 2 ** attempt))
+                print(f"Sheets append failed ({str(error)}), retrying in {delay:.1f}s")
+                self._condition.wait_for(lambda: self._stopping, delay)
+        print(f"Error adding {len(rows)} rows to Google Sheets: {str(error)}")
+
+        # Keep the rows for the next flush, as many as fit in the buffer
+        with self._condition:
+            kept = rows[:max(0, self.max_buffered - len(self._rows))]
+            self._rows[:0] = kept
+        if len(kept) < len(rows):
+            print(f"Dropped {len(rows) - len(kept)} rows from the full Sheets buffer")
+        return False
+
+    def _run(self):
+        flushed = True
+        while True:
+            with self._condition:
+                # After a failed flush wait a full interval even if the buffer is full
+                if not self._stopping and (len(self._rows) < self.batch_size or not flushed):
+                    self._condition.wait(self.flush_interval)
+                stopping = self._stopping
+            flushed = self.flush()
+            if stopping:
+                return
+
+    def start(self):
+        """Start the background writer and flush it again at interpreter exit"""
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="sheets-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+        return self
+
+    def stop(self, timeout=None):
+        """Flush remaining rows and stop the background writer"""
+        if self._thread is None:
+            return
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self._thread.join(timeout)
+        self._thread = None
+        atexit.unregister(self.stop)